@@ -0,0 +1,332 @@
+"""
+ChessSudoku 대량 퍼즐 생성 모듈
+
+여러 프로세스에서 기물 배치 -> 보드 채우기 -> 빈칸 조각을 실행하고,
+결과를 출력 파일(싱크)에 바로바로 기록한 뒤 처리량 요약을 출력합니다.
+
+사용법:
+    python main.py generate --count 1000 --workers 8 --difficulty hard --seed 1234 --out puzzles.jsonl
+    python main.py generate --count 100 --out puzzles.sqlite3 --upload
+
+출력 파일 형식은 확장자로 정합니다.
+    .jsonl            - 한 줄에 퍼즐 하나 (보드는 puzzle_codec의 81글자 문자열)
+    .sqlite3, .db     - puzzle_store.PuzzleStore
+    .bank             - puzzle_bank 고정 길이 레코드 파일
+"""
+import argparse
+import json
+import time
+from pipeline import iter_puzzles_parallel
+from puzzle_api_client import PuzzleAPIClient, PuzzleDataFormatter, DifficultyManager, _percentile
+from puzzle_codec import encode_board, encode_pieces, decode_board
+from puzzle_store import PuzzleStore
+from puzzle_bank import PuzzleBankWriter
+from outbox import UploadOutbox
+from seeding import new_seed
+from search_stats import SearchStats, print_search_stats
+from profiling import StageProfiler
+from log_setup import get_logger, add_logging_arguments, configure_from_args
+
+logger = get_logger(__name__)
+
+STAGES = ('place_time', 'fill_time', 'carve_time', 'total_time')
+
+def record_to_dict(record, include_solution_path=False):
+    """퍼즐 레코드를 JSON으로 저장할 수 있는 dict로 변환 (include_solution_path면 풀이 경로 포함)"""
+    data = {
+        'seed': record['seed'],
+        'piece_counts': record['piece_counts'],
+        'max_holes': record['max_holes'],
+        'difficulty': record['difficulty'],
+        'difficulty_score': record['info']['difficulty_score'],
+        'holes_count': record['info']['holes_count'],
+        'puzzle': encode_board(record['puzzle'], record['pieces']),
+        'answer': encode_board(record['answer'], record['pieces']),
+        'pieces': encode_pieces(record['pieces']),
+    }
+    if include_solution_path:
+        data['solution_path'] = PuzzleDataFormatter.solution_path_to_api_format(record['info']['solution_path'])
+    return data
+
+def record_from_dict(data):
+    """record_to_dict로 만든 dict를 퍼즐 레코드로 복원 (info에는 저장된 값만 들어 있음)"""
+    puzzle, pieces = decode_board(data['puzzle'])
+    answer, _ = decode_board(data['answer'])
+    solution_path = data.get('solution_path')
+    return {
+        'seed': data['seed'],
+        'piece_counts': data['piece_counts'],
+        'max_holes': data['max_holes'],
+        'puzzle': puzzle,
+        'answer': answer,
+        'pieces': pieces,
+        'difficulty': data['difficulty'],
+        'info': {
+            'holes_count': data['holes_count'],
+            'difficulty': data['difficulty'],
+            'difficulty_score': data.get('difficulty_score'),
+            'solution_path': (PuzzleDataFormatter.solution_path_from_api_format(solution_path)
+                              if solution_path else []),
+        },
+    }
+
+class JsonlSink:
+    """퍼즐 레코드를 JSON Lines 파일에 추가하는 싱크"""
+
+    def __init__(self, path, include_solution_path=False):
+        self.path = path
+        self.include_solution_path = include_solution_path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record):
+        data = record_to_dict(record, self.include_solution_path)
+        self.file.write(json.dumps(data, separators=(',', ':')) + "\n")
+
+    def close(self):
+        self.file.close()
+
+class StoreSink:
+    """퍼즐 레코드를 PuzzleStore에 묶음 단위로 저장하는 싱크"""
+
+    CHUNK_SIZE = 500
+
+    def __init__(self, path):
+        self.path = path
+        self.store = PuzzleStore(path)
+        self.buffer = []
+
+    def write(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.store.add_records(self.buffer, chunk_size=self.CHUNK_SIZE)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.store.close()
+
+class BankSink:
+    """퍼즐 레코드를 퍼즐 뱅크 파일에 추가하는 싱크"""
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = PuzzleBankWriter(path)
+
+    def write(self, record):
+        self.writer.append_record(record)
+
+    def close(self):
+        self.writer.close()
+
+SINKS = {
+    '.jsonl': JsonlSink,
+    '.sqlite3': StoreSink,
+    '.db': StoreSink,
+    '.bank': BankSink,
+}
+
+def open_sink(path, include_solution_path=False):
+    """출력 파일 확장자에 맞는 싱크 생성 (풀이 경로는 고정 형식이 아닌 .jsonl에만 기록)"""
+    for extension, sink_class in SINKS.items():
+        if path.endswith(extension):
+            if sink_class is JsonlSink:
+                return JsonlSink(path, include_solution_path)
+            return sink_class(path)
+    raise ValueError(f"지원하지 않는 출력 파일 형식입니다: {path} (가능: {', '.join(SINKS)})")
+
+def summarize_generation_stats(records_stats, wall_time):
+    """레코드들의 단계별 소요 시간 통계 계산
+
+    Args:
+        records_stats (list): 퍼즐 레코드의 'stats' dict 리스트
+        wall_time (float): 전체 소요 시간 (초)
+
+    Returns:
+        dict: 개수, 처리량(초당 퍼즐 수), 단계별 p50/p99/최대 소요 시간
+    """
+    summary = {
+        'count': len(records_stats),
+        'wall_time': wall_time,
+        'throughput': len(records_stats) / wall_time if wall_time > 0 else 0.0,
+    }
+    for stage in STAGES:
+        values = sorted(stats[stage] for stats in records_stats)
+        summary[stage] = {
+            'p50': _percentile(values, 0.50),
+            'p99': _percentile(values, 0.99),
+            'max': values[-1] if values else 0.0,
+        }
+    return summary
+
+def print_generation_summary(summary):
+    """생성 통계 출력"""
+    print(f"\n생성 완료: {summary['count']}개, {summary['wall_time']:.2f}초 "
+          f"({summary['throughput']:.2f} 퍼즐/초)")
+    print(f"{'단계':<12}{'p50':>10}{'p99':>10}{'최대':>10}")
+    for stage in STAGES:
+        values = summary[stage]
+        print(f"{stage:<12}{values['p50'] * 1000:>8.1f}ms{values['p99'] * 1000:>8.1f}ms"
+              f"{values['max'] * 1000:>8.1f}ms")
+
+def generate_batch(count, workers=None, difficulty=None, seed=None, out=None, upload=False,
+                   server_url=None, outbox_path=None, piece_counts=None, max_holes=None,
+                   min_holes=10, batch_size=None, progress_every=100, collect_stats=False,
+                   profile_dir=None, include_solution_path=False, carve_priors=None, beam_width=None):
+    """퍼즐을 대량으로 생성해서 싱크에 기록하고 (선택) 서버에 업로드
+
+    Args:
+        count (int): 생성할 퍼즐 개수
+        workers (int, optional): 프로세스 개수 (없으면 CPU 개수)
+        difficulty (str, optional): 목표 난이도
+        seed (int, optional): 배치 시드 (같은 시드면 같은 퍼즐들 생성)
+        out (str, optional): 출력 파일 경로 (.jsonl, .sqlite3, .db, .bank)
+        upload (bool): 생성한 퍼즐을 서버에 업로드할지 여부
+        server_url (str, optional): 업로드 서버 URL
+        outbox_path (str, optional): 업로드 전에 기록할 아웃박스 파일 (업로드 실패 시 재전송용)
+        piece_counts (dict, optional): 기물 타입별 개수
+        max_holes (int, optional): 최대 빈칸 개수 (없으면 난이도에 따라 결정)
+        min_holes (int): 최소 빈칸 개수
+        batch_size (int, optional): 업로드 요청 하나에 담는 퍼즐 수
+        progress_every (int): 진행 상황을 출력하는 간격 (0이면 출력하지 않음)
+        collect_stats (bool): 작업자별 탐색 통계(SearchStats)를 모아서 출력할지 여부
+        profile_dir (str, optional): 단계별 프로파일 저장 디렉터리 (있으면 한 프로세스에서 생성)
+        include_solution_path (bool): .jsonl 출력과 업로드 페이로드에 풀이 경로를 넣을지 여부
+        carve_priors (str, optional): 적응형 조각 후보 선택 통계 파일 (실행 사이에 학습을 이어감)
+        beam_width (int, optional): 있으면 빔 탐색으로 조각 (빈칸이 많은 expert 목표용)
+
+    Returns:
+        dict: summarize_generation_stats의 통계 (업로드했으면 'upload' 결과,
+            collect_stats면 합친 탐색 통계 'search_stats' 포함)
+    """
+    if seed is None:
+        seed = new_seed()  # 출력해서 같은 배치를 다시 만들 수 있게 함
+    sink = open_sink(out, include_solution_path) if out else None
+    api_client = PuzzleAPIClient(server_url) if upload else None
+    outbox = UploadOutbox(outbox_path) if upload and outbox_path else None
+    batch_size = batch_size or PuzzleAPIClient.DEFAULT_BATCH_SIZE
+
+    profiler = StageProfiler(profile_dir)
+    if profiler.enabled:
+        workers = 1  # cProfile과 스택 샘플링은 현재 프로세스만 측정
+    records_stats = []
+    search_stats = SearchStats() if collect_stats else None
+    payloads = []
+    uploaded = upload_errors = 0
+
+    def flush_uploads():
+        nonlocal uploaded, upload_errors
+        if outbox is not None:
+            for payload in payloads:
+                outbox.enqueue(payload)
+            result = outbox.drain(api_client, batch_size=batch_size)
+            uploaded += result['uploaded']
+            upload_errors += result['errors']
+        else:
+            results, _ = api_client.upload_puzzles(payloads, batch_size=batch_size)
+            succeeded = sum(1 for result in results if result['success'])
+            uploaded += succeeded
+            upload_errors += len(payloads) - succeeded
+        payloads.clear()
+
+    logger.info("퍼즐 %d개 생성 시작 (프로세스: %s, 난이도: %s, 시드: %s, 출력: %s)",
+                count, workers or '자동', difficulty or '자동', seed, out or '없음')
+    started = time.perf_counter()
+    try:
+        for record in iter_puzzles_parallel(count=count, workers=workers, difficulty=difficulty,
+                                            piece_counts=piece_counts, seed=seed,
+                                            max_holes=max_holes, min_holes=min_holes,
+                                            collect_stats=collect_stats, profiler=profiler,
+                                            carve_priors=carve_priors, beam_width=beam_width):
+            records_stats.append(record['stats'])
+            if search_stats is not None:
+                search_stats.merge(record['search_stats'])
+            if sink is not None:
+                sink.write(record)
+            if api_client is not None:
+                payloads.append(PuzzleDataFormatter.create_record_payload(
+                    record, include_solution_path=include_solution_path))
+                if len(payloads) >= batch_size:
+                    with profiler.stage("upload"):
+                        flush_uploads()
+
+            if progress_every and len(records_stats) % progress_every == 0:
+                elapsed = time.perf_counter() - started
+                logger.info("  %d/%d개 생성 (%.2f 퍼즐/초)", len(records_stats), count, len(records_stats) / elapsed)
+
+        if payloads:
+            with profiler.stage("upload"):
+                flush_uploads()
+    finally:
+        if sink is not None:
+            sink.close()
+        if outbox is not None:
+            outbox.close()
+
+    summary = summarize_generation_stats(records_stats, time.perf_counter() - started)
+    print_generation_summary(summary)
+    if search_stats is not None:
+        summary['search_stats'] = search_stats.as_dict()
+        print_search_stats(search_stats)
+    if profiler.enabled:
+        summary['profile_files'] = profiler.close()
+        profiler.print_summary()
+    if api_client is not None:
+        summary['upload'] = {'uploaded': uploaded, 'errors': upload_errors}
+        logger.info("서버 업로드: 성공 %d개, 실패 %d개", uploaded, upload_errors)
+    return summary
+
+def parse_piece_counts(text):
+    """'K=1,Q=1,N=2' 형태의 문자열을 기물 개수 dict로 변환"""
+    piece_counts = {}
+    for item in text.split(','):
+        piece_type, _, amount = item.partition('=')
+        piece_counts[piece_type.strip().upper()] = int(amount)
+    return piece_counts
+
+def build_parser():
+    """generate 명령의 인자 파서"""
+    parser = argparse.ArgumentParser(prog="python main.py generate",
+                                     description="체스도쿠 퍼즐 대량 생성")
+    parser.add_argument("--count", type=int, required=True, help="생성할 퍼즐 개수")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 개수 (기본: CPU 개수)")
+    parser.add_argument("--difficulty", choices=list(DifficultyManager.DIFFICULTY_SETTINGS),
+                        default=None, help="목표 난이도")
+    parser.add_argument("--seed", type=int, default=None, help="배치 시드 (같은 시드면 같은 퍼즐들)")
+    parser.add_argument("--out", default=None, help="출력 파일 (.jsonl, .sqlite3, .db, .bank)")
+    parser.add_argument("--upload", action="store_true", help="생성한 퍼즐을 서버에 업로드")
+    parser.add_argument("--server-url", default=None, help="업로드 서버 URL")
+    parser.add_argument("--outbox", default=None, help="업로드 전에 기록할 아웃박스 파일")
+    parser.add_argument("--pieces", type=parse_piece_counts, default=None,
+                        help="기물 구성 (예: K=1,Q=1,R=1,B=2,N=2)")
+    parser.add_argument("--max-holes", type=int, default=None, help="최대 빈칸 개수")
+    parser.add_argument("--min-holes", type=int, default=10, help="최소 빈칸 개수")
+    parser.add_argument("--stats", action="store_true", help="탐색 통계(노드 수, 백트래킹 등) 출력")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="단계별 .pstats와 stacks.collapsed를 저장할 디렉터리 (한 프로세스에서 생성)")
+    parser.add_argument("--solution-path", action="store_true",
+                        help=".jsonl 출력과 업로드 페이로드에 풀이 경로(칸, 숫자, 기법, 반복 번호) 포함")
+    parser.add_argument("--carve-priors", default=None, metavar="PATH",
+                        help="조각 후보를 검증 통과율로 학습해서 고르고, 학습한 통계를 이 파일에 저장 "
+                             "(시드만으로는 재현되지 않음)")
+    parser.add_argument("--beam-width", type=int, default=None, metavar="N",
+                        help="한 칸씩 조각하는 대신 N개의 부분 퍼즐을 유지하는 빔 탐색으로 조각 (expert용)")
+    add_logging_arguments(parser)
+    return parser
+
+def run_cli(argv=None):
+    """generate 명령 실행"""
+    args = build_parser().parse_args(argv)
+    configure_from_args(args)
+    return generate_batch(
+        args.count, workers=args.workers, difficulty=args.difficulty, seed=args.seed,
+        out=args.out, upload=args.upload, server_url=args.server_url, outbox_path=args.outbox,
+        piece_counts=args.pieces, max_holes=args.max_holes, min_holes=args.min_holes,
+        collect_stats=args.stats, profile_dir=args.profile, include_solution_path=args.solution_path,
+        carve_priors=args.carve_priors, beam_width=args.beam_width
+    )
+
+if __name__ == "__main__":
+    run_cli()
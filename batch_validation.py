@@ -0,0 +1,279 @@
+"""
+ChessSudoku 완성 보드 일괄 검증 모듈 (NumPy)
+
+SudokuValidator.is_valid_number는 칸 하나, 숫자 하나씩 검사하므로
+서버 정답 대조나 회귀 검사처럼 보드 수십만~수백만 개를 검증할 때는 너무 느립니다.
+여기서는 보드들을 (N, 9, 9) 정수 배열로 받아 행, 열, 박스, 기물 공격 범위의
+중복을 배열 연산으로 한 번에 검사합니다.
+
+    values, types, squares = decode_boards(answer_strings)   # puzzle_codec 81글자 문자열
+    valid, violations = validate_boards(values, (types, squares))
+    for index in np.flatnonzero(~valid):
+        print(index, describe_violation(*violations[index]))
+
+숫자 집합 검사는 칸마다 1 << 숫자 비트를 만들고, 한 묶음의 비트 합과 비트 OR이
+같으면 중복이 없다는 점을 이용합니다 (기물 칸과 패딩은 비트 0).
+
+기물 공격 범위는 기본적으로 ConstraintGraph.fill_peers와 같은 규칙을 씁니다.
+기물 칸을 뺀 공격 범위가 9칸을 넘으면 숫자가 모두 다를 수 없으므로 검사하지 않고,
+생성된 정답(verify_record)도 이 규칙만 만족합니다.
+include_large_groups=True면 validators의 전체 규칙대로 모든 공격 범위를 검사합니다.
+"""
+from validators import Piece, PiecePlacer
+from puzzle_codec import PIECE_TYPES
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 기물 타입 코드 (0은 기물 없음 - 패딩)
+PIECE_CODES = {piece_type: code for code, piece_type in enumerate(PIECE_TYPES, start=1)}
+
+# 위반 종류 (violations의 첫 번째 값), 두 번째 값은 종류별 번호
+VIOLATION_KINDS = ('cell', 'row', 'col', 'box', 'piece')
+KIND_CELL, KIND_ROW, KIND_COL, KIND_BOX, KIND_PIECE = range(len(VIOLATION_KINDS))
+
+DEFAULT_CHUNK_SIZE = 16384  # 한 번에 처리하는 보드 수 (메모리 사용량 제한)
+
+SENTINEL = 81  # 패딩 칸 인덱스 (항상 비트 0, 기물 없음)
+
+_tables = None
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise ImportError("batch_validation은 numpy가 필요합니다 (pip install numpy)")
+
+def _build_tables():
+    """(기물 타입, 칸)별 공격 범위 표와 숫자 비트 표를 한 번만 만듦"""
+    global _tables
+    if _tables is not None:
+        return _tables
+
+    # 공격 범위는 다른 기물에 막히지 않으므로 (기물 타입, 칸)만으로 정해짐
+    placer = PiecePlacer(None)
+    groups = [[[] for _ in range(81)] for _ in range(len(PIECE_TYPES) + 1)]
+    for piece_type, code in PIECE_CODES.items():
+        for square in range(81):
+            positions = placer._get_piece_attack_positions(Piece(piece_type, square // 9, square % 9))
+            groups[code][square] = sorted({r * 9 + c for r, c in positions})
+    width = max(len(group) for by_square in groups for group in by_square)
+    attacks = np.full((len(groups), 81, width), SENTINEL, dtype=np.int32)
+    attack_sizes = np.zeros((len(groups), 81), dtype=np.int16)
+    attacked = np.zeros((len(groups), 81, 82), dtype=bool)  # (타입, 기물 칸, 칸) -> 공격 여부
+    for code, by_square in enumerate(groups):
+        for square, group in enumerate(by_square):
+            attacks[code, square, :len(group)] = group
+            attack_sizes[code, square] = len(group)
+            attacked[code, square, group] = True
+
+    bits = np.zeros(256, dtype=np.int16)  # uint8 값 -> 숫자 비트 (1~9만 비트를 가짐)
+    bits[1:10] = 1 << np.arange(1, 10)
+
+    _tables = {'attacks': attacks, 'attack_sizes': attack_sizes, 'attacked': attacked,
+               'bits': bits}
+    return _tables
+
+def pieces_to_arrays(pieces_per_board):
+    """보드별 기물 리스트를 (기물 타입 코드, 칸 인덱스) 배열 쌍으로 변환
+
+    Args:
+        pieces_per_board (list): 보드마다 Piece 또는 (기물 타입, row, col) 튜플의 리스트
+
+    Returns:
+        tuple: (types, squares) - 둘 다 (N, 최대 기물 수) 배열, 기물이 없는 자리는 타입 0
+    """
+    _require_numpy()
+    pieces_per_board = list(pieces_per_board)
+    width = max((len(pieces) for pieces in pieces_per_board), default=0)
+    types = np.zeros((len(pieces_per_board), width), dtype=np.int8)
+    squares = np.zeros((len(pieces_per_board), width), dtype=np.int16)
+    for board_number, pieces in enumerate(pieces_per_board):
+        for piece_number, piece in enumerate(pieces):
+            if isinstance(piece, Piece):
+                piece_type, row, col = piece.piece_type, piece.row, piece.col
+            else:
+                piece_type, row, col = piece
+            types[board_number, piece_number] = PIECE_CODES[piece_type]
+            squares[board_number, piece_number] = row * 9 + col
+    return types, squares
+
+def boards_to_array(boards):
+    """Board 또는 9x9 리스트들을 (N, 9, 9) int8 배열로 변환 (숫자가 아닌 칸은 0)"""
+    _require_numpy()
+    values = np.zeros((len(boards), 9, 9), dtype=np.int8)
+    for board_number, board in enumerate(boards):
+        grid = board.board if hasattr(board, 'board') else board
+        for row in range(9):
+            for col in range(9):
+                value = grid[row][col]
+                if isinstance(value, int):
+                    values[board_number, row, col] = value
+    return values
+
+def decode_boards(texts):
+    """puzzle_codec의 81글자 문자열들을 배열로 한 번에 변환
+
+    기물 글자에서 기물 배치도 함께 복원하므로 pieces를 따로 만들 필요가 없습니다.
+
+    Returns:
+        tuple: (values (N, 9, 9) int8, types, squares) - types/squares는 pieces_to_arrays와 같은 형식
+    """
+    _require_numpy()
+    raw = np.frombuffer(''.join(texts).encode('ascii'), dtype=np.uint8).reshape(-1, 81)
+    digits = raw - ord('0')
+    values = np.where((digits >= 1) & (digits <= 9), digits, 0).astype(np.int8).reshape(-1, 9, 9)
+
+    codes = np.zeros(256, dtype=np.int8)
+    for piece_type, code in PIECE_CODES.items():
+        codes[ord(piece_type)] = code
+    cell_types = codes[raw]
+    board_numbers, cells = np.nonzero(cell_types)
+    counts = np.bincount(board_numbers, minlength=len(raw))
+    width = int(counts.max()) if len(raw) else 0
+    # 보드 안에서 몇 번째 기물인지 (행 우선 순서)
+    slots = np.arange(len(cells)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    types = np.zeros((len(raw), width), dtype=np.int8)
+    squares = np.zeros((len(raw), width), dtype=np.int16)
+    types[board_numbers, slots] = cell_types[board_numbers, cells]
+    squares[board_numbers, slots] = cells
+    return values, types, squares
+
+def _validate_chunk(values, types, squares, include_large_groups, tables):
+    """보드 묶음 하나 검증 - (N, 81 + 27 + 기물 수) 위반 여부 bool 배열 반환"""
+    count = len(values)
+    cell_values = values.reshape(count, 81)
+    has_piece = types > 0
+
+    # 기물 칸 표시 (패딩 칸 81 포함)
+    piece_cells = np.zeros((count, 82), dtype=bool)
+    board_numbers = np.broadcast_to(np.arange(count)[:, None], types.shape)
+    piece_cells[board_numbers[has_piece], squares[has_piece]] = True
+    piece_cells[:, SENTINEL] = False
+
+    # 1. 칸 검사: 기물 칸은 비어 있고, 나머지 칸은 1~9
+    digit = (cell_values >= 1) & (cell_values <= 9)
+    bad_cells = np.where(piece_cells[:, :81], cell_values != 0, ~digit)
+
+    # 기물 칸에 숫자가 있으면 이미 칸 검사에서 걸리므로 비트는 값 그대로 만듦
+    bits = np.zeros((count, 82), dtype=np.int16)
+    bits[:, :81] = tables['bits'][cell_values.astype(np.uint8)]
+
+    def duplicated(group_bits, axis=-1):
+        return group_bits.sum(axis=axis, dtype=np.int32) != np.bitwise_or.reduce(group_bits, axis=axis)
+
+    # 2. 행, 열, 박스 (모양만 바꿔서 복사 없이 검사)
+    grid = bits[:, :81].reshape(count, 9, 9)
+    boxes = grid.reshape(count, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(count, 9, 9)
+    bad_units = np.concatenate([duplicated(grid, 2), duplicated(grid, 1), duplicated(boxes, 2)], axis=1)
+
+    # 3. 기물 공격 범위 (보드별 오프셋을 더해 평탄화한 배열에서 한 번에 꺼냄)
+    attack_cells = tables['attacks'][types, squares]                     # (N, P, 폭)
+    attack_cells += (np.arange(count, dtype=np.int32) * 82)[:, None, None]
+    bad_attacks = duplicated(bits.reshape(-1)[attack_cells]) & has_piece
+    if not include_large_groups:
+        # 공격 범위 크기에서 그 안에 있는 다른 기물 칸 수를 뺌 (패딩 기물은 칸 81로 보냄)
+        other_squares = np.where(has_piece, squares, SENTINEL)
+        pieces_in_group = tables['attacked'][types[:, :, None], squares[:, :, None], other_squares[:, None, :]]
+        sizes = tables['attack_sizes'][types, squares] - pieces_in_group.sum(axis=-1)
+        bad_attacks &= sizes <= 9
+
+    return np.concatenate([bad_cells, bad_units, bad_attacks], axis=1)
+
+def validate_boards(boards, pieces_per_board, include_large_groups=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """완성 보드들을 한 번에 검증
+
+    Args:
+        boards: (N, 9, 9) 정수 배열 (기물 칸은 0), 또는 boards_to_array로 변환할 Board 리스트
+        pieces_per_board: 보드별 기물 리스트, 또는 pieces_to_arrays/decode_boards의 (types, squares)
+        include_large_groups (bool): 9칸을 넘는 공격 범위도 검사할지 여부 (모듈 설명 참고)
+        chunk_size (int): 한 번에 처리할 보드 수
+
+    Returns:
+        tuple: (valid, violations)
+            valid: (N,) bool 배열 - 보드별 통과 여부
+            violations: (N, 2) int16 배열 - 보드별 첫 번째 위반 (종류, 번호), 통과한 보드는 (-1, -1)
+                종류는 VIOLATION_KINDS의 인덱스, 번호는 칸 인덱스(cell), 행/열/박스 번호,
+                또는 그 보드의 기물 리스트에서 몇 번째 기물인지(piece)
+    """
+    _require_numpy()
+    tables = _build_tables()
+    if not isinstance(boards, np.ndarray):
+        boards = boards_to_array(boards)
+    if isinstance(pieces_per_board, tuple) and len(pieces_per_board) == 2 and \
+            isinstance(pieces_per_board[0], np.ndarray):
+        types, squares = pieces_per_board
+    else:
+        types, squares = pieces_to_arrays(pieces_per_board)
+    if len(types) != len(boards):
+        raise ValueError(f"보드 수({len(boards)})와 기물 리스트 수({len(types)})가 다릅니다.")
+
+    count = len(boards)
+    valid = np.ones(count, dtype=bool)
+    violations = np.full((count, 2), -1, dtype=np.int16)
+    # 검사 항목 순서: 칸 81개, 행 9개, 열 9개, 박스 9개, 기물들
+    kind_of = np.array([KIND_CELL] * 81 + [KIND_ROW] * 9 + [KIND_COL] * 9 + [KIND_BOX] * 9
+                       + [KIND_PIECE] * types.shape[1], dtype=np.int16)
+    number_of = np.concatenate([np.arange(81), np.tile(np.arange(9), 3),
+                                np.arange(types.shape[1])]).astype(np.int16)
+
+    for start in range(0, count, chunk_size):
+        end = min(start + chunk_size, count)
+        bad = _validate_chunk(boards[start:end], types[start:end].astype(np.intp),
+                              squares[start:end].astype(np.intp), include_large_groups, tables)
+        failed = bad.any(axis=1)
+        first = bad.argmax(axis=1)
+        valid[start:end] = ~failed
+        violations[start:end, 0] = np.where(failed, kind_of[first], -1)
+        violations[start:end, 1] = np.where(failed, number_of[first], -1)
+
+    return valid, violations
+
+def describe_violation(kind, number):
+    """violations의 (종류, 번호)를 설명 문자열로 변환"""
+    kind, number = int(kind), int(number)
+    if kind < 0:
+        return None
+    if kind == KIND_CELL:
+        return f"칸 ({number // 9}, {number % 9})의 값이 올바르지 않습니다"
+    if kind == KIND_PIECE:
+        return f"{number}번째 기물의 공격 범위에 같은 숫자가 있습니다"
+    unit_names = {KIND_ROW: "행", KIND_COL: "열", KIND_BOX: "박스"}
+    return f"{number}번 {unit_names[kind]}에 같은 숫자가 있습니다"
+
+def test_validate_boards(count=20, copies=50000, seed=1234):
+    """생성한 정답 보드를 verify_record와 비교하고, 복사본 일괄 검증 속도 측정"""
+    import time
+    from pipeline import iter_puzzles, verify_record
+    from puzzle_codec import encode_board
+
+    print("=" * 50)
+    print("일괄 검증 테스트")
+    print("=" * 50)
+
+    records = list(iter_puzzles(count=count, seed=seed, max_holes=10))
+    texts = [encode_board(record['answer'], record['pieces']) for record in records]
+    values, types, squares = decode_boards(texts)
+    valid, violations = validate_boards(values, (types, squares))
+    expected = [verify_record(record)[0] for record in records]
+    print(f"정답 보드 {count}개: 통과 {int(valid.sum())}개 (verify_record 통과 {sum(expected)}개)")
+
+    # 숫자 두 개를 바꿔 규칙을 깨뜨린 보드
+    broken = values.copy()
+    broken[:, 0, [0, 1]] = broken[:, 0, [1, 0]]
+    broken_valid, broken_violations = validate_boards(broken, (types, squares))
+    for index in range(min(3, count)):
+        if not broken_valid[index]:
+            print(f"  변형 보드 {index}: {describe_violation(*broken_violations[index])}")
+
+    repeated = np.repeat(values, copies // count, axis=0)
+    started = time.perf_counter()
+    validate_boards(repeated, (np.repeat(types, copies // count, axis=0),
+                               np.repeat(squares, copies // count, axis=0)))
+    elapsed = time.perf_counter() - started
+    print(f"보드 {len(repeated):,}개 검증: {elapsed:.2f}초 ({len(repeated) / elapsed:,.0f} 보드/초)")
+
+if __name__ == "__main__":
+    test_validate_boards()
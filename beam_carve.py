@@ -0,0 +1,228 @@
+"""
+ChessSudoku 빔 탐색 조각 모듈
+
+한 칸씩 욕심껏 조각하는 PuzzleGenerator.generate_puzzle은 초반 선택 때문에 더 조각할 칸이
+없어지는 국소 최적에 자주 빠집니다. beam_carve는 부분 퍼즐을 beam_width개까지 유지하면서
+각각을 여러 후보 빈칸으로 확장하고, (빈칸 수 + SLACK_WEIGHT x 여유) 점수가 높은 것만 남깁니다.
+
+상태는 완성 보드에서 조각한 칸 인덱스들의 기록(trail)뿐이고, 확장할 때만 격자를 만듭니다.
+
+여유(slack):
+    아직 숫자가 있는 칸 중 fill_peers만 보고도 숫자가 하나로 정해지는 칸 수.
+    이런 칸은 빼도 논리적 풀이가 첫 반복의 단일 후보로 다시 채우므로 검증 풀이 없이
+    조각할 수 있습니다 (풀이 호출 0회). 여유가 많은 상태일수록 더 깊이 조각할 수 있습니다.
+    정해지지 않는 칸을 뺄 때만 LogicalSolver로 검증합니다.
+
+마지막에 가장 좋은 상태를 한 번 더 풀어서 풀이 경로와 기법 사용 프로필을 얻고, 그 풀이가
+실패하거나 목표 난이도를 넘으면 마지막으로 검증 풀이를 통과한 조상 상태로 돌아갑니다.
+"""
+import copy
+from board import Board
+from logical_solver import LogicalSolver
+from difficulty import difficulty_rank, rate_profile
+from log_setup import get_logger, log_event, events_enabled
+
+logger = get_logger(__name__)
+
+DEFAULT_BEAM_WIDTH = 4
+DEFAULT_EXPANSIONS = 6   # 상태 하나를 확장하는 후보 빈칸 수
+SLACK_WEIGHT = 0.5       # 점수에서 여유 칸 하나의 가중치
+
+class BeamState:
+    """빔의 부분 퍼즐 하나
+
+    속성:
+        trail (tuple): 조각한 칸 인덱스들 (조각 순서)
+        slack (int): 검증 없이 조각할 수 있는 칸 수
+        forced (list): 그 칸들의 인덱스
+        verified (tuple): (trail 길이, 기법 사용 프로필) - 마지막으로 검증 풀이를 통과한 조상
+    """
+
+    __slots__ = ('trail', 'slack', 'forced', 'verified')
+
+    def __init__(self, trail, slack, forced, verified):
+        self.trail = trail
+        self.slack = slack
+        self.forced = forced
+        self.verified = verified
+
+    @property
+    def holes(self):
+        return len(self.trail)
+
+    @property
+    def score(self):
+        return len(self.trail) + SLACK_WEIGHT * self.slack
+
+def _grid_of(complete_grid, trail):
+    """완성 보드의 평탄한 격자(81칸)에 trail의 칸들을 비운 복사본"""
+    grid = list(complete_grid)
+    for index in trail:
+        grid[index] = None
+    return grid
+
+def _forced_cells(grid, graph, carvable):
+    """숫자가 있는 조각 가능한 칸 중 fill_peers의 숫자들만으로 값이 정해지는 칸들"""
+    forced = []
+    fill_peers = graph.fill_peers
+    for index in carvable:
+        value = grid[index]
+        if value is None:
+            continue
+        seen = set()
+        for peer in fill_peers[index]:
+            digit = grid[peer]
+            if isinstance(digit, int):
+                seen.add(digit)
+        if len(seen) == 8:  # 자기 숫자만 남음 (정답 보드라서 peer에 같은 숫자는 없음)
+            forced.append(index)
+    return forced
+
+def _solve(grid, generator):
+    """격자를 논리적으로 풀어서 풀이기 반환 (풀지 못하면 None)"""
+    board = Board()
+    board.board = [grid[row * 9:row * 9 + 9] for row in range(9)]
+    solver = LogicalSolver(board, generator.pieces, generator.constraint_graph, generator.stats,
+                           record_steps=True)
+    return solver if solver.solve_logically() else None
+
+def beam_carve(generator, max_holes, beam_width=DEFAULT_BEAM_WIDTH, expansions=DEFAULT_EXPANSIONS,
+               target_difficulty=None):
+    """빔 탐색으로 조각할 칸 순서 결정
+
+    Args:
+        generator (PuzzleGenerator): 완성 보드, 기물, 제약 그래프, rng, stats를 가진 생성기
+        max_holes (int): 최대 빈칸 개수
+        beam_width (int): 유지하는 부분 퍼즐 수
+        expansions (int): 상태 하나를 확장하는 후보 빈칸 수 (여유 칸을 먼저, 모자라면 일반 칸)
+        target_difficulty (str, optional): 검증 풀이의 난이도가 이보다 어려운 확장은 버리고,
+            가장 좋은 상태가 이보다 쉬우면 max_holes를 넘어서도 더 조각함
+
+    Returns:
+        tuple: (조각한 칸 인덱스 tuple, 마지막 검증 풀이의 LogicalSolver)
+    """
+    rng = generator.rng
+    stats = generator.stats
+    graph = generator.constraint_graph
+    complete_grid = [value for row in generator.complete_board.board for value in row]
+    carvable = [index for index in range(81)
+                if index not in graph.piece_cells and isinstance(complete_grid[index], int)]
+    target_rank = difficulty_rank(target_difficulty) if target_difficulty else None
+    log_events = events_enabled()
+
+    root_forced = _forced_cells(complete_grid, graph, carvable)
+    beam = [BeamState((), len(root_forced), root_forced, (0, None))]
+    best = beam[0]
+    depth = 0
+
+    def below_target(state):
+        profile = state.verified[1]
+        return target_rank is not None and (
+            profile is None or difficulty_rank(rate_profile(profile)) < target_rank)
+
+    while beam and (best.holes < max_holes or below_target(best)):
+        depth += 1
+        children = {}
+        for state in beam:
+            grid = _grid_of(complete_grid, state.trail)
+            carved = set(state.trail)
+
+            # 여유 칸을 먼저, 모자라면 검증이 필요한 일반 칸으로 후보를 채움
+            forced = state.forced
+            picks = rng.sample(forced, min(expansions, len(forced)))
+            if len(picks) < expansions:
+                forced_set = set(forced)
+                others = [index for index in carvable if index not in carved and index not in forced_set]
+                picks += rng.sample(others, min(expansions - len(picks), len(others)))
+
+            for index in picks:
+                trail = state.trail + (index,)
+                key = frozenset(trail)
+                if key in children:
+                    continue
+                value = grid[index]
+                grid[index] = None
+                verified = state.verified
+                accepted = True
+                if index not in state.forced:
+                    solver = _solve(list(grid), generator)
+                    accepted = solver is not None and (
+                        target_rank is None
+                        or difficulty_rank(rate_profile(solver.get_technique_profile())) <= target_rank)
+                    if accepted:
+                        verified = (len(trail), solver.get_technique_profile())
+                if stats is not None:
+                    stats.carve_attempts += 1
+                    if accepted:
+                        stats.carve_accepts += 1
+                    else:
+                        stats.carve_rejects += 1
+                if accepted:
+                    child_forced = _forced_cells(grid, graph, carvable)
+                    children[key] = BeamState(trail, len(child_forced), child_forced, verified)
+                grid[index] = value
+
+        beam = sorted(children.values(), key=lambda state: state.score, reverse=True)[:beam_width]
+        for state in beam:
+            if (state.holes, state.slack) > (best.holes, best.slack):
+                best = state
+        logger.debug("빔 깊이 %d: 상태 %d개, 최고 빈칸 %d개", depth, len(beam), best.holes)
+        if log_events:
+            log_event("beam_depth", depth=depth, states=len(beam), best_holes=best.holes,
+                      best_slack=best.slack)
+
+    # 최종 풀이로 풀이 경로와 프로필을 얻음 (실패하거나 목표를 넘으면 검증된 조상으로)
+    solver = _solve(_grid_of(complete_grid, best.trail), generator)
+    if solver is None or (target_rank is not None and
+                          difficulty_rank(rate_profile(solver.get_technique_profile())) > target_rank):
+        trail = best.trail[:best.verified[0]]
+        logger.info("빔 탐색 결과를 검증된 %d칸으로 되돌립니다.", len(trail))
+        solver = _solve(_grid_of(complete_grid, trail), generator)
+    else:
+        trail = best.trail
+    return trail, solver
+
+def test_beam_carve(puzzles=8, max_holes=65, seed=11, restarts=5):
+    """욕심 조각 재시작과 빔 탐색의 빈칸 수, 풀이 호출 수 비교"""
+    from board_generator import BoardGenerator
+    from random_placer import RandomPiecePlacer
+    from puzzle_generator import PuzzleGenerator
+    from constraint_graph import ConstraintGraph
+    from search_stats import SearchStats
+    from seeding import derive_seed
+
+    print("=" * 50)
+    print("빔 탐색 조각 테스트")
+    print("=" * 50)
+
+    greedy_stats, beam_stats = SearchStats(), SearchStats()
+    greedy_holes = beam_holes = 0
+    for index in range(puzzles):
+        board = Board()
+        placer = RandomPiecePlacer(board, derive_seed(seed, 'layout', index))
+        placer.place_pieces_randomly()
+        pieces = placer.get_pieces()
+        graph = ConstraintGraph.from_pieces(pieces)
+        if not BoardGenerator(board, pieces, graph, derive_seed(seed, 'fill', index)).generate_complete_board():
+            continue
+
+        best = 0
+        for restart in range(restarts):
+            generator = PuzzleGenerator(copy.deepcopy(board), pieces, graph,
+                                        derive_seed(seed, 'greedy', index, restart), greedy_stats)
+            generator.generate_puzzle(max_holes=max_holes)
+            best = max(best, len(generator.carved_cells))
+        greedy_holes += best
+
+        generator = PuzzleGenerator(copy.deepcopy(board), pieces, graph, derive_seed(seed, 'beam', index),
+                                    beam_stats)
+        generator.generate_puzzle(max_holes=max_holes, beam_width=DEFAULT_BEAM_WIDTH)
+        beam_holes += len(generator.carved_cells)
+        print(f"퍼즐 {index}: 욕심 {restarts}회 최고 {best}칸, 빔 {len(generator.carved_cells)}칸 "
+              f"({generator.get_puzzle_difficulty()})")
+
+    print(f"욕심 조각 {restarts}회 재시작: 빈칸 {greedy_holes}개, 풀이 {greedy_stats.solver_runs}회")
+    print(f"빔 탐색 (폭 {DEFAULT_BEAM_WIDTH}): 빈칸 {beam_holes}개, 풀이 {beam_stats.solver_runs}회")
+
+if __name__ == "__main__":
+    test_beam_carve()
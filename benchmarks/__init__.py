@@ -0,0 +1,14 @@
+"""
+ChessSudoku 성능 벤치마크 패키지
+
+고정 시드와 고정 퍼즐 모음(corpus.json)으로 생성 파이프라인의 주요 경로를 측정하고,
+결과를 JSON으로 저장해서 커밋 간에 비교합니다.
+
+    python -m benchmarks.run --out base.json
+    (변경 후)
+    python -m benchmarks.run --out new.json
+    python -m benchmarks.compare base.json new.json --threshold 0.10
+
+퍼즐 모음 다시 만들기 (생성 규칙이 바뀌었을 때만):
+    python -m benchmarks.corpus
+"""
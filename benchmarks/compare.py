@@ -0,0 +1,77 @@
+"""
+벤치마크 결과 비교
+
+두 결과 파일(benchmarks.run --out)의 항목별 중앙값을 비교해서, threshold보다
+느려진 항목이 있으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python -m benchmarks.compare base.json new.json [--threshold 0.10]
+"""
+import argparse
+import json
+import sys
+
+DEFAULT_THRESHOLD = 0.10  # 중앙값이 10% 넘게 늘어나면 성능 저하로 판단
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_reports(base, new, threshold=DEFAULT_THRESHOLD):
+    """두 결과의 공통 항목 비교
+
+    Returns:
+        list: 항목별 dict (name, base, new, ratio, status)
+            status는 'regression', 'improvement', 'same' 중 하나
+    """
+    rows = []
+    for name, base_result in base['results'].items():
+        new_result = new['results'].get(name)
+        if new_result is None:
+            continue
+
+        ratio = new_result['median'] / base_result['median'] if base_result['median'] > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improvement'
+        else:
+            status = 'same'
+        rows.append({
+            'name': name,
+            'base': base_result['median'],
+            'new': new_result['median'],
+            'ratio': ratio,
+            'status': status,
+        })
+    return rows
+
+def print_comparison(rows, base, new):
+    """비교 결과 표 출력"""
+    print(f"기준: {base['meta'].get('commit')}  비교: {new['meta'].get('commit')}")
+    print(f"{'항목':<18}{'기준':>12}{'비교':>12}{'비율':>8}  결과")
+    labels = {'regression': '느려짐 ❌', 'improvement': '빨라짐 ✅', 'same': '-'}
+    for row in rows:
+        print(f"{row['name']:<18}{row['base'] * 1000:>10.2f}ms{row['new'] * 1000:>10.2f}ms"
+              f"{row['ratio']:>8.2f}  {labels[row['status']]}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description="벤치마크 결과 비교")
+    parser.add_argument("base", help="기준 결과 JSON")
+    parser.add_argument("new", help="비교할 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="성능 저하로 판단하는 중앙값 증가 비율 (기본 0.10)")
+    args = parser.parse_args(argv)
+
+    base, new = load_report(args.base), load_report(args.new)
+    rows = compare_reports(base, new, args.threshold)
+    print_comparison(rows, base, new)
+
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n성능 저하: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+벤치마크용 고정 퍼즐 모음
+
+퍼즐은 puzzle_codec의 81글자 문자열로 corpus.json에 저장되어 있어서,
+생성 코드가 바뀌어도 풀이/직렬화 벤치마크는 같은 입력으로 측정됩니다.
+"""
+import json
+import os
+from puzzle_codec import encode_board, decode_board
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "corpus.json")
+CORPUS_SEED = 20240101
+CORPUS_SIZE = 20
+
+def build_corpus(count=CORPUS_SIZE, seed=CORPUS_SEED, max_holes=45):
+    """iter_puzzles로 퍼즐 모음 생성 (퍼즐마다 dict)"""
+    from pipeline import iter_puzzles
+
+    corpus = []
+    for record in iter_puzzles(count=count, seed=seed, max_holes=max_holes):
+        corpus.append({
+            'seed': record['seed'],
+            'holes_count': record['info']['holes_count'],
+            'puzzle': encode_board(record['puzzle'], record['pieces']),
+            'answer': encode_board(record['answer'], record['pieces']),
+        })
+    return corpus
+
+def save_corpus(corpus, path=CORPUS_PATH):
+    """퍼즐 모음을 JSON 파일로 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'seed': CORPUS_SEED, 'puzzles': corpus}, f, indent=1)
+        f.write("\n")
+
+def load_corpus(path=CORPUS_PATH):
+    """퍼즐 모음을 (퍼즐 Board, 정답 Board, 기물 리스트) 튜플 리스트로 반환"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    corpus = []
+    for item in data['puzzles']:
+        puzzle_board, _ = decode_board(item['puzzle'])
+        answer_board, pieces = decode_board(item['answer'])
+        corpus.append((puzzle_board, answer_board, pieces))
+    return corpus
+
+if __name__ == "__main__":
+    save_corpus(build_corpus())
+    print(f"퍼즐 모음 저장: {CORPUS_PATH}")
@@ -0,0 +1,212 @@
+"""
+생성 파이프라인 벤치마크 실행
+
+측정 항목:
+    fill/<기물 구성>    BoardGenerator.generate_complete_board (고정 시드 기물 배치들)
+    solve/corpus        LogicalSolver.solve_logically (고정 퍼즐 모음)
+    carve/<빈칸 수>     PuzzleGenerator.generate_puzzle (25, 45, 60칸)
+    format/payload      PuzzleDataFormatter 페이로드 생성 + JSON 직렬화
+    format/compact      PuzzleDataFormatter 압축 페이로드 생성 + JSON 직렬화
+    validate/batch      batch_validation.validate_boards (정답 보드 복사본들, numpy가 있을 때만)
+
+사용법:
+    python -m benchmarks.run [--filter fill] [--repeat 5] [--warmup 1] [--out results.json]
+
+항목마다 warmup회 실행한 뒤 repeat회 측정하고, 입력 준비(보드 복사 등)는 측정에서 제외합니다.
+"""
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import time
+from board import Board
+from board_generator import BoardGenerator
+from random_placer import RandomPiecePlacer
+from puzzle_generator import PuzzleGenerator
+from logical_solver import LogicalSolver
+from constraint_graph import ConstraintGraph
+from puzzle_api_client import PuzzleDataFormatter
+from batch_validation import NUMPY_AVAILABLE, boards_to_array, pieces_to_arrays, validate_boards
+from seeding import derive_seed
+from benchmarks.corpus import load_corpus
+
+BENCH_SEED = 4242
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# 보드 채우기 측정용 기물 구성 (None은 RandomPiecePlacer 기본 구성)
+FILL_PROFILES = {
+    'default': None,
+    'king': {'K': 1},
+    'knights': {'N': 4},
+    'bishops': {'B': 2, 'K': 1},
+    'heavy': {'K': 1, 'Q': 1, 'R': 2, 'B': 2, 'N': 2},
+}
+FILL_LAYOUTS = 5          # 기물 구성마다 측정하는 배치 수
+CARVE_HOLES = (25, 45, 60)
+CARVE_PUZZLES = 3         # 빈칸 수마다 조각하는 퍼즐 수
+VALIDATE_BOARDS = 100000  # 일괄 검증하는 보드 수 (정답 보드 반복)
+
+def place_layout(piece_counts, index):
+    """고정 시드로 기물을 배치한 보드와 기물 리스트 반환"""
+    board = Board()
+    placer = RandomPiecePlacer(board, derive_seed(BENCH_SEED, 'fill', str(piece_counts), index))
+    placer.place_pieces_randomly(piece_counts)
+    return board, placer.get_pieces()
+
+def fill_case(piece_counts):
+    """기물 구성 하나의 보드 채우기 측정 항목"""
+    layouts = [place_layout(piece_counts, index) for index in range(FILL_LAYOUTS)]
+
+    def prepare():
+        return [(copy.deepcopy(board), pieces, derive_seed(BENCH_SEED, 'fill-rng', index))
+                for index, (board, pieces) in enumerate(layouts)]
+
+    def run(inputs):
+        for board, pieces, seed in inputs:
+            BoardGenerator(board, pieces, ConstraintGraph.from_pieces(pieces), seed).generate_complete_board()
+
+    return prepare, run
+
+def solve_case(corpus):
+    """고정 퍼즐 모음의 논리적 풀이 측정 항목"""
+    def prepare():
+        return [(copy.deepcopy(puzzle_board), pieces) for puzzle_board, _, pieces in corpus]
+
+    def run(inputs):
+        for puzzle_board, pieces in inputs:
+            LogicalSolver(puzzle_board, pieces).solve_logically()
+
+    return prepare, run
+
+def carve_case(corpus, max_holes):
+    """정답 보드에서 max_holes칸까지 조각하는 측정 항목"""
+    answers = [(answer_board, pieces) for _, answer_board, pieces in corpus[:CARVE_PUZZLES]]
+
+    def prepare():
+        return answers
+
+    def run(inputs):
+        for index, (answer_board, pieces) in enumerate(inputs):
+            generator = PuzzleGenerator(answer_board, pieces, rng=derive_seed(BENCH_SEED, 'carve', max_holes, index))
+            generator.generate_puzzle(max_holes=max_holes)
+
+    return prepare, run
+
+def format_case(corpus, compact=False):
+    """페이로드 생성과 JSON 직렬화 측정 항목"""
+    create = PuzzleDataFormatter.create_compact_payload if compact else PuzzleDataFormatter.create_puzzle_payload
+
+    def prepare():
+        return corpus
+
+    def run(inputs):
+        for puzzle_board, answer_board, pieces in inputs:
+            json.dumps(create(puzzle_board, answer_board, pieces, "medium"), separators=(',', ':'))
+
+    return prepare, run
+
+def validate_case(corpus):
+    """정답 보드들을 반복한 VALIDATE_BOARDS개 보드의 일괄 검증 측정 항목"""
+    import numpy as np
+
+    repeat = VALIDATE_BOARDS // len(corpus)
+    values = np.repeat(boards_to_array([answer_board for _, answer_board, _ in corpus]), repeat, axis=0)
+    types, squares = (np.repeat(array, repeat, axis=0)
+                      for array in pieces_to_arrays([pieces for _, _, pieces in corpus]))
+
+    def prepare():
+        return values, (types, squares)
+
+    def run(inputs):
+        validate_boards(*inputs)
+
+    return prepare, run
+
+def build_cases():
+    """측정 항목 이름 -> (prepare, run) dict"""
+    corpus = load_corpus()
+    cases = {}
+    for name, piece_counts in FILL_PROFILES.items():
+        cases[f"fill/{name}"] = fill_case(piece_counts)
+    cases["solve/corpus"] = solve_case(corpus)
+    for max_holes in CARVE_HOLES:
+        cases[f"carve/{max_holes}"] = carve_case(corpus, max_holes)
+    cases["format/payload"] = format_case(corpus)
+    cases["format/compact"] = format_case(corpus, compact=True)
+    if NUMPY_AVAILABLE:
+        cases["validate/batch"] = validate_case(corpus)
+    return cases
+
+def measure(prepare, run, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """warmup회 실행 후 repeat회 측정한 소요 시간 통계 반환 (초)"""
+    for _ in range(warmup):
+        run(prepare())
+
+    times = []
+    for _ in range(repeat):
+        inputs = prepare()
+        started = time.perf_counter()
+        run(inputs)
+        times.append(time.perf_counter() - started)
+
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'repeat': repeat,
+        'times': times,
+    }
+
+def git_commit():
+    """현재 git 커밋 해시 (git이 없으면 None)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(name_filter=None, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """벤치마크 실행 후 결과 dict 반환 (meta, results)"""
+    results = {}
+    for name, (prepare, run) in build_cases().items():
+        if name_filter and name_filter not in name:
+            continue
+        result = measure(prepare, run, repeat, warmup)
+        results[name] = result
+        print(f"{name:<18} 중앙값 {result['median'] * 1000:>10.2f}ms  "
+              f"최소 {result['min'] * 1000:>10.2f}ms  표준편차 {result['stdev'] * 1000:>8.2f}ms")
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'seed': BENCH_SEED,
+            'repeat': repeat,
+            'warmup': warmup,
+        },
+        'results': results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="생성 파이프라인 벤치마크")
+    parser.add_argument("--filter", default=None, help="이름에 이 문자열이 들어간 항목만 실행")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="측정 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="측정 전 실행 횟수")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.filter, args.repeat, args.warmup)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"결과 저장: {args.out}")
+    return report
+
+if __name__ == "__main__":
+    main()
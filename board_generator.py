@@ -1,21 +1,57 @@
 from board import Board
-from validators import PiecePlacer, SudokuValidator
-import random
+from constraint_graph import ConstraintGraph, COORDS, cell_index
+from seeding import make_rng
+from log_setup import get_logger, log_event, events_enabled
+from collections import OrderedDict
+import time
+
+logger = get_logger(__name__)
+
+class SearchBudgetExceeded(Exception):
+    """한 번의 탐색이 노드 예산을 넘었을 때 재시작을 위해 사용하는 예외"""
 
 class BoardGenerator:
     """체스 기물과 스도쿠 제약 조건을 모두 고려한 보드 생성기"""
     
-    def __init__(self, board, pieces):
+    # 학습한 nogood 캐시 설정
+    MAX_NOGOODS = 20000      # 캐시에 보관할 최대 nogood 개수 (LRU 방식으로 제거)
+    MAX_NOGOOD_SIZE = 12     # 이보다 큰 충돌 집합은 재사용 가능성이 낮아 저장하지 않음
+    
+    # 재시작 설정: 한 번의 탐색이 노드 예산을 넘으면 다른 무작위 순서로 다시 시작
+    # (학습한 nogood은 기물 배치에 대한 사실이므로 재시작 후에도 유지)
+    INITIAL_NODE_BUDGET = 2000
+    NODE_BUDGET_GROWTH = 1.5
+    MAX_RESTARTS = 20         # 이만큼 재시작해도 못 채우면 실패로 처리
+    
+    def __init__(self, board, pieces, constraint_graph=None, rng=None, stats=None):
         self.board = board
         self.pieces = pieces
-        self.piece_placer = PiecePlacer(board)
-        self.piece_placer.pieces = pieces
-        self.sudoku_validator = SudokuValidator(board)
+        self.rng = make_rng(rng)  # random.Random 인스턴스 또는 시드
+        self.stats = stats        # SearchStats (None이면 통계를 세지 않음)
+        
+        # 기물 배치별 제약 관계 (없으면 기물 목록으로부터 생성)
+        self.constraint_graph = constraint_graph or ConstraintGraph.from_pieces(pieces)
         
         # 각 칸의 가능한 값들을 추적하는 딕셔너리
         # 키: (row, col) 튜플, 값: 가능한 숫자들의 set
         self.possible_values = {}
         self.initialize_possible_values()
+        
+        # 충돌 기반 백점핑(Conflict-directed Backjumping)용 상태
+        # pruned_by: 키 (row, col), 값: 이 칸의 후보를 제거한 결정 칸들 (제거 순서대로)
+        self.pruned_by = {cell: [] for cell in self.possible_values}
+        
+        # 학습한 nogood: 함께 존재할 수 없는 (칸, 숫자) 조합
+        # nogoods: frozenset -> None (OrderedDict로 LRU 순서 유지)
+        # nogood_index: (칸, 숫자) -> 그 조합을 포함하는 nogood들의 set
+        self.nogoods = OrderedDict()
+        self.nogood_index = {}
+        
+        # 재시작용 상태: 탐색 시작 시점의 빈 칸 후보들과 노드 수
+        self.initial_possible_values = {cell: set(values) for cell, values in self.possible_values.items()}
+        self.nodes = 0
+        self.node_budget = None
+        self.restarts = 0
     
     def initialize_possible_values(self):
         """모든 빈 칸의 가능한 값들을 초기화"""
@@ -32,45 +68,48 @@ class BoardGenerator:
                             self.possible_values[(row, col)].add(number)
     
     def is_valid_number(self, row, col, number):
-        """해당 위치에 숫자를 놓을 수 있는지 검사"""
-        # 1. 기본 스도쿠 규칙 검사
-        if not self.sudoku_validator.is_valid_number(row, col, number):
-            return False
-        
-        # 2. 체스 기물 규칙 검사
-        if not self.piece_placer.is_valid_number_for_piece(row, col, number):
-            return False
-        
-        return True
+        """해당 위치에 숫자를 놓을 수 있는지 검사 (스도쿠 규칙 + 체스 기물 규칙)"""
+        if self.stats is not None:
+            self.stats.is_valid_number_calls += 1
+        return self.constraint_graph.is_valid_number(self.board, row, col, number)
     
     def forward_check(self, row, col, number):
-        """숫자를 배치한 후 영향을 받는 칸들의 가능한 값들을 업데이트"""
+        """숫자를 배치한 후 영향을 받는 칸들의 가능한 값들을 업데이트
+        
+        행, 열, 박스뿐 아니라 같은 기물의 공격 범위에 있는 칸들도 검사합니다.
+        (공격 범위가 9칸을 넘어 만족할 수 없는 기물은 ConstraintGraph.fill_peers에서 제외됨)
+        실패한 경우 affected_cells의 마지막 칸이 후보가 0개가 된 칸입니다.
+        """
         affected_cells = []
         
-        # 같은 행, 열, 3x3 박스의 빈 칸들 찾기
-        for r in range(9):
-            for c in range(9):
-                if self.board.get_value(r, c) is None:  # 빈 칸인 경우
-                    # 같은 행, 열, 또는 박스에 있으면 영향받음
-                    if (r == row or c == col or 
-                        (r//3 == row//3 and c//3 == col//3)):
-                        
-                        # 이 칸에서 해당 숫자를 제거
-                        if number in self.possible_values.get((r, c), set()):
-                            self.possible_values[(r, c)].discard(number)
-                            affected_cells.append((r, c))
-                            
-                            # 가능한 값이 0개가 되면 실패
-                            if len(self.possible_values[(r, c)]) == 0:
-                                return False, affected_cells
+        for index in self.constraint_graph.fill_peers[cell_index(row, col)]:
+            cell = COORDS[index]
+            if self.board.get_value(cell[0], cell[1]) is not None:
+                continue
+            
+            # 이 칸에서 해당 숫자를 제거
+            possible = self.possible_values.get(cell)
+            if possible is not None and number in possible:
+                possible.discard(number)
+                self.pruned_by[cell].append((row, col))
+                affected_cells.append(cell)
+                
+                # 가능한 값이 0개가 되면 실패
+                if len(possible) == 0:
+                    if self.stats is not None:
+                        self.stats.prunings += len(affected_cells)
+                        self.stats.wipeouts += 1
+                    return False, affected_cells
         
+        if self.stats is not None:
+            self.stats.prunings += len(affected_cells)
         return True, affected_cells
     
     def restore_possible_values(self, affected_cells, number):
         """백트래킹 시 가능한 값들을 복원"""
-        for row, col in affected_cells:
-            if self.is_valid_number(row, col, number):
-                self.possible_values[(row, col)].add(number)
+        for cell in affected_cells:
+            self.possible_values[cell].add(number)
+            self.pruned_by[cell].pop()
     
     def find_best_empty_cell(self):
         """MRV를 적용하여 가장 제약이 많은 빈 칸을 찾아서 반환"""
@@ -93,6 +132,38 @@ class BoardGenerator:
         
         return best_cell
     
+    def learn_nogood(self, conflict_set):
+        """충돌 집합을 현재 값과 함께 nogood으로 저장 (LRU 캐시)"""
+        if not conflict_set or len(conflict_set) > self.MAX_NOGOOD_SIZE:
+            return
+        
+        nogood = frozenset((cell, self.board.get_value(cell[0], cell[1])) for cell in conflict_set)
+        if nogood in self.nogoods:
+            self.nogoods.move_to_end(nogood)
+            return
+        
+        self.nogoods[nogood] = None
+        for literal in nogood:
+            self.nogood_index.setdefault(literal, set()).add(nogood)
+        
+        # 용량 초과 시 가장 오래 사용되지 않은 nogood 제거
+        while len(self.nogoods) > self.MAX_NOGOODS:
+            old_nogood, _ = self.nogoods.popitem(last=False)
+            for literal in old_nogood:
+                bucket = self.nogood_index.get(literal)
+                if bucket is not None:
+                    bucket.discard(old_nogood)
+                    if not bucket:
+                        del self.nogood_index[literal]
+    
+    def find_violated_nogood(self, row, col, number):
+        """(row, col)=number 배치로 완성되는 nogood이 있으면 반환, 없으면 None"""
+        for nogood in self.nogood_index.get(((row, col), number), ()):
+            if all(self.board.get_value(cell[0], cell[1]) == value for cell, value in nogood):
+                self.nogoods.move_to_end(nogood)
+                return nogood
+        return None
+    
     # def find_empty_cell(self):
     #     """빈 칸을 찾아서 (row, col) 반환, 없으면 None"""
     #     for row in range(9):
@@ -103,36 +174,108 @@ class BoardGenerator:
     #     return None
     
     def solve_with_mrv_and_forward_checking(self):
-        """MRV와 Forward Checking을 적용한 솔버"""
+        """MRV와 Forward Checking을 적용한 솔버
+        
+        충돌 기반 백점핑(CBJ)과 nogood 학습을 함께 사용합니다.
+        한 번의 탐색이 노드 예산을 넘으면 예산을 늘려 처음부터 다시 탐색하고,
+        MAX_RESTARTS번 재시작해도 못 채우면 False를 반환합니다.
+        """
+        budget = self.INITIAL_NODE_BUDGET
+        for restart in range(self.MAX_RESTARTS + 1):
+            self.restarts = restart
+            self.nodes = 0
+            self.node_budget = budget
+            try:
+                # 충돌 집합이 반환되면 해가 없다는 것이 증명된 것
+                return self._search() is True
+            except SearchBudgetExceeded:
+                if self.stats is not None:
+                    self.stats.restarts += 1
+                logger.debug("노드 예산 %d개 초과 - 재시작 (%d번째)", budget, restart + 1)
+                self.reset_search_state()
+                budget = int(budget * self.NODE_BUDGET_GROWTH)
+        return False
+    
+    def reset_search_state(self):
+        """탐색 도중 채운 칸들과 후보를 탐색 시작 시점으로 되돌림"""
+        for cell, values in self.initial_possible_values.items():
+            self.board.set_value(cell[0], cell[1], None)
+            self.possible_values[cell] = set(values)
+            self.pruned_by[cell] = []
+    
+    def _search(self):
+        """FC-CBJ 탐색
+        
+        Returns:
+            True: 모든 칸이 채워짐
+            set: 실패 원인이 된 결정 칸들의 충돌 집합 (백점핑 대상 판단용)
+        """
         # MRV로 가장 제약이 많은 칸 선택
         best_cell = self.find_best_empty_cell()
         
         if best_cell is None:
             return True  # 모든 칸이 채워짐
         
+        self.nodes += 1
+        if self.stats is not None:
+            self.stats.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SearchBudgetExceeded()
+        
         row, col = best_cell
+        conflict_set = set()
         
         # 가능한 값들을 복사해서 순서대로 시도
         possible_numbers = list(self.possible_values.get((row, col), set()))
-        random.shuffle(possible_numbers)
+        self.rng.shuffle(possible_numbers)
         
         for number in possible_numbers:
             # 숫자 배치
             self.board.set_value(row, col, number)
             
+            # 이미 학습한 nogood에 걸리면 탐색하지 않고 원인만 기록
+            nogood = self.find_violated_nogood(row, col, number)
+            if nogood is not None:
+                if self.stats is not None:
+                    self.stats.nogood_hits += 1
+                self.board.set_value(row, col, None)
+                conflict_set.update(cell for cell, _ in nogood if cell != best_cell)
+                continue
+            
             # Forward Checking 수행
             success, affected_cells = self.forward_check(row, col, number)
             
             if success:
                 # 재귀적으로 다음 단계 진행
-                if self.solve_with_mrv_and_forward_checking():
+                result = self._search()
+                if result is True:
                     return True
+            else:
+                # 후보가 0개가 된 칸의 후보를 제거한 결정들이 원인
+                wiped_cell = affected_cells[-1]
+                result = set(self.pruned_by[wiped_cell])
             
             # 백트래킹: 복원
             self.board.set_value(row, col, None)
             self.restore_possible_values(affected_cells, number)
+            if self.stats is not None:
+                self.stats.backtracks += 1
+            
+            # 현재 칸이 실패 원인에 없으면 다른 값을 시도해도 소용없음 -> 백점핑
+            if success and best_cell not in result:
+                if self.stats is not None:
+                    self.stats.backjumps += 1
+                return result
+            
+            conflict_set.update(result)
         
-        return False
+        # 모든 값이 실패: 이 칸의 후보를 줄인 결정들도 원인에 포함
+        conflict_set.update(self.pruned_by.get(best_cell, ()))
+        conflict_set.discard(best_cell)
+        
+        # 충돌 집합의 현재 배치는 함께 존재할 수 없음 -> nogood으로 학습
+        self.learn_nogood(conflict_set)
+        return conflict_set
     
     # def solve(self):
     #     """백트래킹을 사용한 스도쿠 솔버 (기존 방식)"""
@@ -163,16 +306,25 @@ class BoardGenerator:
     #     return False
     
     def generate_complete_board(self):
-        """완전한 스도쿠 보드 생성 (MRV + Forward Checking 사용)"""
-        print("체스 기물과 스도쿠 제약 조건으로 숫자 채우기 시작...")
-        print("MRV + Forward Checking 방식 사용")
+        """완전한 스도쿠 보드 생성 (MRV + Forward Checking 사용)
+        
+        진행 메시지는 로거(INFO)로, 결과는 'fill' 이벤트로 기록합니다.
+        """
+        logger.info("체스 기물과 스도쿠 제약 조건으로 숫자 채우기 시작...")
+        logger.info("MRV + Forward Checking 방식 사용")
+        started = time.perf_counter()
+        
+        success = self.solve_with_mrv_and_forward_checking()
+        if events_enabled():
+            log_event("fill", success=success, nodes=self.nodes, restarts=self.restarts,
+                      nogoods=len(self.nogoods), pieces=len(self.pieces),
+                      elapsed=time.perf_counter() - started)
         
-        if self.solve_with_mrv_and_forward_checking():
-            print("스도쿠 보드 생성 성공!")
-            return True
+        if success:
+            logger.info("스도쿠 보드 생성 성공!")
         else:
-            print("스도쿠 보드 생성 실패 - 해가 존재하지 않습니다.")
-            return False
+            logger.info("스도쿠 보드 생성 실패 - 해가 존재하지 않습니다.")
+        return success
     
     # def generate_complete_board(self, use_mrv=True):
     #     """완전한 스도쿠 보드 생성"""
@@ -0,0 +1,203 @@
+"""
+ChessSudoku 적응형 조각 후보 선택 모듈
+
+PuzzleGenerator.select_carve_candidate는 고정 가중치(완성라인 0.6, 제약없음 0.3, 일반 0.1)로
+그룹을 고르지만, 거절되는 후보마다 논리적 풀이 한 번이 낭비됩니다.
+AdaptiveCarveSelector는 후보 칸을 특징별 '팔(arm)'로 나누고 팔마다 검증 통과/실패 횟수를
+세어서, 통과할 가능성이 높은 팔을 톰슨 샘플링으로 고릅니다.
+
+팔 키: '<단계>/<그룹>/<공격 수>/<채움 정도>'
+    단계      - 조각 진행도 (빈칸 수 / 최대 빈칸 수를 STAGES 구간으로)
+    그룹      - completed_lines, unconstrained, regular (get_cell_strategy와 같은 우선순위)
+    공격 수   - 칸을 공격하는 기물 수 (0, 1, 2 이상)
+    채움 정도 - 칸의 fill_peers 중 이미 빈칸인 비율 (FILL_BUCKETS 구간)
+
+    selector = AdaptiveCarveSelector.load("carve_priors.json")
+    generator = PuzzleGenerator(board, pieces, graph, rng, carve_selector=selector)
+    generator.generate_puzzle(max_holes=45)
+    selector.save("carve_priors.json")   # 다음 실행에서 학습한 통계를 이어서 사용
+
+선택에는 생성기의 rng를 쓰므로 같은 통계와 시드면 같은 퍼즐이 나오지만,
+통계가 바뀌면 같은 시드라도 다른 퍼즐이 됩니다 (시드만으로 재현하려면 고정 가중치 사용).
+"""
+import json
+import os
+from log_setup import get_logger
+
+logger = get_logger(__name__)
+
+PRIORS_VERSION = 1
+GROUPS = ('completed_lines', 'unconstrained', 'regular')
+STAGES = 3                  # 조각 진행도 구간 수
+FILL_BUCKETS = (0.2, 0.4)   # 빈 peer 비율 구간 경계
+DEFAULT_MAX_EVIDENCE = 1000  # 팔마다 유지하는 최대 관측 수 (넘으면 비율을 유지한 채 줄여서 변화에 적응)
+
+def arm_key(stage, group, attack, fill):
+    """팔 키 문자열 생성"""
+    return f"{stage}/{group}/{attack}/{fill}"
+
+class AdaptiveCarveSelector:
+    """검증 통과율을 학습하는 조각 후보 선택기 (팔별 베타 분포 톰슨 샘플링)
+
+    속성:
+        arms (dict): 팔 키 -> [통과 횟수, 실패 횟수]
+        max_evidence (int): 팔마다 유지하는 최대 관측 수
+    """
+
+    def __init__(self, arms=None, max_evidence=DEFAULT_MAX_EVIDENCE):
+        self.arms = {key: list(counts) for key, counts in (arms or {}).items()}
+        self.max_evidence = max_evidence
+
+    @classmethod
+    def load(cls, path, max_evidence=DEFAULT_MAX_EVIDENCE):
+        """저장된 통계로 선택기 생성 (파일이 없거나 읽을 수 없으면 빈 통계)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(max_evidence=max_evidence)
+        except (OSError, json.JSONDecodeError) as error:
+            logger.warning("조각 통계 파일을 읽을 수 없어 새로 시작합니다: %s (%s)", path, error)
+            return cls(max_evidence=max_evidence)
+        if data.get('version') != PRIORS_VERSION:
+            logger.warning("조각 통계 파일 버전이 달라 새로 시작합니다: %s", path)
+            return cls(max_evidence=max_evidence)
+        return cls(data.get('arms'), max_evidence)
+
+    def save(self, path):
+        """통계를 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 이전 파일 유지)"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PRIORS_VERSION, 'arms': self.arms}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, path)
+
+    def snapshot(self):
+        """현재 통계 복사본 (프로세스 풀 작업자에게 넘길 때 사용)"""
+        return {key: list(counts) for key, counts in self.arms.items()}
+
+    def update(self, key, accepted):
+        """팔 하나의 검증 결과 반영"""
+        self.merge({key: (1, 0) if accepted else (0, 1)})
+
+    def merge(self, outcomes):
+        """팔 키 -> (통과, 실패) 횟수들을 통계에 더함 (작업자가 돌려준 결과 합치기)"""
+        for key, (accepts, rejects) in outcomes.items():
+            counts = self.arms.setdefault(key, [0, 0])
+            counts[0] += accepts
+            counts[1] += rejects
+            total = counts[0] + counts[1]
+            if total > self.max_evidence:
+                scale = self.max_evidence / total
+                counts[0] *= scale
+                counts[1] *= scale
+
+    def acceptance_rate(self, key):
+        """팔의 추정 통과율 (베타(1, 1) 사전 분포의 평균)"""
+        accepts, rejects = self.arms.get(key, (0, 0))
+        return (accepts + 1) / (accepts + rejects + 2)
+
+    def group_candidates(self, generator, candidates, holes_carved, max_holes):
+        """후보 칸들을 팔 키별로 나눔
+
+        Args:
+            generator (PuzzleGenerator): 현재 조각 중인 생성기
+            candidates (dict): get_strategic_carve_candidates의 결과
+            holes_carved (int): 지금까지 조각한 빈칸 수
+            max_holes (int): 최대 빈칸 수
+
+        Returns:
+            dict: 팔 키 -> (row, col) 리스트
+        """
+        graph = generator.constraint_graph
+        grid = generator.puzzle_board.board
+        stage = min(STAGES - 1, holes_carved * STAGES // max(max_holes, 1))
+        completed = set(candidates['completed_lines'])
+        unconstrained = set(candidates['unconstrained'])
+
+        arms = {}
+        for cell in candidates['regular']:
+            row, col = cell
+            index = row * 9 + col
+            if cell in completed:
+                group = 'completed_lines'
+            elif cell in unconstrained:
+                group = 'unconstrained'
+            else:
+                group = 'regular'
+            attack = min(len(graph.attackers[index]), 2)
+            peers = graph.fill_peers[index]
+            empty = sum(1 for peer in peers if grid[peer // 9][peer % 9] is None)
+            ratio = empty / len(peers)
+            fill = sum(1 for bound in FILL_BUCKETS if ratio >= bound)
+            arms.setdefault(arm_key(stage, group, attack, fill), []).append(cell)
+        return arms
+
+    def select(self, generator, candidates, holes_carved, max_holes):
+        """조각할 칸 선택
+
+        후보가 있는 팔마다 베타(통과 + 1, 실패 + 1)에서 통과율을 뽑아 가장 큰 팔을 고르고,
+        그 팔의 칸 중 하나를 고릅니다.
+
+        Returns:
+            tuple: ((row, col), 팔 키), 후보가 없으면 (None, None)
+        """
+        arms = self.group_candidates(generator, candidates, holes_carved, max_holes)
+        if not arms:
+            return None, None
+
+        rng = generator.rng
+        best_key, best_sample = None, -1.0
+        for key in sorted(arms):  # 같은 시드면 같은 순서로 난수를 쓰도록 정렬
+            accepts, rejects = self.arms.get(key, (0, 0))
+            sample = rng.betavariate(accepts + 1, rejects + 1)
+            if sample > best_sample:
+                best_key, best_sample = key, sample
+        return rng.choice(arms[best_key]), best_key
+
+    def print_summary(self):
+        """팔별 통계 출력 (추정 통과율 순)"""
+        print("조각 후보 통계 (팔: 통과/실패, 추정 통과율):")
+        for key in sorted(self.arms, key=self.acceptance_rate, reverse=True):
+            accepts, rejects = self.arms[key]
+            print(f"  {key:<28} {accepts:>7.1f}/{rejects:<7.1f} {self.acceptance_rate(key):.2f}")
+
+def test_carve_selector(puzzles=20, max_holes=50, seed=7):
+    """고정 가중치와 적응형 선택의 검증 한 번당 빈칸 수 비교"""
+    import copy
+    from board import Board
+    from board_generator import BoardGenerator
+    from random_placer import RandomPiecePlacer
+    from puzzle_generator import PuzzleGenerator
+    from constraint_graph import ConstraintGraph
+    from search_stats import SearchStats
+    from seeding import derive_seed
+
+    print("=" * 50)
+    print("적응형 조각 후보 선택 테스트")
+    print("=" * 50)
+
+    layouts = []
+    for index in range(puzzles):
+        board = Board()
+        placer = RandomPiecePlacer(board, derive_seed(seed, 'layout', index))
+        placer.place_pieces_randomly()
+        pieces = placer.get_pieces()
+        graph = ConstraintGraph.from_pieces(pieces)
+        if BoardGenerator(board, pieces, graph, derive_seed(seed, 'fill', index)).generate_complete_board():
+            layouts.append((board, pieces, graph))
+
+    selector = AdaptiveCarveSelector()
+    for name, carve_selector in (("고정 가중치", None), ("적응형", selector)):
+        stats = SearchStats()
+        holes = 0
+        for index, (board, pieces, graph) in enumerate(layouts):
+            generator = PuzzleGenerator(copy.deepcopy(board), pieces, graph, derive_seed(seed, 'carve', index),
+                                        stats, carve_selector=carve_selector)
+            generator.generate_puzzle(max_holes=max_holes)
+            holes += len(generator.carved_cells)
+        print(f"{name}: 퍼즐 {len(layouts)}개, 빈칸 {holes}개, 검증 {stats.carve_attempts}회, "
+              f"검증당 빈칸 {holes / max(stats.carve_attempts, 1):.3f}")
+    selector.print_summary()
+
+if __name__ == "__main__":
+    test_carve_selector()
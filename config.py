@@ -5,6 +5,9 @@ ChessSudoku 설정 관리 모듈
 """
 import os
 import json
+from log_setup import get_logger
+
+logger = get_logger(__name__)
 
 class Config:
     """애플리케이션 설정 관리 클래스"""
@@ -63,7 +66,7 @@ class Config:
     def set_server_url(self, url):
         """서버 URL 동적 변경"""
         self.server_url = url
-        print(f"서버 URL 변경됨: {url}")
+        logger.info("서버 URL 변경됨: %s", url)
     
     def get_server_url(self):
         """현재 서버 URL 반환"""
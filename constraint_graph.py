@@ -0,0 +1,147 @@
+"""
+ChessSudoku 제약 그래프 모듈
+
+기물 배치(layout)가 정해지면 각 칸이 어떤 칸들과 같은 숫자를 가질 수 없는지는
+더 이상 바뀌지 않습니다. 이 관계를 한 번만 계산해 두고 보드 생성, 논리적 풀이,
+퍼즐 조각 단계가 모두 공유합니다.
+
+칸은 0~80 사이의 인덱스(row * 9 + col)로 표현합니다.
+"""
+from functools import lru_cache
+from validators import Piece, PiecePlacer
+
+# 인덱스 <-> (row, col) 변환용 상수
+COORDS = tuple((index // 9, index % 9) for index in range(81))
+
+def cell_index(row, col):
+    """(row, col)을 칸 인덱스로 변환"""
+    return row * 9 + col
+
+class ConstraintGraph:
+    """기물 배치별로 한 번만 만들어 공유하는 불변 제약 그래프
+
+    속성:
+        layout (tuple): (기물 타입, row, col) 튜플들 - 그래프를 만든 기물 배치
+        piece_cells (frozenset): 기물이 놓인 칸 인덱스들
+        units (tuple): 서로 다른 숫자를 가져야 하는 칸 묶음들
+            (행 9개, 열 9개, 박스 9개, 이어서 기물별 공격 범위)
+        attack_groups (tuple): 기물별 공격 범위 (기물 칸 제외, layout 순서)
+        attackers (tuple): 칸마다 그 칸을 공격하는 기물들의 layout 인덱스
+        fill_peers (tuple): 칸마다 같은 숫자를 가질 수 없는 칸 인덱스들
+            (행, 열, 박스, 같은 기물의 공격 범위 - 보드 생성, 논리적 풀이, 검증이 모두 이 규칙 사용)
+            9칸을 넘는 공격 범위는 숫자 9개로 만족할 수 없으므로 제외합니다
+            (validators는 모든 공격 범위를 검사하지만 생성된 정답은 이 규칙만 만족).
+
+    인스턴스는 수정할 수 없고, pickle 시 layout만 전달하므로
+    프로세스 풀 작업자에게 그대로 넘길 수 있습니다.
+    """
+
+    __slots__ = ('layout', 'piece_cells', 'units', 'attack_groups', 'attackers',
+                 'fill_peers')
+
+    def __init__(self, layout):
+        """제약 그래프 생성
+
+        Args:
+            layout (iterable): (기물 타입, row, col) 튜플들
+        """
+        layout = tuple((piece_type, row, col) for piece_type, row, col in layout)
+        piece_cells = frozenset(cell_index(row, col) for _, row, col in layout)
+
+        # 1. 기본 스도쿠 단위 (행, 열, 박스)
+        rows = [tuple(cell_index(row, col) for col in range(9)) for row in range(9)]
+        cols = [tuple(cell_index(row, col) for row in range(9)) for col in range(9)]
+        boxes = []
+        for box_row in range(0, 9, 3):
+            for box_col in range(0, 9, 3):
+                boxes.append(tuple(cell_index(r, c)
+                                   for r in range(box_row, box_row + 3)
+                                   for c in range(box_col, box_col + 3)))
+
+        # 2. 기물별 공격 범위 (기물이 있는 칸은 숫자가 없으므로 제외)
+        placer = PiecePlacer(None)
+        attack_groups = []
+        attackers = [[] for _ in range(81)]
+        for piece_number, (piece_type, row, col) in enumerate(layout):
+            positions = placer._get_piece_attack_positions(Piece(piece_type, row, col))
+            group = tuple(sorted({cell_index(r, c) for r, c in positions} - piece_cells))
+            attack_groups.append(group)
+            for index in group:
+                attackers[index].append(piece_number)
+
+        # 3. 칸별 peer 계산
+        standard_units = rows + cols + boxes
+        fill_peers = []
+        for index in range(81):
+            row, col = COORDS[index]
+            sudoku_peers = (set(rows[row]) | set(cols[col])
+                            | set(boxes[(row // 3) * 3 + col // 3]))
+            search_peers = set(sudoku_peers)
+            for piece_number in attackers[index]:
+                group = attack_groups[piece_number]
+                if len(group) <= 9:
+                    search_peers.update(group)
+            search_peers.discard(index)
+            fill_peers.append(tuple(sorted(search_peers - piece_cells)))
+
+        object.__setattr__(self, 'layout', layout)
+        object.__setattr__(self, 'piece_cells', piece_cells)
+        object.__setattr__(self, 'units', tuple(standard_units) + tuple(attack_groups))
+        object.__setattr__(self, 'attack_groups', tuple(attack_groups))
+        object.__setattr__(self, 'attackers', tuple(tuple(a) for a in attackers))
+        object.__setattr__(self, 'fill_peers', tuple(fill_peers))
+
+    @classmethod
+    def from_pieces(cls, pieces):
+        """Piece 리스트로부터 제약 그래프 반환 (같은 배치는 캐시된 인스턴스 재사용)"""
+        return _cached_graph(layout_of(pieces))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConstraintGraph는 수정할 수 없습니다.")
+
+    def __delattr__(self, name):
+        raise AttributeError("ConstraintGraph는 수정할 수 없습니다.")
+
+    def __reduce__(self):
+        return (ConstraintGraph, (self.layout,))
+
+    def __eq__(self, other):
+        return isinstance(other, ConstraintGraph) and self.layout == other.layout
+
+    def __hash__(self):
+        return hash(self.layout)
+
+    def __repr__(self):
+        return f"ConstraintGraph(layout={self.layout!r})"
+
+    def is_piece_cell(self, row, col):
+        """해당 위치에 기물이 있는지 확인"""
+        return cell_index(row, col) in self.piece_cells
+
+    def is_attacked(self, row, col):
+        """해당 칸이 기물의 공격 범위에 있는지 확인"""
+        return bool(self.attackers[cell_index(row, col)])
+
+    def is_valid_number(self, board, row, col, number):
+        """해당 위치에 숫자를 놓을 수 있는지 스도쿠 + 기물 규칙으로 검사
+
+        정답 보드와 같은 규칙(fill_peers)을 써야 후보에서 정답이 빠지지 않아
+        논리적 풀이가 틀린 숫자를 채우지 않습니다.
+        """
+        index = cell_index(row, col)
+        if index in self.piece_cells:
+            return False
+
+        grid = board.board
+        for peer in self.fill_peers[index]:
+            if grid[peer // 9][peer % 9] == number:
+                return False
+        return True
+
+def layout_of(pieces):
+    """Piece 리스트를 (기물 타입, row, col) 튜플들로 변환"""
+    return tuple((piece.piece_type, piece.row, piece.col) for piece in pieces)
+
+@lru_cache(maxsize=256)
+def _cached_graph(layout):
+    return ConstraintGraph(layout)
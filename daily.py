@@ -0,0 +1,232 @@
+"""
+ChessSudoku 데일리 퍼즐 사전 생성 모듈
+
+기간 안의 모든 날짜에 대해 데일리 퍼즐을 여러 프로세스에서 미리 생성하고,
+검증한 뒤 로컬 저장소(PuzzleStore)에 기록합니다. 게시는 publish_daily로
+기간 단위 일괄 업로드하거나 main.publish_daily_puzzle로 하루씩 실행합니다.
+
+- 날짜마다 시드를 daily_seed(날짜)로 정하므로 같은 날짜는 항상 같은 퍼즐이 됩니다.
+- 이미 저장된 날짜는 건너뛰므로 중간에 멈춰도 다시 실행하면 이어서 생성합니다.
+
+사용법:
+    python main.py precompute-daily --start 2025-01-01 --end 2025-12-31 --workers 8 --store puzzles.sqlite3
+"""
+import argparse
+import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pipeline import generate_puzzle_record, verify_record, matches_difficulty
+from puzzle_api_client import PuzzleAPIClient, PuzzleDataFormatter, DifficultyManager
+from puzzle_store import PuzzleStore, DEFAULT_STORE_PATH
+from seeding import derive_seed
+from log_setup import (get_logger, add_logging_arguments, configure_from_args, init_worker_logging,
+                       worker_logging_args)
+
+logger = get_logger(__name__)
+
+DAILY_SEED_NAMESPACE = "daily"
+DAILY_PUZZLE_TYPE = "daily_challenge"
+MAX_DAILY_ATTEMPTS = 5  # 보드를 채우지 못하거나 검증에 실패하면 다음 시드로 다시 시도
+
+# 요일별 기본 난이도 (월요일 0 ~ 일요일 6)
+DEFAULT_DIFFICULTY_SCHEDULE = {
+    0: "easy",
+    1: "easy",
+    2: "medium",
+    3: "medium",
+    4: "hard",
+    5: "hard",
+    6: "expert",
+}
+
+def parse_date(value):
+    """'YYYY-MM-DD' 문자열 또는 date를 date로 변환"""
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+def date_range(start_date, end_date):
+    """start_date부터 end_date까지(포함) 날짜들"""
+    current, end = parse_date(start_date), parse_date(end_date)
+    while current <= end:
+        yield current
+        current += datetime.timedelta(days=1)
+
+def daily_seed(daily_date, attempt=0):
+    """날짜로부터 데일리 퍼즐 시드 계산 (같은 날짜, 같은 시도 번호면 항상 같은 값)"""
+    return derive_seed(DAILY_SEED_NAMESPACE, parse_date(daily_date).isoformat(), attempt)
+
+def difficulty_for(daily_date, difficulty_schedule=None):
+    """날짜의 데일리 퍼즐 난이도 결정
+
+    Args:
+        daily_date: 날짜 ('YYYY-MM-DD' 문자열 또는 date)
+        difficulty_schedule: 다음 중 하나
+            None  - DEFAULT_DIFFICULTY_SCHEDULE (요일별)
+            str   - 모든 날짜에 같은 난이도
+            dict  - 'YYYY-MM-DD' 또는 요일 번호(0~6)를 키로 하는 난이도
+                    (둘 다 없는 날짜는 DEFAULT_DIFFICULTY_SCHEDULE의 요일 난이도)
+            함수  - date를 받아 난이도를 반환
+
+    Returns:
+        str: 난이도
+    """
+    daily_date = parse_date(daily_date)
+    if difficulty_schedule is None:
+        difficulty_schedule = DEFAULT_DIFFICULTY_SCHEDULE
+    if isinstance(difficulty_schedule, str):
+        return difficulty_schedule
+    if callable(difficulty_schedule):
+        return difficulty_schedule(daily_date)
+    if daily_date.isoformat() in difficulty_schedule:
+        return difficulty_schedule[daily_date.isoformat()]
+    weekday = daily_date.weekday()
+    return difficulty_schedule.get(weekday, DEFAULT_DIFFICULTY_SCHEDULE[weekday])
+
+def generate_daily_record(daily_date, difficulty, piece_counts=None, max_attempts=MAX_DAILY_ATTEMPTS):
+    """한 날짜의 데일리 퍼즐을 생성하고 검증
+
+    평가한 난이도가 목표 난이도와 같은 첫 시도를 쓰고, max_attempts번 안에 없으면
+    검증을 통과한 첫 시도를 씁니다 (레코드의 'difficulty'는 평가한 난이도).
+
+    Returns:
+        dict: 'daily_date', 'puzzle_type', 'attempt'가 추가된 퍼즐 레코드, 실패하면 None
+    """
+    daily_date = parse_date(daily_date).isoformat()
+    max_holes = DifficultyManager.get_max_holes(difficulty)
+    fallback = None
+    for attempt in range(max_attempts):
+        record = generate_puzzle_record(daily_seed(daily_date, attempt), piece_counts,
+                                        max_holes, difficulty=difficulty)
+        if record is None or not verify_record(record)[0]:
+            continue
+
+        record['daily_date'] = daily_date
+        record['puzzle_type'] = DAILY_PUZZLE_TYPE
+        record['attempt'] = attempt
+        if matches_difficulty(record, difficulty):
+            return record
+        if fallback is None:
+            fallback = record
+    return fallback
+
+def _generate_daily_task(task):
+    """프로세스 풀 작업 단위: (날짜, 난이도, 기물 구성)으로 데일리 퍼즐 생성"""
+    return task[0], generate_daily_record(*task)
+
+def precompute_daily(start_date, end_date, workers=None, difficulty_schedule=None,
+                     store_path=DEFAULT_STORE_PATH, piece_counts=None):
+    """기간 안의 데일리 퍼즐들을 병렬로 생성해서 로컬 저장소에 기록
+
+    이미 저장된 날짜는 건너뛰고, 생성한 퍼즐은 끝나는 대로 하나씩 커밋하므로
+    중간에 멈춰도 다시 실행하면 남은 날짜만 생성합니다.
+
+    Args:
+        start_date, end_date: 기간 ('YYYY-MM-DD' 문자열 또는 date, 양 끝 포함)
+        workers (int, optional): 프로세스 개수 (없으면 CPU 개수, 1이면 현재 프로세스에서 생성)
+        difficulty_schedule: difficulty_for 참고
+        store_path (str): 저장소 파일 경로
+        piece_counts (dict, optional): 기물 타입별 개수
+
+    Returns:
+        dict: 생성한 날짜 수(generated), 건너뛴 날짜 수(skipped), 실패한 날짜들(failed)
+    """
+    workers = workers or os.cpu_count() or 1
+    start_date, end_date = parse_date(start_date), parse_date(end_date)
+
+    with PuzzleStore(store_path) as store:
+        done = store.daily_dates(start_date.isoformat(), end_date.isoformat())
+        tasks = [(daily_date.isoformat(), difficulty_for(daily_date, difficulty_schedule), piece_counts)
+                 for daily_date in date_range(start_date, end_date)
+                 if daily_date.isoformat() not in done]
+        logger.info("데일리 퍼즐 사전 생성: %s ~ %s (생성 %d일, 이미 저장됨 %d일, 프로세스 %d개)",
+                    start_date, end_date, len(tasks), len(done), workers)
+
+        generated = 0
+        failed = []
+        started = time.perf_counter()
+
+        def save(daily_date, record):
+            nonlocal generated
+            if record is None:
+                failed.append(daily_date)
+                logger.warning("  %s: 생성 실패", daily_date)
+                return
+            store.add_records([record])
+            generated += 1
+            logger.info("  %s: %s, 빈칸 %d개 (%d/%d)", daily_date, record['difficulty'],
+                        record['info']['holes_count'], generated, len(tasks))
+
+        if workers == 1:
+            for task in tasks:
+                save(*_generate_daily_task(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_logging,
+                                     initargs=worker_logging_args()) as executor:
+                futures = [executor.submit(_generate_daily_task, task) for task in tasks]
+                for future in as_completed(futures):
+                    save(*future.result())
+
+    elapsed = time.perf_counter() - started
+    logger.info("데일리 퍼즐 사전 생성 완료: %d일, 실패 %d일, %.1f초", generated, len(failed), elapsed)
+    return {'generated': generated, 'skipped': len(done), 'failed': sorted(failed)}
+
+def publish_daily(start_date, end_date, store_path=DEFAULT_STORE_PATH, server_url=None):
+    """저장소에 있는 기간 안의 데일리 퍼즐 중 아직 게시하지 않은 것들을 일괄 업로드
+
+    Returns:
+        dict: 업로드한 개수(uploaded), 실패한 날짜들(failed)
+    """
+    with PuzzleStore(store_path) as store:
+        rows = [store.get_daily(daily_date) for daily_date in
+                sorted(store.daily_dates(parse_date(start_date).isoformat(), parse_date(end_date).isoformat()))]
+        rows = [row for row in rows if not row['used']]
+        if not rows:
+            logger.info("게시할 데일리 퍼즐이 없습니다.")
+            return {'uploaded': 0, 'failed': []}
+
+        payloads = []
+        for row in rows:
+            args = PuzzleStore.to_upload_args(row)
+            payloads.append(PuzzleDataFormatter.create_puzzle_payload(
+                args['puzzle_board'], args['answer_board'], args['pieces'],
+                args['difficulty'], args['puzzle_type'], args['daily_date']
+            ))
+
+        results, _ = PuzzleAPIClient(server_url).upload_puzzles(payloads)
+        uploaded = 0
+        failed = []
+        for result in results:
+            row = rows[result['index']]
+            if result['success']:
+                store.mark_used(row['id'], result.get('puzzle_id'))
+                uploaded += 1
+            else:
+                failed.append(row['daily_date'])
+
+    logger.info("데일리 퍼즐 게시: 성공 %d개, 실패 %d개", uploaded, len(failed))
+    return {'uploaded': uploaded, 'failed': failed}
+
+def build_parser():
+    """precompute-daily 명령의 인자 파서"""
+    parser = argparse.ArgumentParser(prog="python main.py precompute-daily",
+                                     description="기간 안의 데일리 퍼즐 사전 생성")
+    parser.add_argument("--start", required=True, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="끝 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 개수 (기본: CPU 개수)")
+    parser.add_argument("--difficulty", choices=list(DifficultyManager.DIFFICULTY_SETTINGS),
+                        default=None, help="모든 날짜의 난이도 (기본: 요일별 난이도)")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="저장소 파일 경로")
+    add_logging_arguments(parser)
+    return parser
+
+def run_cli(argv=None):
+    """precompute-daily 명령 실행"""
+    args = build_parser().parse_args(argv)
+    configure_from_args(args)
+    return precompute_daily(args.start, args.end, workers=args.workers,
+                            difficulty_schedule=args.difficulty, store_path=args.store)
+
+if __name__ == "__main__":
+    run_cli()
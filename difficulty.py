@@ -0,0 +1,97 @@
+"""
+ChessSudoku 난이도 평가 모듈
+
+빈칸 개수만으로는 실제 난이도를 알 수 없으므로, 조각 검증 풀이(LogicalSolver)가
+남긴 기법 사용 프로필로 점수를 매겨 easy/medium/hard/expert를 정합니다.
+
+    profile = solver.get_technique_profile()
+    # {'naked_singles': 21, 'hidden_singles': 19, 'rounds': 6}
+    difficulty_score(profile)   # 21*1 + 19*2 + 6*3 = 77
+    rate_profile(profile)       # 'medium'
+
+점수 모델:
+    - 기법마다 채운 칸 수 x TECHNIQUE_WEIGHTS (숨겨진 단일 후보가 단일 후보보다 어려움)
+    - 풀이 반복 횟수 x ROUND_WEIGHT (앞 단계의 결과를 기다려야 하는 연쇄가 길수록 어려움)
+    쌍 제거(naked_pairs)는 제약 전파가 다음 반복에서 후보를 다시 계산하므로 칸을 채우는 데
+    기여하지 않아 점수에 넣지 않습니다.
+
+프로필이 없는 퍼즐(조각 전 보드, 예전 레코드)은 rate_holes로 빈칸 개수 기준 난이도를 씁니다.
+빈칸 기준은 DifficultyManager의 난이도별 최대 빈칸 개수와 같습니다.
+"""
+
+DIFFICULTY_LEVELS = ('easy', 'medium', 'hard', 'expert')
+
+# 기법별 칸 하나당 점수
+TECHNIQUE_WEIGHTS = {
+    'naked_singles': 1,
+    'hidden_singles': 2,
+}
+
+# 풀이 반복 한 번당 점수
+ROUND_WEIGHT = 3
+
+# (난이도, 점수 상한) - 마지막 난이도(expert)는 상한 없음
+# 목표 없이 조각했을 때 HOLE_THRESHOLDS의 빈칸 개수에서 나오는 점수(중앙값)에 맞춘 값:
+# 빈칸 35개 약 64점, 45개 약 94점, 50개 약 115점 (50개 넘게 조각되는 배치가 적어서 hard는 조금 낮게)
+SCORE_THRESHOLDS = (('easy', 65), ('medium', 95), ('hard', 110))
+
+# (난이도, 빈칸 개수 상한) - DifficultyManager.DIFFICULTY_SETTINGS의 max_holes와 동일
+HOLE_THRESHOLDS = (('easy', 35), ('medium', 45), ('hard', 50))
+
+def difficulty_rank(difficulty):
+    """난이도 순위 반환 (easy=0 ... expert=3, 모르는 난이도는 ValueError)"""
+    return DIFFICULTY_LEVELS.index(difficulty)
+
+def difficulty_score(profile):
+    """기법 사용 프로필의 난이도 점수 계산
+
+    Args:
+        profile (dict): LogicalSolver.get_technique_profile()의 결과
+            (기법 이름 -> 채운 칸 수, 'rounds' -> 풀이 반복 횟수)
+
+    Returns:
+        int: 난이도 점수
+    """
+    score = profile.get('rounds', 0) * ROUND_WEIGHT
+    for technique, weight in TECHNIQUE_WEIGHTS.items():
+        score += profile.get(technique, 0) * weight
+    return score
+
+def _rate(value, thresholds):
+    for difficulty, limit in thresholds:
+        if value <= limit:
+            return difficulty
+    return DIFFICULTY_LEVELS[-1]
+
+def rate_score(score):
+    """난이도 점수를 난이도로 변환"""
+    return _rate(score, SCORE_THRESHOLDS)
+
+def rate_profile(profile):
+    """기법 사용 프로필로 난이도 결정"""
+    return rate_score(difficulty_score(profile))
+
+def rate_holes(holes_count):
+    """빈칸 개수로 난이도 결정 (프로필이 없을 때의 대체 기준)"""
+    return _rate(holes_count, HOLE_THRESHOLDS)
+
+def test_difficulty():
+    """난이도 평가 테스트"""
+    print("=" * 50)
+    print("난이도 평가 테스트")
+    print("=" * 50)
+
+    profiles = [
+        {'naked_singles': 18, 'hidden_singles': 10, 'rounds': 3},
+        {'naked_singles': 21, 'hidden_singles': 19, 'rounds': 6},
+        {'naked_singles': 23, 'hidden_singles': 26, 'rounds': 10},
+        {'naked_singles': 25, 'hidden_singles': 29, 'rounds': 12},
+    ]
+    for profile in profiles:
+        print(f"{profile} -> 점수 {difficulty_score(profile)}, {rate_profile(profile)}")
+
+    for holes in (30, 40, 48, 60):
+        print(f"빈칸 {holes}개 -> {rate_holes(holes)}")
+
+if __name__ == "__main__":
+    test_difficulty()
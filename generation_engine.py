@@ -0,0 +1,302 @@
+"""
+ChessSudoku 생성 엔진 모듈
+
+GenerationEngine은 여러 스레드에서 동시에 불러도 되는 퍼즐 생성기입니다.
+엔진마다 시드 스트림(난수), 설정(Config), 조각 선택 통계를 따로 가지고,
+호출마다 새 보드와 생성기를 만들어 쓰므로 파이프라인 전체를 잠그지 않습니다.
+결과는 수정할 수 없는 GeneratedPuzzle로 돌려주고, 호출자가 넘긴 값은 바꾸지 않습니다.
+
+    engine = GenerationEngine(seed=1234)
+    puzzle = engine.generate(difficulty='hard')     # 스레드마다 불러도 됨
+    puzzle.puzzle                                   # 81글자 문자열 (puzzle_codec)
+    record = puzzle.to_record()                     # 싱크/업로드/검증용 새 레코드 (매번 새 보드)
+
+    with ThreadPoolExecutor(8) as executor:
+        puzzles = list(executor.map(lambda _: engine.generate('medium'), range(100)))
+
+    try:
+        puzzle = engine.generate('expert')
+    except GenerationFailed as error:       # max_attempts번 모두 목표 난이도가 아니면
+        puzzle = error.closest              # 가장 가까운 난이도의 퍼즐 (없으면 None)
+
+engine.generate(seed=s)는 pipeline.generate_puzzle_record(s, ...)와 같은 퍼즐을 만듭니다.
+시드를 주지 않으면 엔진 시드에서 derive_seed(seed, n)으로 n번째 시드를 꺼냅니다
+(잠금은 이 카운터와 조각 선택 통계를 합칠 때만 사용).
+"""
+import itertools
+import threading
+from config import Config
+from pipeline import generate_puzzle_record, matches_difficulty, DEFAULT_MAX_HOLES
+from puzzle_api_client import PuzzleAPIClient, PuzzleDataFormatter, DifficultyManager
+from puzzle_codec import encode_board, decode_board
+from carve_selector import AdaptiveCarveSelector
+from difficulty import difficulty_rank
+from seeding import new_seed, derive_seed
+from log_setup import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 10  # 보드를 채우지 못하거나 난이도가 다를 때 다음 시드로 다시 시도하는 횟수
+
+class GenerationFailed(Exception):
+    """GenerationEngine.generate가 목표 난이도의 퍼즐을 만들지 못했을 때 발생하는 예외
+
+    속성:
+        difficulty (str | None): 목표 난이도
+        attempts (int): 시도한 시드 수
+        closest (GeneratedPuzzle | None): 만든 퍼즐 중 목표 난이도에 가장 가까운 것
+            (보드를 한 번도 채우지 못했으면 None)
+    """
+
+    def __init__(self, difficulty, attempts, closest=None):
+        super().__init__(f"{attempts}번 시도했지만 {difficulty or ''} 퍼즐을 만들지 못했습니다.")
+        self.difficulty = difficulty
+        self.attempts = attempts
+        self.closest = closest
+
+class GeneratedPuzzle:
+    """수정할 수 없는 생성 결과
+
+    속성:
+        seed (int): 퍼즐 시드
+        difficulty (str): 평가한 난이도
+        target_difficulty (str | None): 목표 난이도
+        max_holes (int): 최대 빈칸 개수
+        beam_width (int | None): 빔 탐색 폭 (한 칸씩 조각했으면 None)
+        piece_counts (tuple | None): (기물 타입, 개수) 쌍들
+        puzzle (str): 퍼즐 보드 81글자 문자열 (기물 글자 포함)
+        answer (str): 정답 보드 81글자 문자열
+        layout (tuple): (기물 타입, row, col) 튜플들
+        holes_count (int): 빈칸 개수
+        difficulty_score (int | None): 난이도 점수
+        technique_profile (tuple): (기법 이름 또는 'rounds', 횟수) 쌍들
+        solution_path (tuple): (row, col, 숫자, 기법, 반복 번호) 튜플들
+
+    pickle 시 필드 값만 전달하므로 프로세스 사이에도 넘길 수 있습니다.
+    """
+
+    __slots__ = ('seed', 'difficulty', 'target_difficulty', 'max_holes', 'beam_width', 'piece_counts',
+                 'puzzle', 'answer', 'layout', 'holes_count', 'difficulty_score', 'technique_profile',
+                 'solution_path')
+
+    def __init__(self, *values):
+        if len(values) != len(self.__slots__):
+            raise TypeError(f"GeneratedPuzzle 필드는 {len(self.__slots__)}개입니다. ({len(values)}개)")
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_record(cls, record):
+        """pipeline.generate_puzzle_record의 레코드로 생성 (레코드의 보드는 복사해서 문자열로 저장)"""
+        info = record['info']
+        piece_counts = record.get('piece_counts')
+        profile = info.get('technique_profile') or {}
+        return cls(
+            record['seed'],
+            record['difficulty'],
+            record.get('target_difficulty'),
+            record['max_holes'],
+            record.get('beam_width'),
+            tuple(sorted(piece_counts.items())) if piece_counts else None,
+            encode_board(record['puzzle'], record['pieces']),
+            encode_board(record['answer'], record['pieces']),
+            tuple((piece.piece_type, piece.row, piece.col) for piece in record['pieces']),
+            info['holes_count'],
+            info.get('difficulty_score'),
+            tuple(sorted(profile.items())),
+            tuple(tuple(step) for step in info.get('solution_path', ())),
+        )
+
+    def to_record(self):
+        """싱크, 업로드, verify_record에 쓸 퍼즐 레코드 생성 (부를 때마다 새 보드)"""
+        puzzle, pieces = decode_board(self.puzzle)
+        answer, _ = decode_board(self.answer)
+        return {
+            'seed': self.seed,
+            'piece_counts': dict(self.piece_counts) if self.piece_counts else None,
+            'max_holes': self.max_holes,
+            'puzzle': puzzle,
+            'answer': answer,
+            'pieces': pieces,
+            'difficulty': self.difficulty,
+            'target_difficulty': self.target_difficulty,
+            'beam_width': self.beam_width,
+            'info': {
+                'holes_count': self.holes_count,
+                'difficulty': self.difficulty,
+                'difficulty_score': self.difficulty_score,
+                'technique_profile': dict(self.technique_profile),
+                'solution_path': list(self.solution_path),
+            },
+        }
+
+    def to_payload(self, puzzle_type="normal", daily_date=None, include_solution_path=False):
+        """API 페이로드 생성 (PuzzleDataFormatter.create_record_payload)"""
+        return PuzzleDataFormatter.create_record_payload(self.to_record(), puzzle_type, daily_date,
+                                                         include_solution_path)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GeneratedPuzzle는 수정할 수 없습니다.")
+
+    def __delattr__(self, name):
+        raise AttributeError("GeneratedPuzzle는 수정할 수 없습니다.")
+
+    def __reduce__(self):
+        return (GeneratedPuzzle, tuple(getattr(self, name) for name in self.__slots__))
+
+    def __eq__(self, other):
+        return (isinstance(other, GeneratedPuzzle) and
+                all(getattr(self, name) == getattr(other, name) for name in self.__slots__))
+
+    def __hash__(self):
+        return hash((self.puzzle, self.answer))
+
+    def __repr__(self):
+        return (f"GeneratedPuzzle(seed={self.seed}, difficulty={self.difficulty!r}, "
+                f"holes_count={self.holes_count})")
+
+class GenerationEngine:
+    """스레드 안전한 퍼즐 생성 엔진
+
+    생성 한 번에 필요한 보드, 제약 그래프 참조, 생성기, 통계는 모두 호출 안에서 새로 만들고,
+    엔진이 공유하는 상태(시드 카운터, 조각 선택 통계)만 짧게 잠급니다.
+    """
+
+    def __init__(self, seed=None, settings=None, piece_counts=None, max_holes=None, min_holes=10,
+                 beam_width=None, carve_selector=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """생성 엔진 초기화
+
+        Args:
+            seed (int, optional): 엔진 시드 (n번째 자동 시드는 derive_seed(seed, n))
+            settings (Config, optional): 업로드 설정 (없으면 환경 변수/config.json에서 새로 읽은 엔진 전용 Config)
+            piece_counts (dict, optional): 기본 기물 구성 (복사해서 보관)
+            max_holes (int, optional): 기본 최대 빈칸 개수 (없으면 난이도에 따라 결정)
+            min_holes (int): 최소 빈칸 개수
+            beam_width (int, optional): 기본 빔 탐색 폭
+            carve_selector (AdaptiveCarveSelector, optional): 엔진이 소유할 조각 선택 통계
+                (호출마다 복사본으로 조각하고 결과만 합침)
+            max_attempts (int): generate 한 번에 시도하는 최대 시드 수
+        """
+        self.seed = new_seed() if seed is None else seed
+        self.settings = settings or Config()
+        self.piece_counts = dict(piece_counts) if piece_counts else None
+        self.max_holes = max_holes
+        self.min_holes = min_holes
+        self.beam_width = beam_width
+        self.carve_selector = carve_selector
+        self.max_attempts = max_attempts
+        self._indexes = itertools.count()
+        self._lock = threading.Lock()
+
+    def next_seed(self):
+        """엔진 시드 스트림의 다음 시드"""
+        with self._lock:
+            index = next(self._indexes)
+        return derive_seed(self.seed, index)
+
+    def generate(self, difficulty=None, seed=None, piece_counts=None, max_holes=None, beam_width=None):
+        """퍼즐 하나 생성
+
+        seed를 주면 그 시드로 한 번만 시도하고, 주지 않으면 보드를 채우지 못하거나
+        평가한 난이도가 목표와 다를 때 다음 시드로 max_attempts번까지 다시 시도합니다.
+        그래도 만들지 못하면 가장 가까운 난이도의 퍼즐을 담아 GenerationFailed를 냅니다.
+
+        Args:
+            difficulty (str, optional): 목표 난이도
+            seed (int, optional): 퍼즐 시드
+            piece_counts (dict, optional): 기물 구성 (없으면 엔진 기본값, 복사해서 사용)
+            max_holes (int, optional): 최대 빈칸 개수 (없으면 엔진 기본값, 그다음 난이도 기준)
+            beam_width (int, optional): 빔 탐색 폭 (없으면 엔진 기본값)
+
+        Returns:
+            GeneratedPuzzle: 생성 결과 (seed를 주면 평가한 난이도와 상관없이 그 시드의 퍼즐)
+
+        Raises:
+            GenerationFailed: 보드를 채우지 못했거나 (seed가 없을 때) 목표 난이도의 퍼즐이 없음
+        """
+        piece_counts = dict(piece_counts) if piece_counts else self.piece_counts
+        max_holes = max_holes or self.max_holes or (
+            DifficultyManager.get_max_holes(difficulty) if difficulty else DEFAULT_MAX_HOLES)
+        beam_width = beam_width or self.beam_width
+
+        attempts = 1 if seed is not None else self.max_attempts
+        closest, closest_distance = None, None
+        for _ in range(attempts):
+            puzzle_seed = seed if seed is not None else self.next_seed()
+            selector = self._selector_copy()
+            record = generate_puzzle_record(puzzle_seed, dict(piece_counts) if piece_counts else None,
+                                            max_holes, self.min_holes, difficulty,
+                                            carve_selector=selector, beam_width=beam_width)
+            if record is not None and selector is not None:
+                with self._lock:
+                    self.carve_selector.merge(record['info']['carve_outcomes'])
+            if record is None:
+                continue
+            if seed is not None or matches_difficulty(record, difficulty):
+                return GeneratedPuzzle.from_record(record)
+            distance = abs(difficulty_rank(record['difficulty']) - difficulty_rank(difficulty))
+            if closest is None or distance < closest_distance:
+                closest, closest_distance = record, distance
+        error = GenerationFailed(difficulty, attempts,
+                                 GeneratedPuzzle.from_record(closest) if closest is not None else None)
+        logger.info("%s", error)
+        raise error
+
+    def _selector_copy(self):
+        """이번 호출에서 쓸 조각 선택 통계 복사본 (엔진 통계는 호출이 끝난 뒤 합침)"""
+        if self.carve_selector is None:
+            return None
+        with self._lock:
+            return AdaptiveCarveSelector(self.carve_selector.snapshot(), self.carve_selector.max_evidence)
+
+    def api_client(self, max_workers=None):
+        """엔진 설정을 쓰는 API 클라이언트 생성 (클라이언트는 스레드마다 따로 만들어 쓰기)"""
+        return PuzzleAPIClient(max_workers=max_workers, settings=self.settings)
+
+def test_generation_engine(threads=4, count=8, seed=21):
+    """여러 스레드에서 생성한 결과가 한 스레드에서 생성한 결과와 같은지 확인"""
+    from concurrent.futures import ThreadPoolExecutor
+    from pipeline import verify_record
+
+    print("=" * 50)
+    print("생성 엔진 테스트")
+    print("=" * 50)
+
+    engine = GenerationEngine(seed=seed)
+
+    def generate(difficulty=None, puzzle_seed=None):
+        try:
+            return engine.generate(difficulty, seed=puzzle_seed)
+        except GenerationFailed:
+            return None
+
+    seeds = [derive_seed(seed, 'test', index) for index in range(count)]
+    serial = [generate(puzzle_seed=puzzle_seed) for puzzle_seed in seeds]
+    with ThreadPoolExecutor(threads) as executor:
+        threaded = list(executor.map(lambda puzzle_seed: generate(puzzle_seed=puzzle_seed), seeds))
+    print(f"스레드 {threads}개 결과가 순차 결과와 같음: {serial == threaded}")
+
+    results = [puzzle for puzzle in serial if puzzle is not None]
+    print(f"검증 통과: {sum(verify_record(puzzle.to_record())[0] for puzzle in results)}/{len(results)}")
+    try:
+        results[0].holes_count = 0
+    except AttributeError as error:
+        print(f"수정 시도: {error}")
+
+    with ThreadPoolExecutor(threads) as executor:
+        auto = list(executor.map(lambda _: generate('medium'), range(count)))
+    print(f"자동 시드 medium {count}개: {[puzzle.difficulty if puzzle else None for puzzle in auto]}, "
+          f"시드 중복 없음: {len({puzzle.seed for puzzle in auto if puzzle}) == sum(1 for puzzle in auto if puzzle)}")
+
+    strict = GenerationEngine(seed=seed, max_attempts=1)
+    attempts = count // 2
+    closest = []
+    for _ in range(attempts):
+        try:
+            strict.generate('expert')
+        except GenerationFailed as error:
+            closest.append(error.closest.difficulty if error.closest else None)
+    print(f"expert 1번씩 시도 {attempts}회: 성공 {attempts - len(closest)}회, 실패의 가장 가까운 난이도 {closest}")
+
+if __name__ == "__main__":
+    test_generation_engine()
@@ -0,0 +1,347 @@
+"""
+ChessSudoku 다음 단계 힌트 엔진
+
+플레이어가 풀고 있는 퍼즐마다 후보 상태(칸별 9비트 후보)를 들고 있다가,
+새 입력이 오면 바뀐 칸과 그 peer들만 갱신하고 다음에 둘 수 있는 칸 하나를
+(기법, 칸, 숫자, 근거 묶음)으로 돌려줍니다.
+
+    engine = HintEngine()
+    hint = engine.next_hint(puzzle_board, pieces, entries={(0, 3): 7})
+    # {'technique': 'hidden_singles', 'row': 4, 'col': 2, 'digit': 5,
+    #  'unit': {'type': 'box', 'index': 3}, 'cells': [...]}
+
+퍼즐별 상태는 LRU로 max_states개까지 보관하므로, 같은 퍼즐의 연속된 힌트 요청은
+처음부터 후보를 다시 계산하지 않습니다.
+
+기법 이름은 LogicalSolver/SearchStats와 같습니다.
+    naked_singles   후보가 하나뿐인 칸
+    hidden_singles  9칸짜리 묶음(기물 없는 행/열/박스, 9칸 공격 범위)에서 숫자가 들어갈 칸이 하나뿐
+    naked_pairs     두 칸의 같은 후보 쌍을 묶음의 다른 칸에서 지운 뒤 생기는 단일 후보
+    conflict        플레이어 입력이 규칙을 어김 (근거는 같은 숫자가 있는 칸)
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from board import Board
+from constraint_graph import ConstraintGraph, COORDS
+from puzzle_codec import encode_board
+from sudoku_solver import ALL_DIGITS, DIGIT_OF, POPCOUNT
+
+DEFAULT_MAX_STATES = 1024
+
+@lru_cache(maxsize=256)
+def _hint_units(constraint_graph):
+    """기물 배치별 힌트용 묶음들 반환
+
+    Returns:
+        tuple: (all_units, full_units) - 둘 다 ({'type', 'index'}, 칸 튜플) 튜플들
+            all_units: 서로 다른 숫자여야 하는 모든 묶음 (쌍 제거용, fill_peers 규칙)
+            full_units: 기물 칸을 빼고 정확히 9칸인 묶음 (숨겨진 단일 후보용)
+    """
+    piece_cells = constraint_graph.piece_cells
+    labels = ([('row', number) for number in range(9)] + [('col', number) for number in range(9)]
+              + [('box', number) for number in range(9)]
+              + [('piece', number) for number in range(len(constraint_graph.attack_groups))])
+    all_units = []
+    full_units = []
+    for (unit_type, number), unit in zip(labels, constraint_graph.units):
+        cells = tuple(index for index in unit if index not in piece_cells)
+        if len(cells) > 9:
+            continue  # fill_peers에서 제외되는 큰 공격 범위
+        entry = ({'type': unit_type, 'index': number}, cells)
+        all_units.append(entry)
+        if len(cells) == 9:
+            full_units.append(entry)
+    return tuple(all_units), tuple(full_units)
+
+def _check_digit(index, digit):
+    """플레이어 입력 숫자가 1~9인지 확인 (아니면 ValueError)"""
+    if not isinstance(digit, int) or isinstance(digit, bool) or not 1 <= digit <= 9:
+        raise ValueError(f"입력 숫자는 1~9여야 합니다: ({index // 9}, {index % 9}) -> {digit!r}")
+
+class PuzzleState:
+    """퍼즐 하나의 풀이 진행 상태
+
+    values는 칸별 숫자(0은 빈칸), candidates는 빈칸별 후보 비트입니다.
+    후보는 채워진 peer 숫자만 반영한 기본 후보이고, 기법을 적용한 제거는 힌트를 찾을 때
+    복사본에서만 합니다.
+    """
+
+    def __init__(self, puzzle_board, pieces, constraint_graph=None):
+        self.constraint_graph = constraint_graph or ConstraintGraph.from_pieces(pieces)
+        self.peers = self.constraint_graph.fill_peers
+        self.all_units, self.full_units = _hint_units(self.constraint_graph)
+        piece_cells = self.constraint_graph.piece_cells
+
+        grid = puzzle_board.board if isinstance(puzzle_board, Board) else puzzle_board
+        self.givens = [0] * 81
+        for index, (row, col) in enumerate(COORDS):
+            value = grid[row][col]
+            if index not in piece_cells and isinstance(value, int):
+                self.givens[index] = value
+        self.open_cells = tuple(index for index in range(81)
+                                if index not in piece_cells and not self.givens[index])
+        self.open_set = frozenset(self.open_cells)
+        self.entries = {}  # 칸 인덱스 -> 플레이어가 넣은 숫자
+        self.values = list(self.givens)
+        self.candidates = [0] * 81
+        for index in self.open_cells:
+            self._recompute(index)
+
+    def _recompute(self, index):
+        """빈칸 하나의 후보를 peer 숫자들로 다시 계산"""
+        mask = ALL_DIGITS
+        values = self.values
+        for peer in self.peers[index]:
+            if values[peer]:
+                mask &= ~(1 << (values[peer] - 1))
+        self.candidates[index] = mask
+
+    def place(self, index, digit):
+        """빈칸에 숫자 입력 - peer 후보에서 그 숫자만 지움 (0이나 None이면 지우기)"""
+        if not digit:
+            self.erase(index)
+            return
+        _check_digit(index, digit)
+        if self.values[index]:
+            self.erase(index)
+        self.entries[index] = digit
+        self.values[index] = digit
+        self.candidates[index] = 0
+        bit = ~(1 << (digit - 1))
+        for peer in self.peers[index]:
+            if not self.values[peer]:
+                self.candidates[peer] &= bit
+
+    def erase(self, index):
+        """플레이어 입력 지우기 - 그 칸과 peer 빈칸들의 후보만 다시 계산"""
+        if index not in self.entries:
+            return
+        del self.entries[index]
+        self.values[index] = 0
+        self._recompute(index)
+        for peer in self.peers[index]:
+            if not self.values[peer] and not self.givens[peer]:
+                self._recompute(peer)
+
+    def sync(self, entries):
+        """플레이어 입력 전체({칸 인덱스: 숫자})에 맞춰 바뀐 칸만 갱신
+
+        빈칸이 아닌 칸의 입력은 무시하고, 0이나 None은 지운 칸으로 봅니다.
+        1~9가 아닌 숫자가 있으면 상태를 바꾸기 전에 ValueError를 냅니다 (캐시된 상태 보호).
+        """
+        entries = {index: digit for index, digit in entries.items() if digit}
+        for index, digit in entries.items():
+            _check_digit(index, digit)
+        for index in [index for index in self.entries if entries.get(index) != self.entries[index]]:
+            self.erase(index)
+        for index, digit in entries.items():
+            if index in self.open_set and self.entries.get(index) != digit:
+                self.place(index, digit)
+
+    def find_conflict(self):
+        """규칙을 어긴 입력이 있으면 conflict 힌트 반환"""
+        values = self.values
+        for index in self.entries:
+            digit = values[index]
+            for peer in self.peers[index]:
+                if values[peer] == digit:
+                    return _hint('conflict', index, digit, None, [peer])
+        for index in self.open_cells:
+            if not values[index] and not self.candidates[index]:
+                return _hint('conflict', index, None, None, [])
+        return None
+
+    def find_hint(self):
+        """다음에 둘 수 있는 칸 하나를 힌트 dict로 반환 (없으면 None)"""
+        conflict = self.find_conflict()
+        if conflict is not None:
+            return conflict
+
+        hint = self._find_single(self.candidates, 'naked_singles', 'hidden_singles')
+        if hint is not None:
+            return hint
+
+        # 쌍 제거를 복사본 후보에 적용한 뒤 다시 단일 후보를 찾음
+        candidates = list(self.candidates)
+        pair_cells = self._apply_naked_pairs(candidates)
+        if pair_cells:
+            hint = self._find_single(candidates, 'naked_pairs', 'naked_pairs')
+            if hint is not None:
+                hint['cells'] = pair_cells + hint['cells']
+                return hint
+        return None
+
+    def _find_single(self, candidates, naked_name, hidden_name):
+        values = self.values
+        for index in self.open_cells:
+            if not values[index]:
+                mask = candidates[index]
+                if mask and not mask & (mask - 1):
+                    return _hint(naked_name, index, DIGIT_OF[mask], None, [])
+
+        for label, unit in self.full_units:
+            once = twice = placed = 0
+            for index in unit:
+                if values[index]:
+                    placed |= 1 << (values[index] - 1)
+                else:
+                    mask = candidates[index]
+                    twice |= once & mask
+                    once |= mask
+            only = once & ~twice & ~placed
+            if not only:
+                continue
+            bit = only & -only
+            for index in unit:
+                if not values[index] and candidates[index] & bit:
+                    return _hint(hidden_name, index, DIGIT_OF[bit], label, list(unit))
+        return None
+
+    def _apply_naked_pairs(self, candidates):
+        """후보가 같은 두 칸의 숫자 쌍을 묶음의 다른 칸에서 지움 - 쌍 칸들 반환"""
+        values = self.values
+        pair_cells = []
+        for _, unit in self.all_units:
+            pairs = {}
+            for index in unit:
+                mask = candidates[index]
+                if not values[index] and POPCOUNT[mask] == 2:
+                    pairs.setdefault(mask, []).append(index)
+            for mask, cells in pairs.items():
+                if len(cells) != 2:
+                    continue
+                for index in unit:
+                    if index not in cells and not values[index] and candidates[index] & mask:
+                        candidates[index] &= ~mask
+                        if cells not in pair_cells:
+                            pair_cells.append(cells)
+        return [COORDS[index] for cells in pair_cells for index in cells]
+
+def _hint(technique, index, digit, unit, cells):
+    row, col = COORDS[index]
+    return {
+        'technique': technique,
+        'row': row,
+        'col': col,
+        'digit': digit,
+        'unit': dict(unit) if unit else None,
+        'cells': [COORDS[cell] if isinstance(cell, int) else cell for cell in cells],
+    }
+
+def entries_from_board(puzzle_board, current_board):
+    """현재 보드에서 퍼즐 빈칸에 들어간 숫자들을 {칸 인덱스: 숫자}로 추출"""
+    puzzle_grid = puzzle_board.board if isinstance(puzzle_board, Board) else puzzle_board
+    current_grid = current_board.board if isinstance(current_board, Board) else current_board
+    entries = {}
+    for index, (row, col) in enumerate(COORDS):
+        value = current_grid[row][col]
+        if puzzle_grid[row][col] is None and isinstance(value, int):
+            entries[index] = value
+    return entries
+
+class HintEngine:
+    """퍼즐별 풀이 상태를 LRU로 보관하며 다음 단계 힌트를 주는 엔진"""
+
+    def __init__(self, max_states=DEFAULT_MAX_STATES):
+        self.max_states = max_states
+        self.states = OrderedDict()  # 퍼즐 키 -> PuzzleState (LRU 순서)
+        self.hits = 0
+        self.misses = 0
+
+    def get_state(self, puzzle_board, pieces, key=None):
+        """퍼즐의 상태를 캐시에서 꺼내거나 새로 만듦
+
+        Args:
+            key (hashable, optional): 퍼즐 식별자 (없으면 퍼즐 문자열 사용)
+        """
+        if key is None:
+            key = encode_board(puzzle_board, pieces)
+        state = self.states.get(key)
+        if state is not None:
+            self.states.move_to_end(key)
+            self.hits += 1
+            return state
+
+        self.misses += 1
+        state = PuzzleState(puzzle_board, pieces)
+        self.states[key] = state
+        if len(self.states) > self.max_states:
+            self.states.popitem(last=False)
+        return state
+
+    def next_hint(self, puzzle_board, pieces, entries=None, key=None):
+        """플레이어 입력을 반영한 다음 단계 힌트 반환
+
+        Args:
+            puzzle_board (Board): 원래 퍼즐 보드
+            pieces (list): Piece 리스트
+            entries: 플레이어 입력 - {(row, col): 숫자} dict 또는 현재 Board (없으면 입력 없음)
+            key (hashable, optional): 퍼즐 식별자 (퍼즐 ID 등을 주면 키 계산을 생략)
+
+        Returns:
+            dict: {'technique', 'row', 'col', 'digit', 'unit', 'cells'}, 둘 곳이 없으면 None
+                unit은 근거 묶음 {'type': 'row'|'col'|'box'|'piece', 'index'} (단일 후보면 None),
+                cells는 근거 칸들 (숨겨진 단일 후보의 묶음 칸, 쌍 제거의 쌍 칸, 충돌한 칸)
+        """
+        state = self.get_state(puzzle_board, pieces, key)
+        if entries is None:
+            entries = {}
+        elif isinstance(entries, Board):
+            entries = entries_from_board(puzzle_board, entries)
+        else:
+            entries = {row * 9 + col: digit for (row, col), digit in entries.items()}
+        state.sync(entries)
+        return state.find_hint()
+
+    def cache_info(self):
+        """캐시 적중/실패 횟수와 보관 중인 상태 수"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.states),
+                'max_states': self.max_states}
+
+def test_hint_engine(seed=1234):
+    """힌트를 따라 퍼즐을 끝까지 풀고 힌트 한 번의 평균 시간 측정"""
+    import time
+    from pipeline import iter_puzzles
+
+    print("=" * 50)
+    print("힌트 엔진 테스트")
+    print("=" * 50)
+
+    record = next(iter_puzzles(count=1, seed=seed, max_holes=45))
+    puzzle, answer, pieces = record['puzzle'], record['answer'], record['pieces']
+    engine = HintEngine()
+    entries = {}
+    techniques = {}
+    elapsed = 0.0
+    while True:
+        started = time.perf_counter()
+        hint = engine.next_hint(puzzle, pieces, entries, key=record['seed'])
+        elapsed += time.perf_counter() - started
+        if hint is None or hint['technique'] == 'conflict':
+            break
+        if answer.board[hint['row']][hint['col']] != hint['digit']:
+            print(f"잘못된 힌트: {hint}")
+            break
+        techniques[hint['technique']] = techniques.get(hint['technique'], 0) + 1
+        entries[(hint['row'], hint['col'])] = hint['digit']
+
+    requests = sum(techniques.values()) + 1
+    print(f"힌트 {len(entries)}개로 빈칸 {record['info']['holes_count']}개 채움: {techniques}")
+    print(f"힌트 평균 {elapsed / requests * 1000:.3f}ms, 캐시: {engine.cache_info()}")
+
+    wrong = dict(entries)
+    row, col = next(iter(wrong))
+    wrong[(row, col)] = answer.board[row][col] % 9 + 1
+    print(f"잘못된 입력 힌트: {engine.next_hint(puzzle, pieces, wrong, key=record['seed'])}")
+
+    erased = dict(entries)
+    erased[(row, col)] = 0
+    hint = engine.next_hint(puzzle, pieces, erased, key=record['seed'])
+    print(f"지운 입력(0) 힌트: {hint['technique']} ({hint['row']}, {hint['col']}) -> {hint['digit']}")
+    try:
+        engine.next_hint(puzzle, pieces, {(row, col): 10}, key=record['seed'])
+    except ValueError as error:
+        print(f"범위 밖 입력: {error}")
+
+if __name__ == "__main__":
+    test_hint_engine()
@@ -0,0 +1,125 @@
+"""
+ChessSudoku 로깅 설정 모듈
+
+모든 모듈은 get_logger(__name__)로 'chessudoku' 아래의 로거를 사용합니다.
+라이브러리로 import하면 NullHandler만 붙어 있어 아무것도 출력하지 않고,
+CLI(main.py, batch, daily 등)는 configure_logging()으로 출력을 켭니다.
+
+    from log_setup import configure_logging
+    configure_logging(logging.INFO)                          # 진행 메시지 출력
+    configure_logging(logging.DEBUG, events_path="ev.jsonl")  # 칸별 메시지 + 이벤트 기록
+
+이벤트 스트림:
+    log_event("carve", row=3, col=4, accepted=True)처럼 기록한 이벤트는
+    'chessudoku.events' 로거로 가고, configure_logging(events_path=...)를 지정하면
+    한 줄에 JSON 하나씩 파일에 추가됩니다. 지정하지 않으면 events_enabled()가
+    False라서 이벤트용 값을 만들지도 않습니다.
+    프로세스 풀 작업자도 같은 파일에 줄 단위로 추가합니다. fork 방식은 핸들러를 그대로
+    물려받고, spawn/forkserver 방식은 풀을 만들 때 initializer=init_worker_logging,
+    initargs=worker_logging_args()를 넘겨야 작업자에서 이벤트 스트림이 다시 켜집니다.
+"""
+import json
+import logging
+import sys
+
+ROOT_LOGGER_NAME = "chessudoku"
+EVENTS_LOGGER_NAME = ROOT_LOGGER_NAME + ".events"
+# 퍼즐 한 개 생성 과정의 진행 메시지를 내는 모듈 (대량 생성에서는 -v일 때만 출력)
+PER_PUZZLE_MODULES = ("random_placer", "board_generator", "puzzle_generator")
+
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+
+_events_logger = logging.getLogger(EVENTS_LOGGER_NAME)
+_events_logger.propagate = False  # 이벤트는 콘솔 출력으로 보내지 않음
+_events_logger.setLevel(logging.CRITICAL + 1)  # configure_logging(events_path=...) 전까지 꺼 둠
+_events_path = None  # 현재 이벤트 파일 경로 (프로세스 풀 작업자에게 전달)
+
+def get_logger(name):
+    """모듈용 로거 반환 ('chessudoku.<모듈 이름>')"""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+def events_enabled():
+    """이벤트 스트림이 켜져 있는지 확인 (이벤트 값 계산 전에 검사)"""
+    return _events_logger.isEnabledFor(logging.INFO)
+
+def log_event(event, **fields):
+    """이벤트 하나 기록 (이벤트 스트림이 꺼져 있으면 아무것도 하지 않음)"""
+    if _events_logger.isEnabledFor(logging.INFO):
+        _events_logger.info(event, extra={'event_fields': fields})
+
+class JsonLinesFormatter(logging.Formatter):
+    """이벤트를 {"ts", "event", 필드...} JSON 한 줄로 변환"""
+
+    def format(self, record):
+        data = {'ts': round(record.created, 6), 'event': record.getMessage()}
+        data.update(getattr(record, 'event_fields', {}))
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+
+class JsonLinesHandler(logging.FileHandler):
+    """이벤트를 JSON Lines 파일에 추가하는 핸들러 (한 이벤트를 한 번에 기록)"""
+
+    def __init__(self, path):
+        super().__init__(path, mode='a', encoding='utf-8')
+        self.setFormatter(JsonLinesFormatter())
+
+def configure_logging(level=logging.INFO, events_path=None, stream=None, per_puzzle=True):
+    """CLI용 로깅 설정
+
+    Args:
+        level: 콘솔에 출력할 최소 레벨 (INFO: 진행 메시지, DEBUG: 칸별 조각/채우기 메시지)
+        events_path (str, optional): JSON Lines 이벤트 파일 경로
+        stream: 콘솔 출력 스트림 (기본: sys.stdout)
+        per_puzzle (bool): False면 level이 INFO 이상일 때 PER_PUZZLE_MODULES는 경고만 출력
+            (대량 생성에서 퍼즐마다 나오는 메시지 생략)
+    """
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(level)
+    for name in PER_PUZZLE_MODULES:
+        quiet = not per_puzzle and level >= logging.INFO
+        get_logger(name).setLevel(logging.WARNING if quiet else logging.NOTSET)
+    for handler in list(root.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            root.removeHandler(handler)
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    root.addHandler(console)
+
+    global _events_path
+    for handler in list(_events_logger.handlers):
+        _events_logger.removeHandler(handler)
+        handler.close()
+    _events_path = events_path
+    if events_path:
+        _events_logger.setLevel(logging.INFO)
+        _events_logger.addHandler(JsonLinesHandler(events_path))
+    else:
+        _events_logger.setLevel(logging.CRITICAL + 1)
+
+def worker_logging_args():
+    """프로세스 풀 initializer(init_worker_logging)에 넘길 인자 tuple"""
+    return (_events_path,)
+
+def init_worker_logging(events_path):
+    """프로세스 풀 작업자 초기화: 부모의 이벤트 파일에 이벤트를 추가하도록 설정
+
+    fork 방식 작업자는 부모의 핸들러를 이미 물려받았으므로 그대로 두고,
+    spawn/forkserver 방식처럼 모듈을 새로 불러온 작업자에서만 핸들러를 붙입니다.
+    """
+    global _events_path
+    if events_path and not events_enabled():
+        _events_path = events_path
+        _events_logger.setLevel(logging.INFO)
+        _events_logger.addHandler(JsonLinesHandler(events_path))
+
+def add_logging_arguments(parser):
+    """argparse 파서에 -v/--verbose, --events 옵션 추가"""
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="칸별 조각/채우기 메시지까지 출력 (DEBUG)")
+    parser.add_argument("--events", default=None, metavar="PATH",
+                        help="채우기/조각 이벤트를 JSON Lines로 기록할 파일")
+    return parser
+
+def configure_from_args(args, per_puzzle=False):
+    """add_logging_arguments로 받은 옵션대로 configure_logging 호출 (대량 생성 명령용)"""
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO, events_path=args.events,
+                      per_puzzle=per_puzzle)
@@ -1,7 +1,10 @@
 from board import Board
-from validators import PiecePlacer, SudokuValidator
+from constraint_graph import ConstraintGraph
 import copy
 
+# 풀이 경로에 기록되는 기법 (칸을 채우는 기법만, 인덱스는 페이로드의 기법 코드)
+PATH_TECHNIQUES = ('naked_singles', 'hidden_singles')
+
 class LogicalSolver:
     """논리적 기법만을 사용하여 스도쿠를 풀이하는 클래스
     
@@ -12,12 +15,27 @@ class LogicalSolver:
     - 쌍 제거 (Naked Pairs)
     """
     
-    def __init__(self, board, pieces):
+    def __init__(self, board, pieces, constraint_graph=None, stats=None, record_steps=False):
         self.board = board
         self.pieces = pieces
-        self.piece_placer = PiecePlacer(board)
-        self.piece_placer.pieces = pieces
-        self.sudoku_validator = SudokuValidator(board)
+        self.stats = stats  # SearchStats (None이면 통계를 세지 않음)
+        
+        # 풀이 경로: 채운 순서대로 (row, col, 숫자, 기법, 반복 번호) - record_steps일 때만 기록
+        self.steps = [] if record_steps else None
+        self.iteration = 0
+        
+        # 기법 사용 프로필: 기법별로 채운 칸 수와 풀이를 마친 반복 횟수 (난이도 평가용, 항상 기록)
+        self.placements = dict.fromkeys(PATH_TECHNIQUES, 0)
+        self.rounds = 0
+        
+        # 기물 배치별 제약 관계 (없으면 기물 목록으로부터 생성)
+        self.constraint_graph = constraint_graph or ConstraintGraph.from_pieces(pieces)
+        
+        # 기물이 있는 행/열/박스 (숨겨진 단일 후보 검사에서 제외)
+        piece_cells = self.constraint_graph.piece_cells
+        self.rows_with_piece = {index // 9 for index in piece_cells}
+        self.cols_with_piece = {index % 9 for index in piece_cells}
+        self.boxes_with_piece = {(index // 27 * 3, index % 9 // 3 * 3) for index in piece_cells}
         
         # 각 칸의 가능한 값들을 추적하는 딕셔너리
         # 키: (row, col) 튜플, 값: 가능한 숫자들의 set
@@ -39,16 +57,10 @@ class LogicalSolver:
                             self.possible_values[(row, col)].add(number)
     
     def is_valid_number(self, row, col, number):
-        """해당 위치에 숫자를 놓을 수 있는지 검사"""
-        # 1. 기본 스도쿠 규칙 검사
-        if not self.sudoku_validator.is_valid_number(row, col, number):
-            return False
-        
-        # 2. 체스 기물 규칙 검사
-        if not self.piece_placer.is_valid_number_for_piece(row, col, number):
-            return False
-        
-        return True
+        """해당 위치에 숫자를 놓을 수 있는지 검사 (스도쿠 규칙 + 체스 기물 규칙)"""
+        if self.stats is not None:
+            self.stats.is_valid_number_calls += 1
+        return self.constraint_graph.is_valid_number(self.board, row, col, number)
     
     def solve_logically(self):
         """논리적 기법만으로 스도쿠 풀이 시도
@@ -58,25 +70,51 @@ class LogicalSolver:
         """
         max_iterations = 100  # 무한 루프 방지
         iteration = 0
+        stats = self.stats
+        if stats is not None:
+            stats.solver_runs += 1
+        if self.steps is not None:
+            self.steps.clear()
+        self.placements = dict.fromkeys(PATH_TECHNIQUES, 0)
+        self.rounds = 0
+        
+        # 빈칸이 없으면 풀 것도 없음 (아래 반복은 진행이 없으면 완성 여부를 보기 전에 멈춤)
+        if self.is_complete():
+            return True
         
         while iteration < max_iterations:
             iteration += 1
+            self.iteration = iteration
             progress_made = False
+            if stats is not None:
+                stats.solver_iterations += 1
             
             # 1. 제약 전파 적용
-            if self.apply_constraint_propagation():
+            progress = self.apply_constraint_propagation()
+            if stats is not None:
+                stats.add_technique('constraint_propagation', progress)
+            if progress:
                 progress_made = True
             
             # 2. 단일 후보 찾기
-            if self.find_naked_singles():
+            progress = self.find_naked_singles()
+            if stats is not None:
+                stats.add_technique('naked_singles', progress)
+            if progress:
                 progress_made = True
             
             # 3. 숨겨진 단일 후보 찾기
-            if self.find_hidden_singles():
+            progress = self.find_hidden_singles()
+            if stats is not None:
+                stats.add_technique('hidden_singles', progress)
+            if progress:
                 progress_made = True
             
             # 4. 쌍 제거 (고급 기법)
-            if self.find_naked_pairs():
+            progress = self.find_naked_pairs()
+            if stats is not None:
+                stats.add_technique('naked_pairs', progress)
+            if progress:
                 progress_made = True
             
             # 더 이상 진행할 수 없으면 중단
@@ -85,11 +123,28 @@ class LogicalSolver:
             
             # 모든 칸이 채워졌는지 확인
             if self.is_complete():
+                self.rounds = iteration
                 return True
         
         # 논리적으로 더 이상 풀 수 없음
         return False
     
+    def record_step(self, row, col, number, technique):
+        """채운 칸 하나를 기법 사용 프로필에 세고, record_steps면 풀이 경로에도 기록"""
+        self.placements[technique] += 1
+        if self.steps is not None:
+            self.steps.append((row, col, number, technique, self.iteration))
+    
+    def get_technique_profile(self):
+        """마지막 풀이의 기법 사용 프로필 반환 (difficulty.rate_profile의 입력)
+        
+        Returns:
+            dict: 기법 이름 -> 채운 칸 수, 'rounds' -> 풀이를 마친 반복 횟수 (풀지 못했으면 0)
+        """
+        profile = dict(self.placements)
+        profile['rounds'] = self.rounds
+        return profile
+    
     def apply_constraint_propagation(self):
         """제약 전파를 적용하여 가능한 값들을 업데이트"""
         progress_made = False
@@ -127,49 +182,63 @@ class LogicalSolver:
                         number = list(possible)[0]
                         self.board.set_value(row, col, number)
                         del self.possible_values[(row, col)]
+                        self.record_step(row, col, number, 'naked_singles')
                         progress_made = True
         
         return progress_made
     
     def find_hidden_singles(self):
-        """숨겨진 단일 후보 찾기 - 행/열/박스에서 특정 숫자가 들어갈 수 있는 칸이 1개인 경우"""
+        """숨겨진 단일 후보 찾기 - 행/열/박스에서 특정 숫자가 들어갈 수 있는 칸이 1개인 경우
+        
+        기물이 있는 행/열/박스는 숫자가 8개 이하라 빠지는 숫자가 있으므로 검사하지 않습니다.
+        후보는 같은 반복에서 채운 칸을 반영하지 않으므로, 이미 그 숫자가 놓인 단위에서
+        남은 후보 한 칸에 같은 숫자를 또 채우지 않도록 놓기 전에 다시 검사합니다.
+        """
         progress_made = False
         
         # 각 숫자(1-9)에 대해 검사
         for number in range(1, 10):
             # 행별로 검사
             for row in range(9):
+                if row in self.rows_with_piece:
+                    continue
                 possible_cells = []
                 for col in range(9):
                     if (self.board.get_value(row, col) is None and 
                         number in self.possible_values.get((row, col), set())):
                         possible_cells.append((row, col))
                 
-                if len(possible_cells) == 1:
+                if len(possible_cells) == 1 and self.is_valid_number(*possible_cells[0], number):
                     # 이 행에서 이 숫자가 들어갈 수 있는 칸이 1개뿐
                     row, col = possible_cells[0]
                     self.board.set_value(row, col, number)
                     del self.possible_values[(row, col)]
+                    self.record_step(row, col, number, 'hidden_singles')
                     progress_made = True
             
             # 열별로 검사
             for col in range(9):
+                if col in self.cols_with_piece:
+                    continue
                 possible_cells = []
                 for row in range(9):
                     if (self.board.get_value(row, col) is None and 
                         number in self.possible_values.get((row, col), set())):
                         possible_cells.append((row, col))
                 
-                if len(possible_cells) == 1:
+                if len(possible_cells) == 1 and self.is_valid_number(*possible_cells[0], number):
                     # 이 열에서 이 숫자가 들어갈 수 있는 칸이 1개뿐
                     row, col = possible_cells[0]
                     self.board.set_value(row, col, number)
                     del self.possible_values[(row, col)]
+                    self.record_step(row, col, number, 'hidden_singles')
                     progress_made = True
             
             # 3x3 박스별로 검사
             for box_row in range(0, 9, 3):
                 for box_col in range(0, 9, 3):
+                    if (box_row, box_col) in self.boxes_with_piece:
+                        continue
                     possible_cells = []
                     for r in range(box_row, box_row + 3):
                         for c in range(box_col, box_col + 3):
@@ -177,11 +246,12 @@ class LogicalSolver:
                                 number in self.possible_values.get((r, c), set())):
                                 possible_cells.append((r, c))
                     
-                    if len(possible_cells) == 1:
+                    if len(possible_cells) == 1 and self.is_valid_number(*possible_cells[0], number):
                         # 이 박스에서 이 숫자가 들어갈 수 있는 칸이 1개뿐
                         row, col = possible_cells[0]
                         self.board.set_value(row, col, number)
                         del self.possible_values[(row, col)]
+                        self.record_step(row, col, number, 'hidden_singles')
                         progress_made = True
         
         return progress_made
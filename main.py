@@ -3,11 +3,30 @@ from board_generator import BoardGenerator
 from random_placer import RandomPiecePlacer
 from puzzle_generator import PuzzleGenerator
 from logical_solver import LogicalSolver
-from puzzle_api_client import PuzzleAPIClient, DifficultyManager
+from constraint_graph import ConstraintGraph
+from puzzle_api_client import PuzzleAPIClient, PuzzleDataFormatter, DifficultyManager
 from config import config
+from seeding import make_rng, new_seed
+from outbox import UploadOutbox
+from puzzle_store import PuzzleStore
+from profiling import StageProfiler
+from hint_engine import HintEngine
+from log_setup import configure_logging
 import copy
+import logging
 
-def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_date=None):
+def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_date=None,
+         seed=None, piece_counts=None, max_holes=45, outbox_path=None, store_path=None, upload=True,
+         profile_dir=None, beam_width=None):
+    # profile_dir가 있으면 단계별 .pstats와 호출 스택(stacks.collapsed)을 저장
+    profiler = StageProfiler(profile_dir)
+    
+    # 시드가 없으면 새로 만들어서 출력 (seed, piece_counts, max_holes, custom_difficulty, beam_width로 퍼즐 재현 가능)
+    if seed is None:
+        seed = new_seed()
+    rng = make_rng(seed)
+    print(f"시드: {seed}")
+    
     # 1. 기물 배치 (빈 보드에)
     print("=" * 50)
     print("1단계: 랜덤 기물 배치")
@@ -15,8 +34,9 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
     
     board = Board()
         
-    random_placer = RandomPiecePlacer(board)
-    placed_count = random_placer.place_pieces_randomly()
+    random_placer = RandomPiecePlacer(board, rng)
+    with profiler.stage("placement"):
+        placed_count = random_placer.place_pieces_randomly(piece_counts)
     
     print(f"\n기물 배치 완료: {placed_count}개")
     print("\n기물 배치 후:")
@@ -27,8 +47,12 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
     print("2단계: 완전한 스도쿠 보드 생성 (기물 제약 조건 고려)")
     print("=" * 50)
     
-    solver = BoardGenerator(board, random_placer.get_pieces())
-    success = solver.generate_complete_board()
+    # 기물 배치별 제약 그래프는 한 번만 만들어 모든 단계에서 공유
+    constraint_graph = ConstraintGraph.from_pieces(random_placer.get_pieces())
+    
+    solver = BoardGenerator(board, random_placer.get_pieces(), constraint_graph, rng)
+    with profiler.stage("fill"):
+        success = solver.generate_complete_board()
 
     # 변수 초기화
     puzzle_board = None
@@ -43,9 +67,10 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
         print("3단계: 퍼즐 생성 (빈칸 조각하기 - 논리적 풀이 가능성 검증)")
         print("=" * 50)
         
-        max_holes = 45  # 원하는 빈칸 개수 설정
-        puzzle_generator = PuzzleGenerator(board, random_placer.get_pieces())
-        puzzle_board = puzzle_generator.generate_puzzle(max_holes=max_holes)
+        puzzle_generator = PuzzleGenerator(board, random_placer.get_pieces(), constraint_graph, rng)
+        with profiler.stage("carve"):
+            puzzle_board = puzzle_generator.generate_puzzle(max_holes=max_holes, target_difficulty=custom_difficulty,
+                                                            beam_width=beam_width)
         
         print(f"\n생성된 퍼즐:")
         puzzle_board.print_board()
@@ -56,7 +81,14 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
         print("4단계: 퍼즐 풀이 힌트 제공")
         print("=" * 50)
         
-        hints = puzzle_generator.get_solution_hints()
+        with profiler.stage("hint"):
+            hints = puzzle_generator.get_solution_hints()
+            next_hint = HintEngine().next_hint(puzzle_board, random_placer.get_pieces())
+        if next_hint:
+            unit = next_hint['unit']
+            reason = f", 근거: {unit['type']} {unit['index']}" if unit else ""
+            print(f"다음 단계: ({next_hint['row']}, {next_hint['col']})에 {next_hint['digit']} "
+                  f"({next_hint['technique']}{reason})")
         if hints:
             print(f"힌트 제공 (가능한 값이 적은 칸들):")
             for i, hint in enumerate(hints[:5]):  # 상위 5개만 표시
@@ -69,8 +101,20 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
     else:
         print("보드 생성에 실패했습니다.")
     
+    # 로컬 저장소에 저장 (선택사항 - 게시는 publish_daily_puzzle 등으로 따로 실행)
+    # 저장소의 difficulty는 다른 경로(pipeline 레코드, batch, daily)와 같이 평가한 난이도
+    if success and puzzle_board and puzzle_generator and store_path:
+        puzzle_info = puzzle_generator.get_puzzle_info()
+        with PuzzleStore(store_path) as store:
+            stored_id = store.add_puzzle(
+                puzzle_board, board, random_placer.get_pieces(),
+                puzzle_info['difficulty'], puzzle_info['holes_count'],
+                seed=seed, puzzle_type=puzzle_type, daily_date=daily_date
+            )
+        print(f"\n로컬 저장소에 저장됨: {store_path} (id: {stored_id})")
+    
     # 5. 서버로 퍼즐 전송 (선택사항)
-    if success and puzzle_board and puzzle_generator:
+    if success and puzzle_board and puzzle_generator and upload:
         print("\n" + "=" * 50)
         print("5단계: 서버로 퍼즐 전송")
         print("=" * 50)
@@ -92,14 +136,28 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
             api_client.set_server_url(server_url)
         
         # 퍼즐 업로드
-        upload_success, upload_result = api_client.upload_puzzle(
-            puzzle_board=puzzle_board,
-            answer_board=board,  # 완성된 보드가 정답
-            pieces=random_placer.get_pieces(),
-            difficulty=difficulty,
-            puzzle_type=puzzle_type,
-            daily_date=daily_date
-        )
+        with profiler.stage("upload"):
+            if outbox_path:
+                # 아웃박스에 먼저 기록한 뒤 전송 (실패해도 다음 drain에서 재전송)
+                payload = PuzzleDataFormatter.create_puzzle_payload(
+                    puzzle_board, board, random_placer.get_pieces(), difficulty, puzzle_type, daily_date
+                )
+                with UploadOutbox(outbox_path) as outbox:
+                    key = outbox.enqueue(payload)
+                    print(f"아웃박스에 기록됨: {outbox_path} (키: {key})")
+                    outbox.drain(api_client)
+                    entry = outbox.get(key)
+                upload_success = entry['status'] == UploadOutbox.SENT
+                upload_result = {"data": {"puzzle_id": entry['puzzle_id']}} if upload_success else None
+            else:
+                upload_success, upload_result = api_client.upload_puzzle(
+                    puzzle_board=puzzle_board,
+                    answer_board=board,  # 완성된 보드가 정답
+                    pieces=random_placer.get_pieces(),
+                    difficulty=difficulty,
+                    puzzle_type=puzzle_type,
+                    daily_date=daily_date
+                )
         
         # 결과 요약
         print("\n" + "=" * 50)
@@ -113,19 +171,49 @@ def main(server_url=None, custom_difficulty=None, puzzle_type="normal", daily_da
                 puzzle_id = upload_result["data"].get("puzzle_id")
                 if puzzle_id:
                     print(f"퍼즐 ID: {puzzle_id}")
+        elif outbox_path:
+            print("서버 업로드 실패 - 아웃박스에 보관됨 (python outbox.py로 재전송) 📤")
         else:
             print("서버 업로드 실패 📤")
+    
+    # 프로파일 결과 저장 (profile_dir가 있을 때만)
+    if profiler.enabled:
+        profiler.close()
+        profiler.print_summary()
 
 # 사용자 편의 함수들
-def create_normal_puzzle(server_url=None, difficulty=None):
+def create_normal_puzzle(server_url=None, difficulty=None, seed=None):
     """일반 퍼즐 생성 및 업로드"""
     print("일반 퍼즐 생성 모드")
-    return main(server_url=server_url, custom_difficulty=difficulty, puzzle_type="normal")
+    return main(server_url=server_url, custom_difficulty=difficulty, puzzle_type="normal", seed=seed)
 
-def create_daily_puzzle(daily_date, server_url=None, difficulty=None):
-    """데일리 퍼즐 생성 및 업로드"""
+def create_daily_puzzle(daily_date, server_url=None, difficulty=None, seed=None, store_path=None):
+    """데일리 퍼즐 생성 및 업로드
+    
+    store_path가 있으면 업로드하지 않고 로컬 저장소에만 저장합니다.
+    (게시는 publish_daily_puzzle로 따로 실행)
+    """
     print(f"데일리 퍼즐 생성 모드 (날짜: {daily_date})")
-    return main(server_url=server_url, custom_difficulty=difficulty, puzzle_type="daily_challenge", daily_date=daily_date)
+    return main(server_url=server_url, custom_difficulty=difficulty, puzzle_type="daily_challenge",
+                daily_date=daily_date, seed=seed, store_path=store_path, upload=store_path is None)
+
+def publish_daily_puzzle(daily_date, store_path, server_url=None):
+    """로컬 저장소에 저장된 데일리 퍼즐을 서버에 업로드"""
+    with PuzzleStore(store_path) as store:
+        row = store.get_daily(daily_date)
+        if row is None:
+            print(f"저장된 데일리 퍼즐이 없습니다 (날짜: {daily_date})")
+            return False
+        if row['used']:
+            print(f"이미 게시된 데일리 퍼즐입니다 (날짜: {daily_date}, ID: {row['remote_id']})")
+            return True
+        
+        api_client = PuzzleAPIClient(server_url)
+        upload_success, upload_result = api_client.upload_puzzle(**PuzzleStore.to_upload_args(row))
+        if upload_success:
+            remote_id = (upload_result or {}).get("data", {}).get("puzzle_id")
+            store.mark_used(row['id'], remote_id)
+        return upload_success
 
 def show_help():
     """사용법 도움말"""
@@ -147,6 +235,13 @@ def show_help():
     print("   create_daily_puzzle('2024-01-01')")
     print("   create_daily_puzzle('2024-01-01', difficulty='expert')")
     print()
+    print("   # 생성과 게시를 나눠서 실행 (로컬 저장소 사용)")
+    print("   create_daily_puzzle('2024-01-01', store_path='puzzles.sqlite3')")
+    print("   publish_daily_puzzle('2024-01-01', 'puzzles.sqlite3')")
+    print()
+    print("   # 같은 시드로 같은 퍼즐 재현")
+    print("   create_normal_puzzle(seed=12345)")
+    print()
     print("3. 사용 가능한 난이도:")
     DifficultyManager.list_difficulties()
     print()
@@ -155,11 +250,79 @@ def show_help():
     print("   - 환경변수: CHESSUDOKU_SERVER_URL=https://your-server.com")
     print("   - 설정파일: config.json 생성")
     print("   - 사용자 지정: server_url 매개변수 사용")
+    print()
+    print("5. 업로드 아웃박스:")
+    print("   main(outbox_path='outbox.sqlite3')  # 로컬에 먼저 기록 후 업로드")
+    print("   python outbox.py outbox.sqlite3     # 실패한 업로드 재전송")
+    print()
+    print("6. 대량 생성 (여러 프로세스):")
+    print("   python main.py generate --count 1000 --workers 8 --difficulty hard --seed 1234 --out puzzles.jsonl")
+    print("   python main.py generate --count 100 --out puzzles.sqlite3 --upload")
+    print("   - 출력 형식: .jsonl, .sqlite3/.db (PuzzleStore), .bank (퍼즐 뱅크)")
+    print("   - 자세한 옵션: python main.py generate --help")
+    print("   - 단계별 프로파일: python main.py generate --count 20 --profile profile")
+    print("   - 풀이 경로 포함: python main.py generate --count 100 --out puzzles.jsonl --solution-path")
+    print("   - 조각 후보 학습: python main.py generate --count 100 --carve-priors carve_priors.json")
+    print("   - 빔 탐색 조각 (빈칸이 많은 퍼즐): python main.py generate --count 100 --difficulty expert --beam-width 4")
+    print()
+    print("7. 데일리 퍼즐 사전 생성 (날짜별 고정 시드, 이미 생성한 날짜는 건너뜀):")
+    print("   python main.py precompute-daily --start 2025-01-01 --end 2025-12-31 --workers 8 --store puzzles.sqlite3")
+    print("   from daily import publish_daily")
+    print("   publish_daily('2025-01-01', '2025-12-31', 'puzzles.sqlite3')  # 기간 단위 일괄 게시")
+    print()
+    print("8. 단계별 프로파일 (배치, 채우기, 조각, 힌트, 업로드):")
+    print("   python main.py --profile [디렉터리]   # 기본 디렉터리: profile")
+    print("   main(profile_dir='profile')")
+    print("   - <단계>.pstats: python -m pstats profile/carve.pstats")
+    print("   - stacks.collapsed: flamegraph.pl, speedscope 등에서 열기")
+    print()
+    print("9. 로그와 이벤트 기록 (python main.py, generate, precompute-daily 공통):")
+    print("   python main.py -v                          # 칸별 조각/채우기 메시지까지 출력")
+    print("   python main.py generate --count 100 --events events.jsonl")
+    print("   - events.jsonl: 한 줄에 JSON 하나 ({\"ts\", \"event\": \"fill\"/\"carve\"/\"carve_done\", ...})")
+    print("   - 라이브러리로 import하면 아무것도 출력하지 않음 (log_setup.configure_logging()으로 켜기)")
+    print()
+    print("10. 퍼즐 풀 (난이도별로 미리 만들어 두고 즉시 제공, 부족하면 백그라운드 보충):")
+    print("   python main.py serve-pool --port 8080 --workers 2 --capacity 16 --low 4 --persist pool.jsonl")
+    print("   curl 'http://127.0.0.1:8080/puzzle?difficulty=hard&wait=10'")
+    print("   with PuzzlePool(workers=2) as pool: record = pool.get('hard', timeout=30)")
+    print()
+    print("11. 스레드 서버에 넣을 생성 엔진 (엔진별 시드/설정, 결과는 수정 불가):")
+    print("   from generation_engine import GenerationEngine")
+    print("   engine = GenerationEngine(seed=1234)")
+    print("   puzzle = engine.generate(difficulty='hard')   # 여러 스레드에서 동시에 호출 가능")
+    print("   payload = puzzle.to_payload()")
+
+def pop_logging_options(argv):
+    """기본 실행용 -v/--verbose, --events PATH 옵션을 argv에서 꺼내 (레벨, 이벤트 파일 경로) 반환"""
+    level, events_path = logging.INFO, None
+    while argv and argv[0] in ("-v", "--verbose", "--events"):
+        option = argv.pop(0)
+        if option == "--events":
+            events_path = argv.pop(0) if argv and not argv[0].startswith("-") else "events.jsonl"
+        else:
+            level = logging.DEBUG
+    return level, events_path
 
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--help":
-        show_help()
+    args = sys.argv[1:]
+    if args and args[0] == "generate":
+        from batch import run_cli
+        run_cli(args[1:])
+    elif args and args[0] == "precompute-daily":
+        from daily import run_cli
+        run_cli(args[1:])
+    elif args and args[0] == "serve-pool":
+        from puzzle_pool import run_cli
+        run_cli(args[1:])
     else:
-        main()
+        level, events_path = pop_logging_options(args)
+        configure_logging(level, events_path)
+        if args and args[0] == "--help":
+            show_help()
+        elif args and args[0] == "--profile":
+            main(profile_dir=args[1] if len(args) > 1 else "profile")
+        else:
+            main()
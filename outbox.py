@@ -0,0 +1,216 @@
+"""
+ChessSudoku 업로드 아웃박스 모듈
+
+생성한 퍼즐 페이로드를 먼저 로컬 SQLite 파일에 기록하고, 나중에 drain()으로
+서버에 업로드합니다. 서버가 내려가 있어도 생성한 퍼즐을 잃지 않고,
+프로그램이 중간에 종료되어도 다음 drain()에서 이어서 업로드합니다.
+
+- 서버가 성공을 확인한 항목만 'sent'로 표시하므로 최소 한 번(at-least-once) 전송됩니다.
+- 항목마다 idempotency_key를 페이로드와 Idempotency-Key 헤더로 보내서
+  서버가 중복 전송을 구분할 수 있게 합니다.
+
+사용법:
+    python outbox.py [outbox 파일 경로]
+"""
+import json
+import sqlite3
+import time
+import uuid
+from puzzle_api_client import PuzzleAPIClient
+from log_setup import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+DEFAULT_OUTBOX_PATH = "outbox.sqlite3"
+
+class UploadOutbox:
+    """SQLite 기반 업로드 대기열"""
+
+    # 상태값
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'  # 서버가 최대 시도 횟수만큼 거절해서 더 이상 자동으로 재시도하지 않음
+
+    DEFAULT_MAX_ATTEMPTS = 10
+    TRANSIENT_STATUS = (408, 425, 429)  # 4xx지만 나중에 다시 보내면 될 수 있는 응답
+
+    @classmethod
+    def is_rejection(cls, result):
+        """업로드 결과가 서버의 확정적인 거절인지 확인
+
+        연결 실패/시간 초과(상태 코드 없음), 5xx, 408/425/429, 퍼즐별 결과를 알 수 없는
+        일괄 응답은 일시적인 실패로 보고, 4xx 응답과 일괄 응답에서 success=False로
+        명시된 퍼즐만 거절로 봅니다.
+        """
+        status_code = result['status_code']
+        if status_code is None or status_code >= 500 or status_code in cls.TRANSIENT_STATUS:
+            return False
+        if status_code < 400:
+            data = result.get('data')
+            return isinstance(data, dict) and data.get('success') is False
+        return True
+
+    def __init__(self, path=DEFAULT_OUTBOX_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                puzzle_id TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, id)"
+        )
+        self.connection.commit()
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def enqueue(self, payload, idempotency_key=None):
+        """페이로드를 대기열에 추가하고 디스크에 기록
+
+        Args:
+            payload (dict): PuzzleDataFormatter.create_puzzle_payload로 만든 페이로드
+            idempotency_key (str, optional): 중복 전송 구분 키 (없으면 새로 생성)
+
+        Returns:
+            str: 항목의 idempotency_key
+        """
+        key = idempotency_key or uuid.uuid4().hex
+        payload = dict(payload, idempotency_key=key)
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload, separators=(',', ':')), now, now)
+            )
+        return key
+
+    def pending(self, limit=100, after_id=0):
+        """업로드를 기다리는 항목들을 오래된 순서로 반환 (after_id보다 뒤의 항목만)"""
+        return self.connection.execute(
+            "SELECT id, idempotency_key, payload, attempts FROM outbox "
+            "WHERE status = ? AND id > ? ORDER BY id LIMIT ?",
+            (self.PENDING, after_id, limit)
+        ).fetchall()
+
+    def get(self, idempotency_key):
+        """idempotency_key로 항목 조회 (없으면 None)"""
+        return self.connection.execute(
+            "SELECT * FROM outbox WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone()
+
+    def counts(self):
+        """상태별 항목 개수 반환"""
+        rows = self.connection.execute(
+            "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+        ).fetchall()
+        counts = {self.PENDING: 0, self.SENT: 0, self.FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def retry_failed(self):
+        """'failed' 상태 항목들을 다시 대기 상태로 되돌림"""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, updated_at = ? WHERE status = ?",
+                (self.PENDING, time.time(), self.FAILED)
+            )
+
+    def drain(self, api_client=None, batch_size=None, max_attempts=None):
+        """대기 중인 항목들을 서버에 업로드
+
+        한 번에 batch_size개씩 PuzzleAPIClient.upload_puzzles로 보내고, 결과를 바로
+        기록합니다. 실패한 항목은 대기 상태로 남아 다음 drain()에서 다시 보냅니다.
+        서버가 거절한 항목(is_rejection)만 시도 횟수를 세고 max_attempts번 거절되면 'failed'로
+        바꾸며, 연결 실패나 5xx 같은 일시적인 실패는 세지 않으므로 서버 장애가 길어져도
+        항목이 'failed'가 되지 않습니다. 한 묶음이 전부 일시적으로 실패하면(서버 장애 등)
+        남은 항목도 다음 drain()으로 미룹니다.
+
+        Returns:
+            dict: 이번 drain에서 업로드한 개수(uploaded), 실패한 개수(errors),
+                상태별 남은 항목 개수(counts)
+        """
+        api_client = api_client or PuzzleAPIClient()
+        batch_size = batch_size or api_client.DEFAULT_BATCH_SIZE
+        max_attempts = max_attempts or self.DEFAULT_MAX_ATTEMPTS
+        uploaded = errors = 0
+        last_id = 0
+
+        while True:
+            rows = self.pending(batch_size, after_id=last_id)
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            payloads = [json.loads(row['payload']) for row in rows]
+            results, _ = api_client.upload_puzzles(payloads, batch_size=batch_size)
+            results_by_index = {result['index']: result for result in results}
+
+            round_sent = round_rejected = 0
+            now = time.time()
+            with self.connection:
+                for position, row in enumerate(rows):
+                    result = results_by_index.get(position)
+                    if result and result['success']:
+                        round_sent += 1
+                        puzzle_id = result.get('puzzle_id')
+                        self.connection.execute(
+                            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, "
+                            "puzzle_id = ?, updated_at = ? WHERE id = ?",
+                            (self.SENT, None if puzzle_id is None else str(puzzle_id), now, row['id'])
+                        )
+                    elif result and self.is_rejection(result):
+                        errors += 1
+                        round_rejected += 1
+                        status = self.FAILED if row['attempts'] + 1 >= max_attempts else self.PENDING
+                        self.connection.execute(
+                            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ?, "
+                            "updated_at = ? WHERE id = ?",
+                            (status, str(result['error']), now, row['id'])
+                        )
+                    else:
+                        errors += 1
+                        error = result['error'] if result else "결과 없음"
+                        self.connection.execute(
+                            "UPDATE outbox SET last_error = ?, updated_at = ? WHERE id = ?",
+                            (str(error), now, row['id'])
+                        )
+
+            uploaded += round_sent
+            if round_sent == 0 and round_rejected == 0:
+                break  # 묶음 전체가 일시적으로 실패하면 서버 장애로 보고 다음 drain으로 미룸
+
+        counts = self.counts()
+        logger.info("아웃박스 전송: 성공 %d개, 실패 %d개, 대기 %d개", uploaded, errors, counts[self.PENDING])
+        return {'uploaded': uploaded, 'errors': errors, 'counts': counts}
+
+def drain(path=DEFAULT_OUTBOX_PATH, server_url=None, batch_size=None):
+    """아웃박스 파일의 대기 항목들을 업로드 (중단된 업로드 재개용 진입점)"""
+    with UploadOutbox(path) as outbox:
+        return outbox.drain(PuzzleAPIClient(server_url), batch_size=batch_size)
+
+if __name__ == "__main__":
+    import sys
+
+    configure_logging()
+    drain(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTBOX_PATH)
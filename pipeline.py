@@ -0,0 +1,361 @@
+"""
+ChessSudoku 퍼즐 생성 파이프라인 모듈
+
+기물 배치 -> 보드 채우기 -> 빈칸 조각 과정을 출력 없이 실행하고,
+결과를 퍼즐 레코드(dict)로 하나씩 돌려줍니다.
+
+    for record in iter_puzzles(count=10, difficulty='hard', seed=1234):
+        upload(record)
+
+각 레코드는 record['seed'], record['piece_counts'], record['max_holes'], record['target_difficulty'],
+record['beam_width']만으로 main(seed=..., piece_counts=..., max_holes=..., custom_difficulty=...,
+beam_width=...)에서 그대로 재현됩니다.
+
+record['difficulty']는 검증 풀이의 기법 사용 프로필로 평가한 난이도입니다 (difficulty 모듈).
+난이도를 지정하면 조각이 그 난이도를 넘지 않도록 멈추고, 그래도 난이도가 다른
+레코드(빈칸을 충분히 뚫지 못한 경우 등)는 iter_puzzles가 건너뜁니다.
+
+iter_puzzles_parallel은 같은 시드로 같은 퍼즐들을 여러 프로세스에서 생성합니다.
+
+carve_priors 파일을 지정하면 조각 후보를 AdaptiveCarveSelector로 고르고 학습한 통계를
+생성이 끝날 때 다시 저장합니다. 이때는 퍼즐이 통계에 따라 달라지므로 시드만으로 재현되지 않습니다.
+"""
+import copy
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from board_generator import BoardGenerator
+from random_placer import RandomPiecePlacer
+from puzzle_generator import PuzzleGenerator
+from logical_solver import LogicalSolver
+from puzzle_api_client import DifficultyManager
+from constraint_graph import ConstraintGraph, COORDS
+from seeding import make_rng, new_seed, derive_seed
+from search_stats import SearchStats
+from profiling import StageProfiler
+from carve_selector import AdaptiveCarveSelector
+from difficulty import difficulty_rank
+from beam_carve import DEFAULT_BEAM_WIDTH
+from log_setup import get_logger, init_worker_logging, worker_logging_args
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_HOLES = 45
+RECARVE_ATTEMPTS = 2    # 목표 난이도와 다르게 평가된 완성 보드를 다른 난수로 다시 조각해 보는 횟수
+DEFAULT_MAX_MISSES = 50  # iter_puzzles가 목표 난이도 퍼즐을 연속으로 만들지 못하면 멈추는 횟수
+
+def generate_puzzle_record(seed, piece_counts=None, max_holes=DEFAULT_MAX_HOLES, min_holes=10, difficulty=None,
+                           stats=None, profiler=None, carve_selector=None, beam_width=None):
+    """시드 하나로 퍼즐 한 개 생성
+
+    Args:
+        seed (int): 퍼즐 시드
+        piece_counts (dict, optional): 기물 타입별 개수 (없으면 기본 구성)
+        max_holes (int): 최대 빈칸 개수
+        min_holes (int): 최소 빈칸 개수
+        difficulty (str, optional): 목표 난이도 (조각이 이 난이도에 맞도록 더 조각하거나 멈추고,
+            그래도 다르게 평가되면 같은 완성 보드를 derive_seed(seed, 'recarve', n)의 난수와
+            빔 탐색으로 RECARVE_ATTEMPTS번까지 다시 조각해서 가장 가까운 결과를 씀 -
+            한 칸씩 조각하면 더 조각할 칸이 없어져서 목표에 못 미치는 배치가 많음).
+            레코드의 'difficulty'는 지정 여부와 상관없이 평가한 난이도
+        stats (SearchStats, optional): 탐색 통계 수집기. 있으면 이 퍼즐의 통계를 더하고
+            레코드의 'search_stats'에도 이 퍼즐의 통계(dict)를 넣음
+        profiler (StageProfiler, optional): 단계별 프로파일러 (placement, fill, carve 단계로 측정)
+        carve_selector (AdaptiveCarveSelector, optional): 조각 후보 선택기 (이 퍼즐의 결과도 학습)
+        beam_width (int, optional): 있으면 빔 탐색으로 조각 (PuzzleGenerator.generate_puzzle 참고)
+
+    Returns:
+        dict: 퍼즐 레코드, 보드를 채우지 못하면 None
+    """
+    record_stats = SearchStats() if stats is not None else None
+    profiler = profiler or StageProfiler()
+    rng = make_rng(seed)
+    started = time.perf_counter()
+
+    # 1. 기물 배치
+    board = Board()
+    random_placer = RandomPiecePlacer(board, rng)
+    with profiler.stage("placement"):
+        placed_count = random_placer.place_pieces_randomly(piece_counts)
+    pieces = random_placer.get_pieces()
+    placed = time.perf_counter()
+
+    # 2. 완전한 보드 생성
+    constraint_graph = ConstraintGraph.from_pieces(pieces)
+    board_generator = BoardGenerator(board, pieces, constraint_graph, rng, record_stats)
+    with profiler.stage("fill"):
+        success = board_generator.generate_complete_board()
+    filled = time.perf_counter()
+    if record_stats is not None:
+        record_stats.add_time('place', placed - started)
+        record_stats.add_time('fill', filled - placed)
+    if not success:
+        if stats is not None:
+            stats.merge(record_stats)
+        return None
+
+    # 3. 빈칸 조각 (목표 난이도와 다르면 같은 완성 보드를 다시 조각)
+    carve_outcomes = {}
+    carve_passes = 0
+    puzzle_generator = None
+    with profiler.stage("carve"):
+        while carve_passes <= RECARVE_ATTEMPTS:
+            if carve_passes == 0:
+                carve_rng, carve_beam_width = rng, beam_width
+            else:
+                carve_rng = derive_seed(seed, 'recarve', carve_passes)
+                carve_beam_width = beam_width or DEFAULT_BEAM_WIDTH
+            candidate = PuzzleGenerator(board, pieces, constraint_graph, carve_rng, record_stats, carve_selector)
+            candidate.generate_puzzle(max_holes=max_holes, min_holes=min_holes,
+                                      target_difficulty=difficulty, beam_width=carve_beam_width)
+            carve_passes += 1
+            for arm, (accepts, rejects) in candidate.carve_outcomes.items():
+                outcome = carve_outcomes.setdefault(arm, [0, 0])
+                outcome[0] += accepts
+                outcome[1] += rejects
+            if (puzzle_generator is None or
+                    _rank_distance(candidate, difficulty) < _rank_distance(puzzle_generator, difficulty)):
+                puzzle_generator = candidate
+            if difficulty is None or _rank_distance(puzzle_generator, difficulty) == 0:
+                break
+    puzzle_board = puzzle_generator.puzzle_board
+    carved = time.perf_counter()
+
+    info = puzzle_generator.get_puzzle_info()
+    info['carve_outcomes'] = carve_outcomes
+    record = {
+        'seed': seed,
+        'piece_counts': piece_counts,
+        'max_holes': max_holes,
+        'puzzle': puzzle_board,
+        'answer': board,
+        'pieces': pieces,
+        'difficulty': info['difficulty'],
+        'target_difficulty': difficulty,
+        'beam_width': beam_width,
+        'info': info,
+        'stats': {
+            'placed_pieces': placed_count,
+            'holes_count': info['holes_count'],
+            'place_time': placed - started,
+            'fill_time': filled - placed,
+            'carve_time': carved - filled,
+            'carve_passes': carve_passes,
+            'total_time': carved - started,
+        },
+    }
+    if record_stats is not None:
+        record_stats.add_time('carve', carved - filled)
+        stats.merge(record_stats)
+        record['search_stats'] = record_stats.as_dict()
+    return record
+
+def _rank_distance(puzzle_generator, difficulty):
+    """조각한 퍼즐의 난이도 순위가 목표 난이도 순위와 얼마나 떨어졌는지"""
+    return abs(difficulty_rank(puzzle_generator.get_puzzle_difficulty()) - difficulty_rank(difficulty))
+
+def verify_record(record):
+    """퍼즐 레코드가 올바른지 검사
+
+    - 정답 보드가 모두 채워져 있고 보드 생성 규칙(ConstraintGraph.fill_peers)을 만족하는지
+    - 퍼즐의 힌트 칸과 기물이 정답과 같은지
+    - 퍼즐을 논리적 기법만으로 풀면 정답과 같아지는지
+
+    Returns:
+        tuple: (통과 여부, 실패 이유 또는 None)
+    """
+    puzzle, answer, pieces = record['puzzle'], record['answer'], record['pieces']
+    constraint_graph = ConstraintGraph.from_pieces(pieces)
+    answer_grid = answer.board
+    puzzle_grid = puzzle.board
+
+    holes = 0
+    for index, (row, col) in enumerate(COORDS):
+        value = answer_grid[row][col]
+        if index in constraint_graph.piece_cells:
+            if puzzle_grid[row][col] != value:
+                return False, f"기물 위치가 정답과 다릅니다: ({row}, {col})"
+            continue
+        if not isinstance(value, int) or not 1 <= value <= 9:
+            return False, f"정답 보드가 채워지지 않았습니다: ({row}, {col})"
+        for peer in constraint_graph.fill_peers[index]:
+            if answer_grid[peer // 9][peer % 9] == value:
+                return False, f"정답 보드가 규칙을 위반합니다: ({row}, {col})"
+        if puzzle_grid[row][col] is None:
+            holes += 1
+        elif puzzle_grid[row][col] != value:
+            return False, f"힌트가 정답과 다릅니다: ({row}, {col})"
+
+    if holes != record['info']['holes_count']:
+        return False, f"빈칸 개수가 다릅니다: {holes} != {record['info']['holes_count']}"
+
+    solver = LogicalSolver(copy.deepcopy(puzzle), pieces, constraint_graph)
+    if not solver.solve_logically() or solver.board.board != answer_grid:
+        return False, "논리적 기법으로 정답까지 풀 수 없습니다"
+    return True, None
+
+def matches_difficulty(record, difficulty=None):
+    """레코드가 있고 평가한 난이도가 목표 난이도(없으면 아무 난이도)와 같은지 확인"""
+    return record is not None and (difficulty is None or record['difficulty'] == difficulty)
+
+class _MissCounter:
+    """iter_puzzles의 건너뛴 배치 수를 세고 연속으로 max_misses번 건너뛰면 멈추게 함"""
+
+    def __init__(self, difficulty, max_misses):
+        self.difficulty = difficulty
+        self.max_misses = max_misses
+        self.produced = 0
+        self.failed = 0       # 보드를 채우지 못한 배치
+        self.mismatched = 0   # 목표 난이도와 다르게 평가된 배치
+        self.streak = 0
+
+    @property
+    def exhausted(self):
+        return self.streak >= self.max_misses
+
+    def accept(self, record):
+        """레코드를 내보낼지 결정 (건너뛰면 세고 False)"""
+        if matches_difficulty(record, self.difficulty):
+            self.produced += 1
+            self.streak = 0
+            return True
+        if record is None:
+            self.failed += 1
+        else:
+            self.mismatched += 1
+            logger.debug("목표 난이도 %s가 아닌 퍼즐을 건너뜁니다 (시드 %s, %s)",
+                         self.difficulty, record['seed'], record['difficulty'])
+        self.streak += 1
+        if self.exhausted:
+            logger.warning("퍼즐을 %d번 연속 만들지 못해 생성을 멈춥니다 (목표 난이도 %s, %d개 생성)",
+                           self.streak, self.difficulty or "없음", self.produced)
+        return False
+
+    def report(self):
+        """건너뛴 배치 수 기록"""
+        if self.failed or self.mismatched:
+            logger.info("건너뛴 배치: 보드 채우기 실패 %d개, 난이도 불일치 %d개 (생성 %d개)",
+                        self.failed, self.mismatched, self.produced)
+
+def iter_puzzles(count=None, difficulty=None, piece_counts=None, seed=None, max_holes=None, min_holes=10,
+                 collect_stats=False, profiler=None, carve_priors=None, beam_width=None,
+                 max_misses=DEFAULT_MAX_MISSES):
+    """퍼즐 레코드를 하나씩 생성하는 제너레이터
+
+    Args:
+        count (int, optional): 생성할 퍼즐 개수 (None이면 무한히 생성)
+        difficulty (str, optional): 목표 난이도 (DifficultyManager의 최대 빈칸 개수를 쓰고,
+            평가한 난이도가 다른 레코드는 건너뜀)
+        piece_counts (dict, optional): 기물 타입별 개수
+        seed (int, optional): 배치 시드 (None이면 새로 생성). i번째 퍼즐은
+            derive_seed(seed, i)를 시드로 사용
+        max_holes (int, optional): 최대 빈칸 개수 (difficulty보다 우선)
+        min_holes (int): 최소 빈칸 개수
+        collect_stats (bool): 레코드마다 'search_stats'(SearchStats.as_dict())를 넣을지 여부
+        profiler (StageProfiler, optional): 모든 퍼즐의 단계별 프로파일을 누적할 프로파일러
+        carve_priors (str, optional): 적응형 조각 후보 선택 통계 파일 (읽어서 쓰고, 끝나면 저장)
+        beam_width (int, optional): 있으면 빔 탐색으로 조각 (빈칸이 많은 expert 목표용)
+        max_misses (int): 보드를 채우지 못했거나 목표 난이도가 아닌 배치가 이만큼 연속되면
+            경고를 남기고 생성을 멈춤 (count보다 적게 나올 수 있음)
+
+    Yields:
+        dict: generate_puzzle_record의 퍼즐 레코드
+    """
+    if seed is None:
+        seed = new_seed()
+    if max_holes is None:
+        max_holes = DifficultyManager.get_max_holes(difficulty) if difficulty else DEFAULT_MAX_HOLES
+    selector = AdaptiveCarveSelector.load(carve_priors) if carve_priors else None
+
+    misses = _MissCounter(difficulty, max_misses)
+    try:
+        for index in itertools.count():
+            if count is not None and misses.produced >= count:
+                return
+
+            record = generate_puzzle_record(derive_seed(seed, index), piece_counts, max_holes, min_holes,
+                                            difficulty, SearchStats() if collect_stats else None, profiler,
+                                            selector, beam_width)
+            if not misses.accept(record):
+                if misses.exhausted:
+                    return
+                continue  # 보드를 채우지 못했거나 목표 난이도가 아닌 배치는 건너뜀
+            yield record
+    finally:
+        misses.report()
+        if selector is not None:
+            selector.save(carve_priors)
+
+def _generate_indexed(task):
+    """프로세스 풀 작업 단위: (시드, 기물 구성, 최대 빈칸, 최소 빈칸, 난이도, 통계 수집 여부,
+    조각 선택 통계 또는 None, 빔 폭)으로 퍼즐 생성"""
+    *arguments, collect_stats, priors, beam_width = task
+    selector = AdaptiveCarveSelector(priors) if priors is not None else None
+    return generate_puzzle_record(*arguments, stats=SearchStats() if collect_stats else None,
+                                  carve_selector=selector, beam_width=beam_width)
+
+def iter_puzzles_parallel(count=None, workers=None, difficulty=None, piece_counts=None, seed=None,
+                          max_holes=None, min_holes=10, collect_stats=False, profiler=None, carve_priors=None,
+                          beam_width=None, max_misses=DEFAULT_MAX_MISSES):
+    """iter_puzzles와 같은 퍼즐들을 여러 프로세스에서 생성하는 제너레이터
+
+    i번째 작업은 derive_seed(seed, i)를 시드로 쓰고 결과는 작업 순서대로 내보내므로,
+    같은 seed면 workers 수와 상관없이 iter_puzzles와 같은 레코드들이 같은 순서로 나옵니다.
+    한 번에 workers * 4개까지만 미리 제출해서 메모리 사용량을 일정하게 유지합니다.
+    carve_priors가 있으면 작업마다 제출 시점의 통계를 넘기고, 작업자가 돌려준 팔별 결과
+    (info['carve_outcomes'])를 현재 프로세스의 통계에 합쳐서 저장합니다.
+
+    Args:
+        workers (int, optional): 프로세스 개수 (없으면 CPU 개수, 1이면 현재 프로세스에서 생성)
+        profiler (StageProfiler, optional): 있으면 현재 프로세스에서만 측정할 수 있으므로 workers를 1로 사용
+        나머지: iter_puzzles와 동일
+
+    Yields:
+        dict: generate_puzzle_record의 퍼즐 레코드
+    """
+    workers = workers or os.cpu_count() or 1
+    if profiler is not None and profiler.enabled:
+        workers = 1
+    if workers == 1:
+        yield from iter_puzzles(count, difficulty, piece_counts, seed, max_holes, min_holes,
+                                collect_stats, profiler, carve_priors, beam_width, max_misses)
+        return
+
+    if seed is None:
+        seed = new_seed()
+    if max_holes is None:
+        max_holes = DifficultyManager.get_max_holes(difficulty) if difficulty else DEFAULT_MAX_HOLES
+    selector = AdaptiveCarveSelector.load(carve_priors) if carve_priors else None
+
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_logging,
+                             initargs=worker_logging_args()) as executor:
+        futures = deque()
+        indexes = itertools.count()
+        misses = _MissCounter(difficulty, max_misses)
+        try:
+            while count is None or misses.produced < count:
+                # 남은 개수만큼 (실패할 배치를 감안해 window까지) 미리 제출
+                while len(futures) < window and (count is None or
+                                                 misses.produced + len(futures) < count + workers):
+                    task = (derive_seed(seed, next(indexes)), piece_counts, max_holes, min_holes, difficulty,
+                            collect_stats, selector.snapshot() if selector is not None else None, beam_width)
+                    futures.append(executor.submit(_generate_indexed, task))
+
+                record = futures.popleft().result()
+                if selector is not None and record is not None:
+                    selector.merge(record['info']['carve_outcomes'])
+                if not misses.accept(record):
+                    if misses.exhausted:
+                        return
+                    continue  # 보드를 채우지 못했거나 목표 난이도가 아닌 배치는 건너뜀
+                yield record
+        finally:
+            misses.report()
+            for future in futures:
+                future.cancel()
+            if selector is not None:
+                selector.save(carve_priors)
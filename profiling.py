@@ -0,0 +1,128 @@
+"""
+ChessSudoku 단계별 프로파일링 모듈
+
+기물 배치, 보드 채우기, 빈칸 조각, 힌트, 업로드 단계를 각각 cProfile로 측정하고,
+동시에 샘플링 스레드로 호출 스택을 모아 flamegraph 도구가 읽는 collapsed 형식으로 저장합니다.
+
+    profiler = StageProfiler("profile")
+    with profiler.stage("fill"):
+        board_generator.generate_complete_board()
+    profiler.close()
+
+결과 파일:
+    <디렉터리>/<단계>.pstats    - python -m pstats, snakeviz 등으로 확인
+    <디렉터리>/stacks.collapsed - 'stage;파일:함수;... 샘플수' 형식
+                                  (flamegraph.pl, speedscope 등에서 사용)
+
+out_dir 없이 만든 StageProfiler는 아무것도 측정하지 않습니다.
+같은 단계를 여러 번 측정하면 결과가 누적됩니다.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_SAMPLE_INTERVAL = 0.001  # 샘플링 간격 (초)
+COLLAPSED_FILE = "stacks.collapsed"
+
+class StackSampler:
+    """한 스레드의 호출 스택을 주기적으로 기록하는 샘플러"""
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = {}  # (단계, 프레임...) 튜플 -> 샘플 수
+        self._stop = None
+        self._thread = None
+
+    def start(self, stage, thread_id=None):
+        """stage 이름으로 thread_id(기본: 현재 스레드)의 스택 샘플링 시작"""
+        thread_id = thread_id or threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(stage, thread_id, self._stop), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """샘플링 중지"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, stage, thread_id, stop):
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = (stage,) + tuple(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write_collapsed(self, path):
+        """collapsed 형식 파일로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+class StageProfiler:
+    """단계별 cProfile + 스택 샘플링"""
+
+    def __init__(self, out_dir=None, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self.out_dir = out_dir
+        self.enabled = out_dir is not None
+        self.profiles = {}       # 단계 이름 -> cProfile.Profile
+        self.stage_times = {}    # 단계 이름 -> 누적 소요 시간 (초)
+        self.sampler = StackSampler(sample_interval) if self.enabled else None
+        if self.enabled:
+            os.makedirs(out_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록을 name 단계로 측정 (비활성화 상태면 그대로 실행)"""
+        if not self.enabled:
+            yield
+            return
+
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+
+        self.sampler.start(name)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + time.perf_counter() - started
+            self.sampler.stop()
+
+    def close(self):
+        """측정 결과를 파일로 저장하고 저장한 파일 경로 리스트 반환"""
+        if not self.enabled:
+            return []
+
+        paths = []
+        for name, profile in self.profiles.items():
+            path = os.path.join(self.out_dir, f"{name}.pstats")
+            profile.dump_stats(path)
+            paths.append(path)
+
+        collapsed_path = os.path.join(self.out_dir, COLLAPSED_FILE)
+        self.sampler.write_collapsed(collapsed_path)
+        paths.append(collapsed_path)
+        return paths
+
+    def print_summary(self):
+        """단계별 소요 시간 출력"""
+        if not self.enabled:
+            return
+        print(f"\n프로파일 결과 ({self.out_dir}):")
+        for name, seconds in self.stage_times.items():
+            print(f"  {name:<10}{seconds * 1000:>10.1f}ms  -> {name}.pstats")
+        print(f"  호출 스택 샘플: {COLLAPSED_FILE}")
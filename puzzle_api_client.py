@@ -1,19 +1,34 @@
+import gzip
 import json
+import math
+import threading
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from board import Board
 from validators import Piece
 from config import config
+from puzzle_codec import encode_board, decode_board
+from logical_solver import PATH_TECHNIQUES
+from difficulty import rate_holes, rate_profile
+from log_setup import get_logger
+
+logger = get_logger(__name__)
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
-    print("경고: requests 모듈이 설치되지 않았습니다.")
+    logger.warning("경고: requests 모듈이 설치되지 않았습니다.")
 
 class PuzzleDataFormatter:
     """퍼즐 데이터를 API 형식으로 변환하는 클래스"""
     
+    COMPACT_FORMAT = "compact-v1"  # create_compact_payload 형식 식별자
+    
     @staticmethod
     def piece_type_to_name(piece_type):
         """체스 기물 타입을 이름으로 변환"""
@@ -59,8 +74,34 @@ class PuzzleDataFormatter:
         return api_pieces
     
     @staticmethod
-    def create_puzzle_payload(puzzle_board, answer_board, pieces, difficulty="medium", puzzle_type="normal", daily_date=None):
-        """퍼즐 생성 API 요청 페이로드 생성"""
+    def solution_path_to_api_format(solution_path):
+        """풀이 경로를 API 형식으로 변환
+        
+        Returns:
+            dict: {"techniques": 기법 이름들, "steps": [[row, col, 숫자, 기법 코드, 반복 번호], ...]}
+                기법 코드는 techniques의 인덱스
+        """
+        return {
+            "techniques": list(PATH_TECHNIQUES),
+            "steps": [[row, col, number, PATH_TECHNIQUES.index(technique), iteration]
+                      for row, col, number, technique, iteration in solution_path]
+        }
+    
+    @staticmethod
+    def solution_path_from_api_format(data):
+        """API 형식의 풀이 경로를 (row, col, 숫자, 기법, 반복 번호) 튜플 리스트로 복원"""
+        techniques = data["techniques"]
+        return [(row, col, number, techniques[code], iteration)
+                for row, col, number, code, iteration in data["steps"]]
+    
+    @staticmethod
+    def create_puzzle_payload(puzzle_board, answer_board, pieces, difficulty="medium", puzzle_type="normal", daily_date=None,
+                              solution_path=None):
+        """퍼즐 생성 API 요청 페이로드 생성
+        
+        solution_path(PuzzleGenerator.get_puzzle_info()['solution_path'])를 주면
+        "solution_path" 필드로 함께 보내서 서버가 다시 풀지 않고 힌트/풀이 재생에 쓸 수 있습니다.
+        """
         payload = {
             "puzzle_type": puzzle_type,
             "difficulty": difficulty,
@@ -76,38 +117,113 @@ class PuzzleDataFormatter:
         # 데일리 퍼즐인 경우 날짜 추가
         if daily_date:
             payload["daily_date"] = daily_date
+        if solution_path is not None:
+            payload["solution_path"] = PuzzleDataFormatter.solution_path_to_api_format(solution_path)
+            
+        return payload
+    
+    @staticmethod
+    def create_compact_payload(puzzle_board, answer_board, pieces, difficulty="medium", puzzle_type="normal", daily_date=None,
+                               solution_path=None):
+        """압축 형식의 퍼즐 페이로드 생성
+        
+        보드는 81글자 문자열(puzzle_codec.encode_board)로 보내고 기물은 보드 안에 글자로 포함합니다.
+        기물 위치를 0으로 지우지 않으므로 decode_compact_payload로 보드와 기물을 모두 복원할 수 있습니다.
+        """
+        payload = {
+            "format": PuzzleDataFormatter.COMPACT_FORMAT,
+            "puzzle_type": puzzle_type,
+            "difficulty": difficulty,
+            "puzzle": encode_board(puzzle_board, pieces),
+            "answer": encode_board(answer_board, pieces)
+        }
+        
+        # 데일리 퍼즐인 경우 날짜 추가
+        if daily_date:
+            payload["daily_date"] = daily_date
+        if solution_path is not None:
+            payload["solution_path"] = PuzzleDataFormatter.solution_path_to_api_format(solution_path)
             
         return payload
+    
+    @staticmethod
+    def decode_compact_payload(payload):
+        """압축 형식 페이로드를 Board와 기물 리스트로 복원
+        
+        Returns:
+            dict: puzzle_board, answer_board, pieces, difficulty, puzzle_type, daily_date,
+                solution_path (페이로드에 없으면 None)
+        """
+        if payload.get("format") != PuzzleDataFormatter.COMPACT_FORMAT:
+            raise ValueError(f"지원하지 않는 페이로드 형식: {payload.get('format')}")
+        
+        puzzle_board, pieces = decode_board(payload["puzzle"])
+        answer_board, _ = decode_board(payload["answer"])
+        return {
+            "puzzle_board": puzzle_board,
+            "answer_board": answer_board,
+            "pieces": pieces,
+            "difficulty": payload.get("difficulty"),
+            "puzzle_type": payload.get("puzzle_type"),
+            "daily_date": payload.get("daily_date"),
+            "solution_path": (PuzzleDataFormatter.solution_path_from_api_format(payload["solution_path"])
+                              if "solution_path" in payload else None)
+        }
+    
+    @staticmethod
+    def create_record_payload(record, puzzle_type="normal", daily_date=None, include_solution_path=False):
+        """pipeline.iter_puzzles의 퍼즐 레코드로 API 페이로드 생성 (include_solution_path면 풀이 경로 포함)"""
+        return PuzzleDataFormatter.create_puzzle_payload(
+            record['puzzle'], record['answer'], record['pieces'],
+            record['difficulty'], puzzle_type, daily_date,
+            record['info']['solution_path'] if include_solution_path else None
+        )
 
 class PuzzleAPIClient:
     """퍼즐 서버와 통신하는 API 클라이언트"""
     
-    def __init__(self, base_url=None):
-        # base_url이 제공되지 않으면 설정에서 가져오기
-        self.base_url = base_url if base_url is not None else config.get_server_url()
+    # 동시 업로드 기본 설정
+    DEFAULT_MAX_WORKERS = 8      # 동시에 보내는 최대 요청 수
+    DEFAULT_MAX_RETRIES = 3      # 시간 초과, 연결 오류, 5xx 응답 시 재시도 횟수
+    DEFAULT_BACKOFF = 0.5        # 재시도 대기 시간 기준값 (초, 재시도마다 2배)
+    DEFAULT_BATCH_SIZE = 100     # 일괄 업로드 요청 하나에 담는 퍼즐 수
+    
+    BATCH_PATH = "/api/puzzles/batch"
+    BATCH_UNSUPPORTED_STATUS = (404, 405, 501)  # 서버가 일괄 업로드를 지원하지 않는 경우
+    
+    def __init__(self, base_url=None, max_workers=None, settings=None):
+        # settings(Config)가 없으면 모듈 전역 설정 사용, base_url이 제공되지 않으면 설정에서 가져오기
+        self.settings = settings or config
+        self.base_url = base_url if base_url is not None else self.settings.get_server_url()
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.batch_supported = None  # 첫 일괄 요청 후 결정 (None: 아직 모름)
         if REQUESTS_AVAILABLE:
             self.session = requests.Session()
+            # 동시 요청 수만큼 연결을 재사용할 수 있도록 연결 풀 크기 설정
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
         else:
             self.session = None
         
     def upload_puzzle(self, puzzle_board, answer_board, pieces, difficulty="medium", puzzle_type="normal", daily_date=None):
         """퍼즐을 서버에 업로드"""
         if not REQUESTS_AVAILABLE:
-            print("❌ requests 모듈이 없어 서버 전송을 할 수 없습니다.")
-            print("데이터 포맷팅만 테스트합니다...")
+            logger.warning("❌ requests 모듈이 없어 서버 전송을 할 수 없습니다.")
+            logger.info("데이터 포맷팅만 테스트합니다...")
             
             # 데이터 포맷팅 테스트
             payload = PuzzleDataFormatter.create_puzzle_payload(
                 puzzle_board, answer_board, pieces, difficulty, puzzle_type, daily_date
             )
             
-            print("✅ 데이터 포맷팅 성공!")
-            print(f"페이로드 크기: {len(json.dumps(payload))} bytes")
-            print(f"기물 개수: {len(pieces)}개")
-            print(f"난이도: {difficulty}")
-            print(f"퍼즐 타입: {puzzle_type}")
+            logger.info("✅ 데이터 포맷팅 성공!")
+            logger.info("페이로드 크기: %d bytes", len(json.dumps(payload)))
+            logger.info("기물 개수: %d개", len(pieces))
+            logger.info("난이도: %s", difficulty)
+            logger.info("퍼즐 타입: %s", puzzle_type)
             if daily_date:
-                print(f"데일리 날짜: {daily_date}")
+                logger.info("데일리 날짜: %s", daily_date)
             
             return False, None
         
@@ -123,41 +239,255 @@ class PuzzleAPIClient:
                 "Content-Type": "application/json"
             }
             
-            print(f"서버로 퍼즐 전송 중... ({url})")
-            print(f"난이도: {difficulty}, 타입: {puzzle_type}")
-            print(f"기물 개수: {len(pieces)}개")
+            logger.info("서버로 퍼즐 전송 중... (%s)", url)
+            logger.info("난이도: %s, 타입: %s", difficulty, puzzle_type)
+            logger.info("기물 개수: %d개", len(pieces))
             
-            response = self.session.post(url, json=payload, headers=headers, timeout=config.get_api_timeout())
+            response = self.session.post(url, json=payload, headers=headers, timeout=self.settings.get_api_timeout())
             
             if response.status_code == 201:
                 result = response.json()
                 puzzle_id = result.get("data", {}).get("puzzle_id")
-                print(f"✅ 퍼즐 업로드 성공! (ID: {puzzle_id})")
+                logger.info("✅ 퍼즐 업로드 성공! (ID: %s)", puzzle_id)
                 return True, result
             else:
-                print(f"❌ 퍼즐 업로드 실패: {response.status_code}")
+                logger.error("❌ 퍼즐 업로드 실패: %s", response.status_code)
                 try:
                     error_data = response.json()
-                    print(f"오류 메시지: {error_data.get('message', '알 수 없는 오류')}")
+                    logger.error("오류 메시지: %s", error_data.get('message', '알 수 없는 오류'))
                 except:
-                    print(f"응답 내용: {response.text}")
+                    logger.error("응답 내용: %s", response.text)
                 return False, None
                 
         except Exception as e:
             if REQUESTS_AVAILABLE and "ConnectionError" in str(type(e)):
-                print("❌ 서버 연결 실패: 서버가 실행 중인지 확인해주세요.")
+                logger.error("❌ 서버 연결 실패: 서버가 실행 중인지 확인해주세요.")
                 return False, None
             elif REQUESTS_AVAILABLE and "Timeout" in str(type(e)):
-                print("❌ 요청 시간 초과: 서버 응답이 너무 느립니다.")
+                logger.error("❌ 요청 시간 초과: 서버 응답이 너무 느립니다.")
                 return False, None
             else:
-                print(f"❌ 예상치 못한 오류: {str(e)}")
+                logger.error("❌ 예상치 못한 오류: %s", e)
                 return False, None
     
+    def post_payload_with_retries(self, payload, path="/api/puzzle", max_retries=None, backoff=None, headers=None, compress=False):
+        """페이로드를 전송하고 일시적인 오류는 지수 백오프로 재시도
+        
+        시간 초과, 연결 오류, 5xx 응답만 재시도하고 4xx 응답은 바로 실패로 처리합니다.
+        여러 스레드에서 동시에 호출할 수 있습니다 (출력 없음).
+        페이로드에 idempotency_key가 있으면 Idempotency-Key 헤더로도 보냅니다.
+        compress=True면 본문을 gzip으로 압축해서 보냅니다 (Content-Encoding: gzip).
+        
+        Returns:
+            dict: success, status_code, data, attempts, latency(초), error
+        """
+        max_retries = self.DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+        backoff = self.DEFAULT_BACKOFF if backoff is None else backoff
+        url = f"{self.base_url}{path}"
+        request_headers = {"Content-Type": "application/json"}
+        if isinstance(payload, dict) and payload.get("idempotency_key"):
+            request_headers["Idempotency-Key"] = payload["idempotency_key"]
+        if headers:
+            request_headers.update(headers)
+        
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        if compress:
+            body = gzip.compress(body)
+            request_headers["Content-Encoding"] = "gzip"
+        
+        result = {'success': False, 'status_code': None, 'data': None,
+                  'attempts': 0, 'latency': 0.0, 'error': None}
+        started = time.perf_counter()
+        
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                time.sleep(backoff * (2 ** (attempt - 1)))
+            result['attempts'] = attempt + 1
+            
+            try:
+                response = self.session.post(url, data=body, headers=request_headers,
+                                             timeout=self.settings.get_api_timeout())
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                result['error'] = type(e).__name__
+                continue
+            except requests.exceptions.RequestException as e:
+                result['error'] = str(e)
+                break
+            
+            result['status_code'] = response.status_code
+            try:
+                result['data'] = response.json()
+            except ValueError:
+                result['data'] = None
+            
+            if response.status_code in (200, 201):
+                result['success'] = True
+                result['error'] = None
+                break
+            
+            data = result['data'] if isinstance(result['data'], dict) else {}
+            result['error'] = data.get('message') or response.text[:200]
+            if response.status_code < 500:
+                break  # 요청 자체의 문제는 재시도해도 소용없음
+        
+        result['latency'] = time.perf_counter() - started
+        return result
+    
+    def upload_payloads_concurrently(self, payloads, max_workers=None, max_retries=None, backoff=None):
+        """여러 페이로드를 스레드 풀로 동시에 업로드
+        
+        입력은 한꺼번에 메모리에 올리지 않고 동시 요청 수의 2배까지만 미리 꺼냅니다.
+        
+        Args:
+            payloads (iterable): PuzzleDataFormatter.create_puzzle_payload로 만든 페이로드들
+            max_workers (int, optional): 동시 요청 수 (기본값: 클라이언트 설정)
+            max_retries (int, optional): 요청별 최대 재시도 횟수
+            backoff (float, optional): 재시도 대기 시간 기준값 (초)
+            
+        Returns:
+            tuple: (입력 순서대로의 결과 리스트, 지연 시간 통계 dict)
+        """
+        if not REQUESTS_AVAILABLE:
+            logger.warning("❌ requests 모듈이 없어 서버 전송을 할 수 없습니다.")
+            return [], summarize_upload_results([], 0.0)
+        
+        max_workers = max_workers or self.max_workers
+        results = {}
+        started = time.perf_counter()
+        
+        def collect(done_futures):
+            for future in done_futures:
+                index, payload_result = future.result()
+                results[index] = payload_result
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for index, payload in enumerate(payloads):
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(self._upload_indexed, index, payload, max_retries, backoff))
+            done, _ = wait(pending)
+            collect(done)
+        
+        ordered = [results[index] for index in sorted(results)]
+        metrics = summarize_upload_results(ordered, time.perf_counter() - started)
+        logger.info("동시 업로드 완료: 성공 %d개 / 실패 %d개 (%.2f초, p50 %.0fms, p99 %.0fms)",
+                    metrics['succeeded'], metrics['failed'], metrics['wall_time'],
+                    metrics['latency_p50'] * 1000, metrics['latency_p99'] * 1000)
+        return ordered, metrics
+    
+    def upload_puzzles(self, payloads, batch_size=None, max_workers=None, max_retries=None, backoff=None, compress=False):
+        """페이로드들을 묶어서 일괄 업로드 엔드포인트로 전송
+        
+        batch_size개씩 POST /api/puzzles/batch 요청 하나로 보냅니다.
+        서버가 일괄 업로드를 지원하지 않으면(404/405/501) 남은 퍼즐은
+        upload_payloads_concurrently로 하나씩 동시에 업로드합니다.
+        
+        일괄 요청 본문: {"puzzles": [페이로드, ...]}
+        기대하는 응답: {"data": {"results": [{"success": bool, "puzzle_id": ..., "message": ...}, ...]}}
+        
+        Args:
+            payloads (iterable): PuzzleDataFormatter.create_puzzle_payload로 만든 페이로드들
+            batch_size (int, optional): 요청 하나에 담을 퍼즐 수
+            max_workers, max_retries, backoff: upload_payloads_concurrently와 동일
+            compress (bool): 일괄 요청 본문을 gzip으로 압축할지 여부
+            
+        Returns:
+            tuple: (입력 순서대로의 퍼즐별 결과 리스트, 통계 dict)
+                실패한 항목은 결과의 'index'로 원래 페이로드를 찾아 다시 보낼 수 있습니다.
+        """
+        if not REQUESTS_AVAILABLE:
+            logger.warning("❌ requests 모듈이 없어 서버 전송을 할 수 없습니다.")
+            return [], summarize_upload_results([], 0.0)
+        
+        batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        results = []
+        started = time.perf_counter()
+        iterator = iter(payloads)
+        offset = 0
+        
+        while True:
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+            
+            if self.batch_supported is not False:
+                chunk_results = self._upload_batch(chunk, offset, max_retries, backoff, compress)
+            else:
+                chunk_results = None
+            
+            if chunk_results is None:
+                # 일괄 업로드 미지원 - 하나씩 동시에 업로드
+                chunk_results, _ = self.upload_payloads_concurrently(chunk, max_workers, max_retries, backoff)
+                for result in chunk_results:
+                    result['index'] += offset
+            
+            results.extend(chunk_results)
+            offset += len(chunk)
+        
+        metrics = summarize_upload_results(results, time.perf_counter() - started)
+        logger.info("일괄 업로드 완료: 성공 %d개 / 실패 %d개 (%.2f초)",
+                    metrics['succeeded'], metrics['failed'], metrics['wall_time'])
+        return results, metrics
+    
+    def _upload_batch(self, chunk, offset, max_retries, backoff, compress=False):
+        """페이로드 묶음 하나를 일괄 엔드포인트로 전송
+        
+        Returns:
+            list: 퍼즐별 결과, 서버가 일괄 업로드를 지원하지 않으면 None
+        """
+        response = self.post_payload_with_retries({"puzzles": chunk}, path=self.BATCH_PATH,
+                                                  max_retries=max_retries, backoff=backoff,
+                                                  compress=compress)
+        
+        if response['status_code'] in self.BATCH_UNSUPPORTED_STATUS:
+            self.batch_supported = False
+            return None
+        if response['status_code'] is not None:
+            self.batch_supported = True
+        
+        # 요청 단위의 지연 시간은 묶음 안의 퍼즐들에 똑같이 기록
+        data = response['data'] if isinstance(response['data'], dict) else {}
+        item_results = (data.get('data') or {}).get('results')
+        error = response['error']
+        if not isinstance(item_results, list) or len(item_results) != len(chunk):
+            # 퍼즐별 결과를 확인할 수 없으면 묶음 전체를 실패로 기록 (아웃박스가 항목을 지우지 않도록)
+            if response['success']:
+                error = "일괄 응답의 결과 목록이 없거나 퍼즐 수와 다릅니다."
+                logger.error("❌ %s (%d개 요청)", error, len(chunk))
+            item_results = [None] * len(chunk)
+        
+        results = []
+        for position, item in enumerate(item_results):
+            confirmed = isinstance(item, dict)
+            item = item if confirmed else {}
+            success = response['success'] and confirmed and item.get('success', True)
+            results.append({
+                'index': offset + position,
+                'success': success,
+                'status_code': response['status_code'],
+                'data': item,
+                'puzzle_id': item.get('puzzle_id') if success else None,
+                'attempts': response['attempts'],
+                'latency': response['latency'],
+                'error': None if success else (item.get('message') or error or
+                                               "일괄 응답의 퍼즐 결과를 읽을 수 없습니다."),
+            })
+        return results
+    
+    def _upload_indexed(self, index, payload, max_retries, backoff):
+        """스레드 풀 작업 단위: (입력 순서, 결과) 반환"""
+        result = self.post_payload_with_retries(payload, max_retries=max_retries, backoff=backoff)
+        data = result['data'] if isinstance(result['data'], dict) else {}
+        result['puzzle_id'] = (data.get('data') or {}).get('puzzle_id') if result['success'] else None
+        result['index'] = index
+        return index, result
+    
     def delete_puzzle(self, puzzle_id):
         """퍼즐을 서버에서 삭제"""
         if not REQUESTS_AVAILABLE:
-            print("❌ requests 모듈이 없어 서버 삭제 요청을 할 수 없습니다.")
+            logger.warning("❌ requests 모듈이 없어 서버 삭제 요청을 할 수 없습니다.")
             return False, None
         
         try:
@@ -167,42 +497,66 @@ class PuzzleAPIClient:
                 "Content-Type": "application/json"
             }
             
-            print(f"서버에서 퍼즐 삭제 중... ({url})")
-            print(f"퍼즐 ID: {puzzle_id}")
+            logger.info("서버에서 퍼즐 삭제 중... (%s)", url)
+            logger.info("퍼즐 ID: %s", puzzle_id)
             
-            response = self.session.delete(url, headers=headers, timeout=config.get_api_timeout())
+            response = self.session.delete(url, headers=headers, timeout=self.settings.get_api_timeout())
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"✅ 퍼즐 삭제 성공! (ID: {puzzle_id})")
+                logger.info("✅ 퍼즐 삭제 성공! (ID: %s)", puzzle_id)
                 return True, result
             elif response.status_code == 404:
-                print(f"❌ 퍼즐을 찾을 수 없습니다 (ID: {puzzle_id})")
+                logger.error("❌ 퍼즐을 찾을 수 없습니다 (ID: %s)", puzzle_id)
                 return False, None
             else:
-                print(f"❌ 퍼즐 삭제 실패: {response.status_code}")
+                logger.error("❌ 퍼즐 삭제 실패: %s", response.status_code)
                 try:
                     error_data = response.json()
-                    print(f"오류 메시지: {error_data.get('message', '알 수 없는 오류')}")
+                    logger.error("오류 메시지: %s", error_data.get('message', '알 수 없는 오류'))
                 except:
-                    print(f"응답 내용: {response.text}")
+                    logger.error("응답 내용: %s", response.text)
                 return False, None
                 
         except Exception as e:
             if REQUESTS_AVAILABLE and "ConnectionError" in str(type(e)):
-                print("❌ 서버 연결 실패: 서버가 실행 중인지 확인해주세요.")
+                logger.error("❌ 서버 연결 실패: 서버가 실행 중인지 확인해주세요.")
                 return False, None
             elif REQUESTS_AVAILABLE and "Timeout" in str(type(e)):
-                print("❌ 요청 시간 초과: 서버 응답이 너무 느립니다.")
+                logger.error("❌ 요청 시간 초과: 서버 응답이 너무 느립니다.")
                 return False, None
             else:
-                print(f"❌ 예상치 못한 오류: {str(e)}")
+                logger.error("❌ 예상치 못한 오류: %s", e)
                 return False, None
     
     def set_server_url(self, url):
         """서버 URL 설정"""
         self.base_url = url
-        print(f"서버 URL 설정: {url}")
+        logger.info("서버 URL 설정: %s", url)
+
+def _percentile(sorted_values, fraction):
+    """정렬된 값들의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def summarize_upload_results(results, wall_time):
+    """업로드 결과 리스트의 성공 개수와 지연 시간 통계 계산"""
+    latencies = sorted(result['latency'] for result in results)
+    succeeded = sum(1 for result in results if result['success'])
+    return {
+        'total': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'retries': sum(result['attempts'] - 1 for result in results if result['attempts'] > 0),
+        'wall_time': wall_time,
+        'throughput': len(results) / wall_time if wall_time > 0 else 0.0,
+        'latency_p50': _percentile(latencies, 0.50),
+        'latency_p95': _percentile(latencies, 0.95),
+        'latency_p99': _percentile(latencies, 0.99),
+        'latency_max': latencies[-1] if latencies else 0.0,
+    }
 
 class DifficultyManager:
     """난이도별 설정 관리"""
@@ -214,15 +568,15 @@ class DifficultyManager:
         },
         "medium": {
             "max_holes": 45, 
-            "description": "보통 (50개 이하 빈칸)"
+            "description": "보통 (45개 이하 빈칸)"
         },
         "hard": {
             "max_holes": 50,
-            "description": "어려움 (65개 이하 빈칸)"
+            "description": "어려움 (50개 이하 빈칸)"
         },
         "expert": {
             "max_holes": 65,
-            "description": "전문가 (75개 이하 빈칸)"
+            "description": "전문가 (65개 이하 빈칸)"
         }
     }
     
@@ -233,15 +587,13 @@ class DifficultyManager:
     
     @classmethod
     def get_difficulty_by_holes(cls, holes_count):
-        """빈칸 개수에 따른 난이도 결정"""
-        if holes_count <= 35:
-            return "easy"
-        elif holes_count <= 50:
-            return "medium"
-        elif holes_count <= 65:
-            return "hard"
-        else:
-            return "expert"
+        """빈칸 개수에 따른 난이도 결정 (기법 사용 프로필이 없을 때의 기준, difficulty.rate_holes)"""
+        return rate_holes(holes_count)
+    
+    @classmethod
+    def get_difficulty_by_profile(cls, technique_profile):
+        """검증 풀이의 기법 사용 프로필에 따른 난이도 결정 (difficulty.rate_profile)"""
+        return rate_profile(technique_profile)
     
     @classmethod
     def list_difficulties(cls):
@@ -287,6 +639,14 @@ def test_data_formatting():
     )
     
     print(f"\n생성된 페이로드 크기: {len(json.dumps(payload))} bytes")
+    
+    # 압축 형식 페이로드
+    compact_payload = PuzzleDataFormatter.create_compact_payload(
+        board, board, pieces, "medium", "normal"
+    )
+    decoded = PuzzleDataFormatter.decode_compact_payload(compact_payload)
+    print(f"압축 페이로드 크기: {len(json.dumps(compact_payload))} bytes")
+    print(f"복원된 기물 개수: {len(decoded['pieces'])}개")
     print("페이로드 구조 확인 완료!")
 
 def test_delete_puzzle(puzzle_id, server_url=None):
@@ -314,7 +674,101 @@ def test_delete_puzzle(puzzle_id, server_url=None):
     
     return success, result
 
+def start_stand_in_server(batch_supported=True, fail_every=0, short_results=False):
+    """테스트용 로컬 퍼즐 서버를 백그라운드 스레드로 실행
+    
+    POST /api/puzzle과 (batch_supported면) POST /api/puzzles/batch를 흉내냅니다.
+    fail_every가 0보다 크면 n번째 퍼즐마다 실패로 응답합니다.
+    short_results면 일괄 응답의 결과 목록에서 마지막 퍼즐을 빼고 보냅니다 (잘못된 서버 응답).
+    
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (server_address로 주소 확인, shutdown()으로 종료)
+    """
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    
+    state = {'next_id': 1}
+    lock = threading.Lock()
+    
+    def store_puzzle():
+        with lock:
+            puzzle_id = state['next_id']
+            state['next_id'] += 1
+        if fail_every and puzzle_id % fail_every == 0:
+            return {"success": False, "message": "잘못된 퍼즐 데이터"}
+        return {"success": True, "puzzle_id": puzzle_id}
+    
+    class StandInHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+        
+        def send_json(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                raw = gzip.decompress(raw)
+            body = json.loads(raw or b'{}')
+            if self.path == "/api/puzzle":
+                item = store_puzzle()
+                if item['success']:
+                    self.send_json(201, {"data": {"puzzle_id": item['puzzle_id']}})
+                else:
+                    self.send_json(400, {"message": item['message']})
+            elif self.path == PuzzleAPIClient.BATCH_PATH and batch_supported:
+                results = [store_puzzle() for _ in body.get('puzzles', [])]
+                if short_results:
+                    results = results[:-1]
+                self.send_json(201, {"data": {"results": results}})
+            else:
+                self.send_json(404, {"message": "not found"})
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_batch_upload(count=25, batch_size=10):
+    """로컬 테스트 서버로 일괄 업로드와 단건 업로드 대체 경로 테스트"""
+    print("=" * 50)
+    print("일괄 업로드 테스트")
+    print("=" * 50)
+    
+    board = Board()
+    board.set_value(0, 0, 1)
+    pieces = [Piece('K', 4, 4)]
+    payload = PuzzleDataFormatter.create_puzzle_payload(board, board, pieces)
+    
+    for batch_supported in (True, False):
+        server = start_stand_in_server(batch_supported=batch_supported, fail_every=7)
+        try:
+            host, port = server.server_address
+            api_client = PuzzleAPIClient(f"http://{host}:{port}")
+            results, metrics = api_client.upload_puzzles([payload] * count, batch_size=batch_size)
+            failed = [result['index'] for result in results if not result['success']]
+            print(f"일괄 지원={batch_supported}: 성공 {metrics['succeeded']}개, 재시도 대상 {failed}")
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    server = start_stand_in_server(short_results=True)
+    try:
+        host, port = server.server_address
+        api_client = PuzzleAPIClient(f"http://{host}:{port}")
+        results, metrics = api_client.upload_puzzles([payload] * count, batch_size=batch_size)
+        print(f"결과 목록이 모자란 응답: 성공 {metrics['succeeded']}개, 실패 {metrics['failed']}개")
+    finally:
+        server.shutdown()
+        server.server_close()
+
 if __name__ == "__main__":
+    from log_setup import configure_logging
+    configure_logging()
+    
     # 테스트 실행
     test_data_formatting()
     
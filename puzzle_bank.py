@@ -0,0 +1,264 @@
+"""
+ChessSudoku 퍼즐 뱅크 모듈
+
+미리 생성한 퍼즐을 고정 길이 레코드의 바이너리 파일에 저장하고,
+mmap으로 열어서 i번째 퍼즐을 나머지를 읽지 않고 바로 꺼냅니다.
+
+파일 형식 (리틀 엔디언):
+    헤더 16바이트: 매직 b'CSPB', 버전(u16), 레코드 크기(u16), 예약 8바이트
+    레코드 92바이트:
+        퍼즐 41바이트  - puzzle_codec.pack_board (기물 위치 포함)
+        정답 41바이트  - puzzle_codec.pack_board (기물 위치 포함, 기물 배치는 여기서 복원)
+        난이도 1바이트 - DIFFICULTY_CODES
+        빈칸 수 1바이트
+        시드 8바이트   - (seed, piece_counts, max_holes)로 퍼즐 재현용
+
+난이도별 보조 인덱스는 '<뱅크 경로>.<난이도>.idx' 파일에
+레코드 번호(u32)를 추가 순서대로 기록합니다.
+"""
+import mmap
+import os
+import struct
+from puzzle_codec import pack_board, unpack_board, packed_to_string
+
+MAGIC = b'CSPB'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8x')
+RECORD = struct.Struct('<41s41sBBQ')
+INDEX_ENTRY = struct.Struct('<I')
+
+DIFFICULTY_CODES = {'easy': 0, 'medium': 1, 'hard': 2, 'expert': 3}
+CODE_DIFFICULTIES = {code: difficulty for difficulty, code in DIFFICULTY_CODES.items()}
+
+def index_path(path, difficulty):
+    """난이도별 보조 인덱스 파일 경로"""
+    return f"{path}.{difficulty}.idx"
+
+class PuzzleBankWriter:
+    """퍼즐 뱅크 파일에 레코드를 추가하는 클래스"""
+
+    def __init__(self, path):
+        self.path = path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'ab')
+        if is_new:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self.count = 0
+        else:
+            _check_header(path)
+            self.count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+            # 중간에 끊긴 레코드가 있으면 잘라내서 레코드 경계를 맞춤
+            self.file.truncate(HEADER.size + self.count * RECORD.size)
+            _repair_indexes(path, self.count)
+        self.index_files = {}
+
+    def append(self, puzzle_board, answer_board, pieces, difficulty, holes_count, seed=0):
+        """퍼즐 하나를 추가하고 레코드 번호 반환"""
+        if difficulty not in DIFFICULTY_CODES:
+            raise ValueError(f"알 수 없는 난이도: {difficulty}")
+
+        self.file.write(RECORD.pack(
+            pack_board(puzzle_board, pieces),
+            pack_board(answer_board, pieces),
+            DIFFICULTY_CODES[difficulty],
+            holes_count,
+            seed or 0
+        ))
+        # 레코드를 먼저 파일에 내보내서 인덱스가 뱅크에 없는 레코드를 가리키지 않게 하고,
+        # 인덱스 항목도 바로 내보내서 중간에 끊겨도 잃는 항목이 없게 함
+        # (그래도 빠진 항목은 다시 열 때 _repair_indexes가 채움)
+        self.file.flush()
+
+        index_file = self.index_files.get(difficulty)
+        if index_file is None:
+            index_file = open(index_path(self.path, difficulty), 'ab')
+            self.index_files[difficulty] = index_file
+        index_file.write(INDEX_ENTRY.pack(self.count))
+        index_file.flush()
+
+        self.count += 1
+        return self.count - 1
+
+    def append_record(self, record):
+        """pipeline.iter_puzzles의 퍼즐 레코드 추가"""
+        return self.append(record['puzzle'], record['answer'], record['pieces'],
+                           record['difficulty'], record['info']['holes_count'], record['seed'])
+
+    def close(self):
+        """파일 닫기 (버퍼에 남은 레코드 기록)"""
+        self.file.close()
+        for index_file in self.index_files.values():
+            index_file.close()
+        self.index_files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class PuzzleBank:
+    """mmap으로 퍼즐 뱅크를 읽는 클래스
+
+    레코드는 필요할 때 해당 위치만 읽으므로 파일 크기와 상관없이 메모리를 거의 쓰지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        _check_header(path)
+        self.file = open(path, 'rb')
+        size = os.path.getsize(path)
+        self.count = (size - HEADER.size) // RECORD.size
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        # 난이도별 보조 인덱스 (파일이 있는 난이도만)
+        self.index_files = {}
+        self.indexes = {}
+        for difficulty in DIFFICULTY_CODES:
+            path_for_difficulty = index_path(path, difficulty)
+            if os.path.exists(path_for_difficulty) and os.path.getsize(path_for_difficulty) > 0:
+                index_file = open(path_for_difficulty, 'rb')
+                self.index_files[difficulty] = index_file
+                self.indexes[difficulty] = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def raw(self, index):
+        """i번째 레코드의 원본 필드 반환 (Board를 만들지 않는 가장 빠른 경로)
+
+        Returns:
+            tuple: (퍼즐 41바이트, 정답 41바이트, 난이도 코드, 빈칸 수, 시드)
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(f"레코드 번호 범위를 벗어났습니다: {index}")
+        return RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+    def get(self, index):
+        """i번째 퍼즐을 dict로 반환 (puzzle, answer는 81글자 문자열)"""
+        puzzle, answer, difficulty_code, holes_count, seed = self.raw(index)
+        return {
+            'index': index,
+            'puzzle': packed_to_string(puzzle),
+            'answer': packed_to_string(answer),
+            'difficulty': CODE_DIFFICULTIES[difficulty_code],
+            'holes_count': holes_count,
+            'seed': seed,
+        }
+
+    def get_boards(self, index):
+        """i번째 퍼즐을 (퍼즐 Board, 정답 Board, 기물 리스트)로 반환"""
+        puzzle, answer, _, _, _ = self.raw(index)
+        puzzle_board, _ = unpack_board(puzzle)
+        answer_board, pieces = unpack_board(answer)
+        return puzzle_board, answer_board, pieces
+
+    def count_by_difficulty(self, difficulty):
+        """해당 난이도의 퍼즐 개수"""
+        index = self.indexes.get(difficulty)
+        return len(index) // INDEX_ENTRY.size if index is not None else 0
+
+    def index_for_difficulty(self, difficulty, position):
+        """해당 난이도의 position번째 퍼즐의 레코드 번호"""
+        if not 0 <= position < self.count_by_difficulty(difficulty):
+            raise IndexError(f"{difficulty} 퍼즐 번호 범위를 벗어났습니다: {position}")
+        return INDEX_ENTRY.unpack_from(self.indexes[difficulty], position * INDEX_ENTRY.size)[0]
+
+    def get_by_difficulty(self, difficulty, position):
+        """해당 난이도의 position번째 퍼즐 반환"""
+        return self.get(self.index_for_difficulty(difficulty, position))
+
+    def random_puzzle(self, difficulty, rng):
+        """해당 난이도에서 무작위 퍼즐 하나 반환 (없으면 None)"""
+        count = self.count_by_difficulty(difficulty)
+        if count == 0:
+            return None
+        return self.get_by_difficulty(difficulty, rng.randrange(count))
+
+    def close(self):
+        """mmap과 파일 닫기"""
+        for index in self.indexes.values():
+            index.close()
+        for index_file in self.index_files.values():
+            index_file.close()
+        if self.data is not None:
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _check_header(path):
+    """뱅크 파일 헤더 검사"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"퍼즐 뱅크 헤더가 없습니다: {path}")
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"지원하지 않는 퍼즐 뱅크 파일입니다: {path}")
+
+def _repair_indexes(path, count):
+    """중간에 끊긴 뱅크의 보조 인덱스를 레코드 count개에 맞춤
+
+    인덱스는 추가 순서대로 번호가 커지므로 난이도마다 기록된 항목은 실제 항목들의 앞부분입니다.
+    - count 이상인 번호와 끊긴 항목은 파일 끝에서 잘라냄
+    - 난이도별 마지막 번호 뒤의 레코드 중 그 난이도인 것들의 빠진 항목을 추가
+    """
+    last = {}
+    for difficulty in DIFFICULTY_CODES:
+        last[difficulty] = -1
+        path_for_difficulty = index_path(path, difficulty)
+        if not os.path.exists(path_for_difficulty):
+            continue
+        with open(path_for_difficulty, 'r+b') as f:
+            data = f.read()
+            whole = len(data) - len(data) % INDEX_ENTRY.size
+            keep = 0
+            for (index,) in INDEX_ENTRY.iter_unpack(data[:whole]):
+                if index >= count:
+                    break
+                last[difficulty] = index
+                keep += 1
+            if keep * INDEX_ENTRY.size != len(data):
+                f.truncate(keep * INDEX_ENTRY.size)
+
+    start = min(last.values()) + 1
+    if start >= count:
+        return
+    missing = {difficulty: bytearray() for difficulty in DIFFICULTY_CODES}
+    difficulty_offset = HEADER.size + RECORD.size - 10  # 레코드의 난이도 바이트 (뒤에 빈칸 수 1, 시드 8)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for index in range(start, count):
+            difficulty = CODE_DIFFICULTIES.get(data[difficulty_offset + index * RECORD.size])
+            if difficulty is not None and index > last[difficulty]:
+                missing[difficulty] += INDEX_ENTRY.pack(index)
+    for difficulty, buffer in missing.items():
+        if buffer:
+            with open(index_path(path, difficulty), 'ab') as f:
+                f.write(buffer)
+
+def rebuild_indexes(path):
+    """뱅크 파일을 처음부터 읽어서 난이도별 보조 인덱스를 다시 만듦"""
+    buffers = {difficulty: bytearray() for difficulty in DIFFICULTY_CODES}
+    with PuzzleBank(path) as bank:
+        for index in range(len(bank)):
+            difficulty_code = bank.raw(index)[2]
+            buffers[CODE_DIFFICULTIES[difficulty_code]] += INDEX_ENTRY.pack(index)
+
+    for difficulty, buffer in buffers.items():
+        with open(index_path(path, difficulty), 'wb') as f:
+            f.write(buffer)
+
+def build_bank(path, count, difficulty=None, piece_counts=None, seed=None):
+    """iter_puzzles로 퍼즐을 생성해서 뱅크 파일에 추가"""
+    from pipeline import iter_puzzles
+
+    with PuzzleBankWriter(path) as writer:
+        for record in iter_puzzles(count=count, difficulty=difficulty,
+                                   piece_counts=piece_counts, seed=seed):
+            writer.append_record(record)
+        return writer.count
@@ -0,0 +1,133 @@
+"""
+ChessSudoku 퍼즐 압축 인코딩 모듈
+
+보드를 81글자 문자열 또는 41바이트 니블(4비트) 배열로 변환합니다.
+기물은 보드 안에 글자로 함께 기록하므로 기물 목록을 따로 보낼 필요가 없습니다.
+
+문자열 형식 (행 우선, 81글자):
+    '1'~'9' 숫자, '.' 빈칸, 'K' 'Q' 'R' 'B' 'N' 기물
+
+니블 형식 (칸마다 4비트, 앞 칸이 상위 4비트, 마지막 바이트의 하위 4비트는 0):
+    0 빈칸, 1~9 숫자, 10~14 기물 (K, Q, R, B, N)
+"""
+from board import Board
+from validators import Piece
+
+EMPTY_CHAR = '.'
+PIECE_TYPES = ('K', 'Q', 'R', 'B', 'N')
+PACKED_SIZE = 41  # 81칸 * 4비트 = 40.5바이트
+
+_PIECE_CODES = {piece_type: 10 + offset for offset, piece_type in enumerate(PIECE_TYPES)}
+_CODE_PIECES = {code: piece_type for piece_type, code in _PIECE_CODES.items()}
+
+def _cell_values(board, pieces=None):
+    """보드의 81칸 값을 행 우선으로 반환 (pieces가 있으면 기물 위치를 덮어씀)"""
+    values = [board.get_value(row, col) for row in range(9) for col in range(9)]
+    for piece in pieces or ():
+        values[piece.row * 9 + piece.col] = piece.piece_type
+    return values
+
+def encode_board(board, pieces=None):
+    """Board를 81글자 문자열로 변환
+
+    Args:
+        board (Board): 변환할 보드 (기물 글자가 들어 있으면 그대로 기록)
+        pieces (list, optional): 보드에 기물 글자가 없을 때 덮어쓸 기물들
+
+    Returns:
+        str: 81글자 문자열
+    """
+    chars = []
+    for value in _cell_values(board, pieces):
+        if value is None:
+            chars.append(EMPTY_CHAR)
+        elif isinstance(value, str):
+            chars.append(value)
+        else:
+            chars.append(str(value))
+    return ''.join(chars)
+
+def decode_board(text):
+    """81글자 문자열을 (Board, 기물 리스트)로 변환"""
+    if len(text) != 81:
+        raise ValueError(f"보드 문자열은 81글자여야 합니다. ({len(text)}글자)")
+
+    board = Board()
+    pieces = []
+    for index, char in enumerate(text):
+        row, col = divmod(index, 9)
+        if char in ('.', '0'):
+            continue
+        if char in _PIECE_CODES:
+            board.set_value(row, col, char)
+            pieces.append(Piece(char, row, col))
+        elif '1' <= char <= '9':
+            board.set_value(row, col, int(char))
+        else:
+            raise ValueError(f"알 수 없는 보드 문자: {char!r} (위치 {index})")
+    return board, pieces
+
+def pack_board(board, pieces=None):
+    """Board를 41바이트 니블 배열로 변환"""
+    codes = []
+    for value in _cell_values(board, pieces):
+        if value is None:
+            codes.append(0)
+        elif isinstance(value, str):
+            codes.append(_PIECE_CODES[value])
+        else:
+            codes.append(value)
+    codes.append(0)  # 82번째 니블은 패딩
+
+    return bytes((codes[i] << 4) | codes[i + 1] for i in range(0, 82, 2))
+
+def unpack_codes(data):
+    """41바이트 니블 배열을 81개 칸 코드 리스트로 변환"""
+    if len(data) != PACKED_SIZE:
+        raise ValueError(f"압축 보드는 {PACKED_SIZE}바이트여야 합니다. ({len(data)}바이트)")
+
+    codes = []
+    for byte in data:
+        codes.append(byte >> 4)
+        codes.append(byte & 0x0F)
+    return codes[:81]
+
+def unpack_board(data):
+    """41바이트 니블 배열을 (Board, 기물 리스트)로 변환"""
+    board = Board()
+    pieces = []
+    for index, code in enumerate(unpack_codes(data)):
+        row, col = divmod(index, 9)
+        if code == 0:
+            continue
+        if code in _CODE_PIECES:
+            piece_type = _CODE_PIECES[code]
+            board.set_value(row, col, piece_type)
+            pieces.append(Piece(piece_type, row, col))
+        elif code <= 9:
+            board.set_value(row, col, code)
+        else:
+            raise ValueError(f"알 수 없는 칸 코드: {code} (위치 {index})")
+    return board, pieces
+
+def packed_to_string(data):
+    """니블 배열을 81글자 문자열로 변환 (Board를 만들지 않음)"""
+    chars = []
+    for code in unpack_codes(data):
+        if code == 0:
+            chars.append(EMPTY_CHAR)
+        elif code in _CODE_PIECES:
+            chars.append(_CODE_PIECES[code])
+        else:
+            chars.append(str(code))
+    return ''.join(chars)
+
+def encode_pieces(pieces):
+    """기물 리스트를 'K44Q33' 형태의 문자열로 변환 (기물 타입 + 행 + 열)"""
+    return ''.join(f"{piece.piece_type}{piece.row}{piece.col}" for piece in pieces)
+
+def decode_pieces(text):
+    """encode_pieces 문자열을 기물 리스트로 변환"""
+    if len(text) % 3 != 0:
+        raise ValueError(f"기물 문자열 길이가 잘못되었습니다: {text!r}")
+    return [Piece(text[i], int(text[i + 1]), int(text[i + 2])) for i in range(0, len(text), 3)]
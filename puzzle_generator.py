@@ -1,7 +1,16 @@
 from board import Board
 from logical_solver import LogicalSolver
+from constraint_graph import ConstraintGraph
+from seeding import make_rng
+from beam_carve import beam_carve, DEFAULT_EXPANSIONS
+from difficulty import difficulty_rank, difficulty_score, rate_score, rate_profile, rate_holes
+from log_setup import get_logger, log_event, events_enabled
 import copy
-import random
+import logging
+
+logger = get_logger(__name__)
+
+STEER_ATTEMPTS = 60  # 목표 난이도에 못 미쳤을 때 max_holes를 넘어 더 조각하는 데 쓰는 추가 시도 횟수
 
 class PuzzleGenerator:
     """완성된 스도쿠 보드에서 빈칸을 조각하여 퍼즐을 생성하는 클래스
@@ -10,44 +19,77 @@ class PuzzleGenerator:
     사람이 실제로 풀 수 있는 퍼즐을 생성합니다.
     """
     
-    def __init__(self, complete_board, pieces):
+    def __init__(self, complete_board, pieces, constraint_graph=None, rng=None, stats=None, carve_selector=None):
         """퍼즐 생성기 초기화
         
         Args:
             complete_board (Board): 완성된 스도쿠 보드
             pieces (list): 배치된 체스 기물들
+            constraint_graph (ConstraintGraph, optional): 기물 배치의 제약 그래프
+                (없으면 기물 목록으로부터 생성)
+            rng (random.Random | int, optional): 난수 생성기 또는 시드
+            stats (SearchStats, optional): 조각/풀이 통계 수집기 (None이면 세지 않음)
+            carve_selector (AdaptiveCarveSelector, optional): 검증 통과율을 학습하는 후보 선택기
+                (None이면 select_carve_candidate의 고정 가중치 사용)
         """
         self.complete_board = complete_board
         self.pieces = pieces
+        self.constraint_graph = constraint_graph or ConstraintGraph.from_pieces(pieces)
+        self.rng = make_rng(rng)
+        self.stats = stats
         self.puzzle_board = None
         self.carved_cells = []  # 조각된 칸들의 목록
+        self.solution_path = []  # 마지막으로 통과한 검증 풀이의 (row, col, 숫자, 기법, 반복 번호) 목록
+        self.technique_profile = None  # 마지막으로 통과한 검증 풀이의 기법 사용 프로필 (난이도 평가용)
+        self.carve_selector = carve_selector
+        self.carve_outcomes = {}  # 이 퍼즐에서 carve_selector의 팔별 (통과, 실패) 횟수
         self.logical_solver = None
         
-    def generate_puzzle(self, max_holes=25, min_holes=10):
+    def generate_puzzle(self, max_holes=25, min_holes=10, target_difficulty=None, beam_width=None,
+                        beam_expansions=DEFAULT_EXPANSIONS):
         """빈칸을 조각하여 퍼즐 생성
         
+        시작/완료 메시지는 INFO, 칸별 조각 결과는 DEBUG 로그와 'carve' 이벤트로 기록합니다.
+        
         Args:
             max_holes (int): 최대 빈칸 개수
             min_holes (int): 최소 빈칸 개수
+            target_difficulty (str, optional): 목표 난이도. 조각한 칸 때문에 검증 풀이의
+                난이도가 목표보다 어려워지면 그 칸을 되돌림 (목표에 도달했으면 조각을 멈추고,
+                아직 못 미쳤으면 다른 칸을 시도). 목표에 못 미치면 max_holes를 넘어서도
+                STEER_ATTEMPTS번까지 더 조각함
+            beam_width (int, optional): 있으면 한 칸씩 조각하는 대신 빔 탐색으로 조각
+                (beam_carve 모듈, 빈칸이 많은 목표용 - carve_selector는 쓰지 않음)
+            beam_expansions (int): 빔 탐색에서 상태 하나를 확장하는 후보 빈칸 수
             
         Returns:
             Board: 생성된 퍼즐 보드
         """
-        print(f"퍼즐 생성 시작 (최대 {max_holes}개 빈칸)")
+        logger.info("퍼즐 생성 시작 (최대 %d개 빈칸)", max_holes)
+        log_cells = logger.isEnabledFor(logging.DEBUG)
+        log_events = events_enabled()
         
         # 1. 완성된 보드 복사
         self.puzzle_board = copy.deepcopy(self.complete_board)
         self.carved_cells = []
+        self.solution_path = []
+        self.technique_profile = None
+        self.carve_outcomes = {}
+        target_rank = difficulty_rank(target_difficulty) if target_difficulty else None
+        if beam_width:
+            return self._generate_puzzle_beam(max_holes, min_holes, target_difficulty, beam_width, beam_expansions)
         
         # 2. 논리적 솔버 초기화
-        self.logical_solver = LogicalSolver(self.puzzle_board, self.pieces)
+        self.logical_solver = LogicalSolver(self.puzzle_board, self.pieces, self.constraint_graph, self.stats)
         
         # 3. 전략적 한 칸씩 조각하기 시도
         holes_carved = 0
         max_attempts = max_holes * 3  # 무한 루프 방지
+        if target_rank is not None:
+            max_attempts += STEER_ATTEMPTS
         attempts = 0
         
-        while holes_carved < max_holes and attempts < max_attempts:
+        while (holes_carved < max_holes or self._below_target(target_rank)) and attempts < max_attempts:
             attempts += 1
             
             # 전략적 후보들 찾기
@@ -55,34 +97,101 @@ class PuzzleGenerator:
             
             # 모든 그룹이 비어있는지 확인
             if not any(candidates.values()):
-                print("더 이상 조각할 수 있는 칸이 없습니다.")
+                logger.info("더 이상 조각할 수 있는 칸이 없습니다.")
                 break
             
-            # 가중치 기반으로 칸 선택
-            selected_cell = self.select_carve_candidate(candidates)
+            # 가중치 기반으로 칸 선택 (carve_selector가 있으면 학습한 통과율로 선택)
+            if self.carve_selector is not None:
+                selected_cell, arm = self.carve_selector.select(self, candidates, holes_carved, max_holes)
+            else:
+                selected_cell, arm = self.select_carve_candidate(candidates), None
             
             if selected_cell:
                 row, col = selected_cell
                 
                 # 이 칸을 조각해도 논리적으로 풀 수 있는지 확인
-                if self.carve_cell_and_verify(row, col):
+                previous = self.solution_path, self.technique_profile
+                carved = self.carve_cell_and_verify(row, col)
+                score = difficulty_score(self.technique_profile) if carved and target_rank is not None else None
+                overshoot = score is not None and difficulty_rank(rate_score(score)) > target_rank
+                
+                # 되돌린 조각은 실패로 셈
+                if arm is not None:
+                    accepted = carved and not overshoot
+                    self.carve_selector.update(arm, accepted)
+                    outcome = self.carve_outcomes.setdefault(arm, [0, 0])
+                    outcome[0 if accepted else 1] += 1
+                
+                # 목표 난이도를 넘어서면 되돌림 (빈칸이 늘수록 대체로 더 어려워지므로
+                # 이미 목표 난이도면 멈추고, 아직 못 미쳤으면 한 단계씩 오르도록 다른 칸을 시도)
+                if overshoot:
+                    self.puzzle_board.set_value(row, col, self.complete_board.get_value(row, col))
+                    self.solution_path, self.technique_profile = previous
+                    self.logical_solver.initialize_possible_values()
+                    if self.stats is not None:
+                        self.stats.carve_attempts += 1
+                        self.stats.carve_rejects += 1
+                    if log_events:
+                        log_event("carve_overshoot", row=row, col=col, holes=holes_carved, score=score,
+                                  target=target_difficulty)
+                    if not self._below_target(target_rank):
+                        logger.info("목표 난이도(%s)를 넘어서서 조각을 멈춥니다.", target_difficulty)
+                        break
+                    continue
+                if self.stats is not None:
+                    self.stats.carve_attempts += 1
+                    if carved:
+                        self.stats.carve_accepts += 1
+                    else:
+                        self.stats.carve_rejects += 1
+                
+                if carved:
                     holes_carved += 1
                     self.carved_cells.append((row, col))
-                    
-                    # 어떤 전략으로 선택되었는지 표시
+                
+                # 어떤 전략으로 선택되었는지 기록 (로그나 이벤트가 켜져 있을 때만 계산)
+                if log_cells or log_events:
                     strategy = self.get_cell_strategy(row, col, candidates)
-                    print(f"칸 ({row}, {col}) {strategy} 조각 완료 - 현재 빈칸: {holes_carved}개")
-                else:
-                    print(f"칸 ({row}, {col}) 조각 실패 - 논리적 풀이 불가능")
+                    if carved:
+                        logger.debug("칸 (%d, %d) %s 조각 완료 - 현재 빈칸: %d개", row, col, strategy, holes_carved)
+                    else:
+                        logger.debug("칸 (%d, %d) 조각 실패 - 논리적 풀이 불가능", row, col)
+                    if log_events:
+                        log_event("carve", row=row, col=col, strategy=strategy, accepted=carved,
+                                  holes=holes_carved, attempt=attempts)
             else:
-                print("선택할 수 있는 칸이 없습니다.")
+                logger.info("선택할 수 있는 칸이 없습니다.")
                 break
         
         # 최소 빈칸 개수 확인
         if holes_carved < min_holes:
-            print(f"경고: 최소 빈칸 개수({min_holes})에 도달하지 못했습니다. ({holes_carved}개)")
+            logger.warning("경고: 최소 빈칸 개수(%d)에 도달하지 못했습니다. (%d개)", min_holes, holes_carved)
         
-        print(f"퍼즐 생성 완료: {holes_carved}개 빈칸 조각됨")
+        logger.info("퍼즐 생성 완료: %d개 빈칸 조각됨", holes_carved)
+        if log_events:
+            log_event("carve_done", holes=holes_carved, attempts=attempts, max_holes=max_holes)
+        return self.puzzle_board
+    
+    def _below_target(self, target_rank):
+        """현재 퍼즐이 목표 난이도 순위보다 쉬운지 확인 (목표가 없으면 False)"""
+        return target_rank is not None and difficulty_rank(self.get_puzzle_difficulty()) < target_rank
+    
+    def _generate_puzzle_beam(self, max_holes, min_holes, target_difficulty, beam_width, beam_expansions):
+        """빔 탐색으로 조각한 칸들을 퍼즐 보드에 적용 (generate_puzzle의 beam_width 모드)"""
+        trail, solver = beam_carve(self, max_holes, beam_width, beam_expansions, target_difficulty)
+        for index in trail:
+            self.puzzle_board.set_value(index // 9, index % 9, None)
+        self.carved_cells = [(index // 9, index % 9) for index in trail]
+        self.solution_path = list(solver.steps)
+        self.technique_profile = solver.get_technique_profile()
+        self.logical_solver = LogicalSolver(self.puzzle_board, self.pieces, self.constraint_graph, self.stats)
+        
+        holes_carved = len(trail)
+        if holes_carved < min_holes:
+            logger.warning("경고: 최소 빈칸 개수(%d)에 도달하지 못했습니다. (%d개)", min_holes, holes_carved)
+        logger.info("퍼즐 생성 완료: %d개 빈칸 조각됨 (빔 폭 %d)", holes_carved, beam_width)
+        if events_enabled():
+            log_event("carve_done", holes=holes_carved, max_holes=max_holes, beam_width=beam_width)
         return self.puzzle_board
     
     def get_carveable_cells(self):
@@ -115,10 +224,7 @@ class PuzzleGenerator:
     
     def is_piece_position(self, row, col):
         """해당 위치에 기물이 있는지 확인"""
-        for piece in self.pieces:
-            if piece.row == row and piece.col == col:
-                return True
-        return False
+        return self.constraint_graph.is_piece_cell(row, col)
     
     def find_completed_line_cells(self):
         """완성된 행, 열, 3x3 박스의 칸들을 찾기"""
@@ -213,15 +319,7 @@ class PuzzleGenerator:
     
     def is_under_piece_constraint(self, row, col):
         """해당 칸이 기물의 제약 조건 하에 있는지 확인"""
-        # PiecePlacer 인스턴스 생성 (기물 제약 검사용)
-        from validators import PiecePlacer
-        piece_placer = PiecePlacer(self.puzzle_board)
-        piece_placer.pieces = self.pieces
-        
-        for piece in self.pieces:
-            if piece_placer._can_piece_attack(piece, row, col):
-                return True
-        return False
+        return self.constraint_graph.is_attacked(row, col)
     
     def get_strategic_carve_candidates(self):
         """전략적 우선순위에 따라 조각할 수 있는 칸들을 반환"""
@@ -253,18 +351,18 @@ class PuzzleGenerator:
         }
         
         # 각 그룹에서 랜덤 선택
-        selected_group = random.choices(
+        selected_group = self.rng.choices(
             list(weights.keys()), 
             weights=list(weights.values())
         )[0]
         
         if candidates[selected_group]:
-            return random.choice(candidates[selected_group])
+            return self.rng.choice(candidates[selected_group])
         
         # 선택된 그룹이 비어있으면 다른 그룹에서 선택
         for group in ['completed_lines', 'unconstrained', 'regular']:
             if candidates[group]:
-                return random.choice(candidates[group])
+                return self.rng.choice(candidates[group])
         
         return None
     
@@ -295,14 +393,17 @@ class PuzzleGenerator:
         # 칸을 빈칸으로 만들기
         self.puzzle_board.set_value(row, col, None)
         
-        # 논리적 솔버 업데이트
-        self.logical_solver = LogicalSolver(self.puzzle_board, self.pieces)
+        # 논리적 솔버 업데이트 (통과하면 이 풀이가 현재 퍼즐의 풀이 경로가 됨)
+        self.logical_solver = LogicalSolver(self.puzzle_board, self.pieces, self.constraint_graph, self.stats,
+                                            record_steps=True)
         
         # 논리적으로 풀 수 있는지 확인
         is_solvable = self.logical_solver.is_solvable_logically()
         
         if is_solvable:
             # 조각 성공
+            self.solution_path = list(self.logical_solver.steps)
+            self.technique_profile = self.logical_solver.get_technique_profile()
             return True
         else:
             # 조각 실패 - 원본 값 복원
@@ -312,27 +413,34 @@ class PuzzleGenerator:
     def get_puzzle_difficulty(self):
         """퍼즐의 난이도 평가
         
+        마지막 검증 풀이의 기법 사용 프로필로 평가하고 (difficulty.rate_profile),
+        아직 조각한 칸이 없으면 빈칸 개수 기준을 씁니다.
+        
         Returns:
             str: 난이도 ('easy', 'medium', 'hard', 'expert')
         """
-        holes_count = len(self.carved_cells)
-        
-        if holes_count <= 25:
-            return 'easy'
-        elif holes_count <= 40:
-            return 'medium'
-        elif holes_count <= 50:
-            return 'hard'
-        else:
-            return 'expert'
+        if self.technique_profile is None:
+            return rate_holes(len(self.carved_cells))
+        return rate_profile(self.technique_profile)
     
     def get_puzzle_info(self):
-        """퍼즐 정보 반환"""
+        """퍼즐 정보 반환
+        
+        solution_path는 마지막 검증 풀이에서 칸을 채운 순서이며, 항목마다
+        (row, col, 숫자, 기법, 반복 번호) 튜플입니다. 다시 풀지 않고 힌트나 풀이 재생에 씁니다.
+        technique_profile과 difficulty_score는 같은 풀이의 기법 사용 프로필과 난이도 점수입니다.
+        carve_outcomes는 carve_selector의 팔별 (통과, 실패) 횟수입니다 (선택기가 없으면 빈 dict).
+        """
+        profile = self.technique_profile
         return {
             'holes_count': len(self.carved_cells),
             'difficulty': self.get_puzzle_difficulty(),
+            'difficulty_score': difficulty_score(profile) if profile is not None else None,
+            'technique_profile': dict(profile) if profile is not None else None,
             'carved_cells': self.carved_cells.copy(),
-            'pieces_count': len(self.pieces)
+            'pieces_count': len(self.pieces),
+            'solution_path': self.solution_path.copy(),
+            'carve_outcomes': {arm: tuple(counts) for arm, counts in self.carve_outcomes.items()}
         }
     
     def print_puzzle_summary(self):
@@ -341,6 +449,8 @@ class PuzzleGenerator:
         print(f"\n퍼즐 요약:")
         print(f"- 조각된 빈칸: {info['holes_count']}개")
         print(f"- 난이도: {info['difficulty']}")
+        if info['technique_profile'] is not None:
+            print(f"- 난이도 점수: {info['difficulty_score']} {info['technique_profile']}")
         print(f"- 기물 개수: {info['pieces_count']}개")
         
         # 전략별 조각 통계
@@ -469,7 +579,7 @@ class PuzzleGenerator:
             print("퍼즐이 생성되지 않았습니다.")
             return False
         
-        solver = LogicalSolver(self.puzzle_board, self.pieces)
+        solver = LogicalSolver(self.puzzle_board, self.pieces, self.constraint_graph, self.stats)
         is_solvable = solver.is_solvable_logically()
         
         if is_solvable:
@@ -484,7 +594,7 @@ class PuzzleGenerator:
         if self.puzzle_board is None:
             return None
         
-        solver = LogicalSolver(self.puzzle_board, self.pieces)
+        solver = LogicalSolver(self.puzzle_board, self.pieces, self.constraint_graph, self.stats)
         solver.initialize_possible_values()
         
         hints = []
@@ -0,0 +1,452 @@
+"""
+ChessSudoku 퍼즐 풀 모듈
+
+난이도별로 미리 만들어 둔 퍼즐을 큐에 담아 두고 요청 즉시 꺼내 줍니다.
+큐가 low_watermark 아래로 내려가면 백그라운드 작업자 프로세스들이
+pipeline.generate_puzzle_record(기물 배치 -> 보드 채우기 -> 빈칸 조각)로
+capacity까지 다시 채웁니다.
+
+    with PuzzlePool(workers=2, persist_path="pool.jsonl") as pool:
+        record = pool.get('hard', timeout=30)   # 비어 있으면 채워질 때까지 최대 30초 대기
+
+목표 난이도와 다르게 평가된 퍼즐(pipeline.matches_difficulty)은 버리지 않고
+평가된 난이도의 큐에 자리가 있으면 그쪽에 넣습니다.
+persist_path가 있으면 시작할 때 파일의 퍼즐들을 큐에 넣고, 종료할 때 남은 퍼즐들을
+같은 파일에 저장합니다 (batch.record_to_dict의 JSON Lines 형식, 풀이 경로 포함).
+
+테스트용 HTTP 서버:
+    python main.py serve-pool --port 8080 --workers 2 --persist pool.jsonl
+    GET /puzzle?difficulty=hard&wait=10   퍼즐 페이로드 (create_record_payload, 풀이 경로 포함)
+    GET /stats                            난이도별 큐 길이, 생성 중인 개수, 제공/생성 횟수
+"""
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse, parse_qs
+from pipeline import generate_puzzle_record, verify_record
+from puzzle_api_client import PuzzleDataFormatter, DifficultyManager
+from batch import record_to_dict, record_from_dict
+from difficulty import DIFFICULTY_LEVELS
+from seeding import new_seed, derive_seed
+from log_setup import (get_logger, add_logging_arguments, configure_from_args, init_worker_logging,
+                       worker_logging_args)
+
+logger = get_logger(__name__)
+
+DEFAULT_CAPACITY = 16
+DEFAULT_LOW_WATERMARK = 4
+MAX_EXECUTOR_RESTARTS = 3  # 작업자 프로세스가 죽어서 깨진 프로세스 풀을 다시 만드는 최대 횟수
+
+def _init_worker(events_path):
+    """작업자 프로세스 초기화: Ctrl+C는 메인 프로세스가 받아서 close()로 정리, 이벤트 스트림 연결"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_worker_logging(events_path)
+
+def _generate_pool_record(task):
+    """프로세스 풀 작업 단위: (시드, 기물 구성, 최대 빈칸, 난이도, 빔 폭)으로 퍼즐을 생성하고 검증
+
+    Returns:
+        dict: 검증을 통과한 퍼즐 레코드, 실패하면 None
+    """
+    seed, piece_counts, max_holes, difficulty, beam_width = task
+    record = generate_puzzle_record(seed, piece_counts, max_holes, difficulty=difficulty, beam_width=beam_width)
+    if record is None or not verify_record(record)[0]:
+        return None
+    return record
+
+class PuzzlePool:
+    """난이도별 퍼즐 큐와 백그라운드 보충 작업자
+
+    큐 길이가 low_watermark 아래로 내려가면 그 난이도를 큐가 capacity가 될 때까지 보충 대상으로
+    두고, (큐 + 생성 중) 개수가 capacity보다 적을 때만 작업을 제출합니다
+    (다른 난이도로 평가된 퍼즐만큼은 다시 제출). 동시에 실행하는 작업은
+    workers개까지이며 작업자는 별도 프로세스라서 get()을 부르는 스레드를 막지 않습니다.
+
+    작업자 프로세스가 죽어서 프로세스 풀이 깨지면 MAX_EXECUTOR_RESTARTS번까지 풀을 다시 만들고,
+    그래도 제출할 수 없으면 broken으로 표시해서 기다리던 get()이 None을 반환하게 합니다.
+    """
+
+    def __init__(self, difficulties=DIFFICULTY_LEVELS, capacity=DEFAULT_CAPACITY,
+                 low_watermark=DEFAULT_LOW_WATERMARK, workers=1, piece_counts=None, seed=None,
+                 persist_path=None, beam_width=None):
+        """퍼즐 풀 생성 (start()를 불러야 보충을 시작)
+
+        Args:
+            difficulties (iterable): 큐를 유지할 난이도들
+            capacity (int): 난이도별 최대 퍼즐 수
+            low_watermark (int): 이보다 적어지면 capacity까지 보충
+            workers (int): 생성 작업자 프로세스 수
+            piece_counts (dict, optional): 기물 타입별 개수
+            seed (int, optional): 풀 시드 (난이도별 n번째 작업은 derive_seed(seed, 난이도, n))
+            persist_path (str, optional): 시작할 때 읽고 종료할 때 저장할 JSON Lines 파일
+            beam_width (int, optional): 있으면 빔 탐색으로 조각
+        """
+        if not 0 <= low_watermark <= capacity:
+            raise ValueError(f"low_watermark는 0 이상 capacity 이하여야 합니다: {low_watermark}")
+        self.difficulties = tuple(difficulties)
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self.workers = workers
+        self.piece_counts = piece_counts
+        self.seed = new_seed() if seed is None else seed
+        self.persist_path = persist_path
+        self.beam_width = beam_width
+
+        self.queues = {difficulty: deque() for difficulty in self.difficulties}
+        self.pending = dict.fromkeys(self.difficulties, 0)      # 생성 중인 작업 수
+        self.refilling = dict.fromkeys(self.difficulties, False)
+        self.counters = {'served': 0, 'generated': 0, 'relabeled': 0, 'discarded': 0, 'failed': 0,
+                         'restarts': 0}
+        self.task_indexes = dict.fromkeys(self.difficulties, 0)
+        self.condition = threading.Condition()
+        self.executor = None
+        self.dispatcher = None
+        self.closed = False
+        self.broken = False  # 보충을 더 할 수 없음 (get()이 기다리지 않고 None 반환)
+
+    def start(self):
+        """저장된 퍼즐을 불러오고 보충 스레드 시작"""
+        if self.persist_path:
+            self.load(self.persist_path)
+        self.executor = self._new_executor()
+        self.dispatcher = threading.Thread(target=self._dispatch, name="puzzle-pool-refill", daemon=True)
+        self.dispatcher.start()
+        logger.info("퍼즐 풀 시작 (작업자 %d개, 난이도별 %d~%d개, 시드 %s)",
+                    self.workers, self.low_watermark, self.capacity, self.seed)
+        return self
+
+    def get(self, difficulty, timeout=None):
+        """퍼즐 하나 꺼내기
+
+        Args:
+            difficulty (str): 난이도
+            timeout (float, optional): 큐가 비어 있을 때 기다릴 최대 시간 (None이면 계속, 0이면 바로 반환)
+
+        Returns:
+            dict: 퍼즐 레코드, 시간 안에 없거나 풀이 닫혔거나 보충이 멈췄으면 None
+        """
+        if difficulty not in self.queues:
+            raise ValueError(f"풀에 없는 난이도: {difficulty} (가능: {', '.join(self.difficulties)})")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            queue = self.queues[difficulty]
+            while not queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if self.closed or self.broken or (remaining is not None and remaining <= 0):
+                    return None
+                self.condition.wait(remaining)
+            record = queue.popleft()
+            self.counters['served'] += 1
+            self.condition.notify_all()  # 보충 스레드가 워터마크를 다시 확인
+            return record
+
+    def counts(self):
+        """난이도별 큐 길이, 생성 중인 작업 수, 누적 횟수"""
+        with self.condition:
+            return {
+                'ready': {difficulty: len(queue) for difficulty, queue in self.queues.items()},
+                'pending': dict(self.pending),
+                'broken': self.broken,
+                **self.counters,
+            }
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=worker_logging_args())
+
+    def _dispatch(self):
+        """보충 스레드: 워터마크 아래로 내려간 난이도에 생성 작업 제출"""
+        try:
+            self._refill()
+        except Exception:
+            logger.exception("퍼즐 풀 보충 스레드가 멈췄습니다.")
+            with self.condition:
+                self.broken = True
+                self.condition.notify_all()
+
+    def _refill(self):
+        with self.condition:
+            while not self.closed and not self.broken:
+                for difficulty in self.difficulties:
+                    queue = self.queues[difficulty]
+                    if len(queue) < self.low_watermark:
+                        self.refilling[difficulty] = True
+                    elif len(queue) >= self.capacity:
+                        self.refilling[difficulty] = False
+
+                # 보충 중인 난이도를 번갈아 가며 작업자 수만큼 제출
+                submitted = True
+                restarted = False
+                while submitted and sum(self.pending.values()) < self.workers:
+                    submitted = False
+                    for difficulty in self.difficulties:
+                        if sum(self.pending.values()) >= self.workers:
+                            break
+                        if (self.refilling[difficulty] and
+                                len(self.queues[difficulty]) + self.pending[difficulty] < self.capacity):
+                            if not self._submit(difficulty):
+                                restarted = True
+                                break
+                            submitted = True
+                if not restarted:  # 풀을 다시 만들었으면 기다리지 않고 바로 다시 제출
+                    self.condition.wait()
+
+    def _submit(self, difficulty):
+        """난이도 하나의 생성 작업 제출 (condition을 잡은 상태에서 호출)
+
+        Returns:
+            bool: 제출했으면 True, 프로세스 풀이 깨졌으면 False (풀을 다시 만들거나 broken 표시)
+        """
+        index = self.task_indexes[difficulty]
+        task = (derive_seed(self.seed, difficulty, index), self.piece_counts,
+                DifficultyManager.get_max_holes(difficulty), difficulty, self.beam_width)
+        try:
+            future = self.executor.submit(_generate_pool_record, task)
+        except (BrokenProcessPool, RuntimeError) as error:
+            self._restart_executor(error)
+            return False
+        self.task_indexes[difficulty] += 1
+        self.pending[difficulty] += 1
+        future.add_done_callback(lambda done: self._collect(difficulty, done))
+        return True
+
+    def _restart_executor(self, error):
+        """깨진 프로세스 풀을 새로 만듦 (condition을 잡은 상태에서 호출, 횟수를 넘기면 broken 표시)"""
+        if self.counters['restarts'] >= MAX_EXECUTOR_RESTARTS:
+            logger.error("작업 제출 실패, 퍼즐 보충을 멈춥니다: %s", error)
+            self.broken = True
+            self.condition.notify_all()
+            return
+        self.counters['restarts'] += 1
+        logger.warning("작업 제출 실패, 프로세스 풀을 다시 만듭니다 (%d/%d): %s",
+                       self.counters['restarts'], MAX_EXECUTOR_RESTARTS, error)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._new_executor()
+
+    def _collect(self, difficulty, future):
+        """작업 완료 콜백: 평가된 난이도의 큐에 퍼즐 추가"""
+        if future.cancelled():  # close()에서 취소한 작업
+            with self.condition:
+                self.pending[difficulty] -= 1
+            return
+        try:
+            record = future.result()
+        except Exception:
+            logger.exception("퍼즐 생성 작업 실패 (%s)", difficulty)
+            record = None
+        with self.condition:
+            self.pending[difficulty] -= 1
+            if record is None:
+                self.counters['failed'] += 1
+            else:
+                self.counters['generated'] += 1
+                queue = self.queues.get(record['difficulty'])
+                if queue is not None and len(queue) < self.capacity:
+                    queue.append(record)
+                    if record['difficulty'] != difficulty:
+                        self.counters['relabeled'] += 1
+                else:
+                    self.counters['discarded'] += 1
+            self.condition.notify_all()
+
+    def load(self, path):
+        """저장된 퍼즐들을 큐에 추가 (파일이 없으면 무시, 큐가 가득 차면 나머지는 버림)
+
+        Returns:
+            int: 큐에 넣은 퍼즐 수
+        """
+        if not os.path.exists(path):
+            return 0
+        loaded = 0
+        with open(path, 'r', encoding='utf-8') as f, self.condition:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = record_from_dict(json.loads(line))
+                queue = self.queues.get(record['difficulty'])
+                if queue is not None and len(queue) < self.capacity:
+                    queue.append(record)
+                    loaded += 1
+            self.condition.notify_all()
+        logger.info("저장된 퍼즐 %d개를 불러왔습니다: %s", loaded, path)
+        return loaded
+
+    def save(self, path):
+        """큐에 남은 퍼즐들을 JSON Lines로 저장 (임시 파일에 쓴 뒤 교체)
+
+        Returns:
+            int: 저장한 퍼즐 수
+        """
+        with self.condition:
+            records = [record for queue in self.queues.values() for record in queue]
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record_to_dict(record, include_solution_path=True), separators=(',', ':')) + "\n")
+        os.replace(temp_path, path)
+        logger.info("남은 퍼즐 %d개를 저장했습니다: %s", len(records), path)
+        return len(records)
+
+    def close(self, persist=True):
+        """보충을 멈추고 작업자를 종료한 뒤 (persist이고 persist_path가 있으면) 남은 퍼즐 저장
+
+        생성 중인 작업은 취소하고, 이미 실행 중인 작업은 끝날 때까지 기다립니다.
+        """
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        if self.dispatcher is not None:
+            self.dispatcher.join()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        if persist and self.persist_path:
+            self.save(self.persist_path)
+        logger.info("퍼즐 풀 종료 (제공 %d개, 생성 %d개)", self.counters['served'], self.counters['generated'])
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def start_pool_server(pool, host="127.0.0.1", port=0):
+    """퍼즐 풀을 제공하는 테스트용 HTTP 서버를 백그라운드 스레드로 실행
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (server_address로 주소 확인, shutdown()으로 종료)
+    """
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class PoolHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+        def send_json(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/stats":
+                self.send_json(200, {"data": pool.counts()})
+            elif url.path == "/puzzle":
+                difficulty = query.get('difficulty', ['medium'])[0]
+                if difficulty not in pool.queues:
+                    self.send_json(400, {"message": f"풀에 없는 난이도: {difficulty}"})
+                    return
+                try:
+                    wait = float(query.get('wait', ['0'])[0])
+                except ValueError:
+                    self.send_json(400, {"message": "wait는 초 단위 숫자여야 합니다"})
+                    return
+                record = pool.get(difficulty, timeout=wait)
+                if record is None:
+                    self.send_json(503, {"message": "준비된 퍼즐이 없습니다. 잠시 후 다시 요청하세요"})
+                else:
+                    self.send_json(200, {"data": PuzzleDataFormatter.create_record_payload(
+                        record, include_solution_path=True)})
+            else:
+                self.send_json(404, {"message": "not found"})
+
+    server = ThreadingHTTPServer((host, port), PoolHandler)
+    threading.Thread(target=server.serve_forever, name="puzzle-pool-http", daemon=True).start()
+    return server
+
+def build_parser():
+    """serve-pool 명령의 인자 파서"""
+    parser = argparse.ArgumentParser(prog="python main.py serve-pool",
+                                     description="난이도별 퍼즐 풀과 테스트용 HTTP 서버 실행")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩할 주소")
+    parser.add_argument("--port", type=int, default=8080, help="포트")
+    parser.add_argument("--workers", type=int, default=1, help="생성 작업자 프로세스 수")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="난이도별 최대 퍼즐 수")
+    parser.add_argument("--low", type=int, default=DEFAULT_LOW_WATERMARK,
+                        help="이보다 적어지면 보충 (low watermark)")
+    parser.add_argument("--difficulties", default=",".join(DIFFICULTY_LEVELS),
+                        help="큐를 유지할 난이도들 (쉼표로 구분)")
+    parser.add_argument("--seed", type=int, default=None, help="풀 시드")
+    parser.add_argument("--persist", default=None, metavar="PATH",
+                        help="시작할 때 읽고 종료할 때 남은 퍼즐을 저장할 .jsonl 파일")
+    parser.add_argument("--beam-width", type=int, default=None, metavar="N", help="빔 탐색으로 조각")
+    add_logging_arguments(parser)
+    return parser
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def run_cli(argv=None):
+    """serve-pool 명령 실행 (Ctrl+C나 SIGTERM으로 종료하면 남은 퍼즐 저장)"""
+    args = build_parser().parse_args(argv)
+    configure_from_args(args)
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    difficulties = [difficulty.strip() for difficulty in args.difficulties.split(',') if difficulty.strip()]
+    pool = PuzzlePool(difficulties, capacity=args.capacity, low_watermark=args.low, workers=args.workers,
+                      seed=args.seed, persist_path=args.persist, beam_width=args.beam_width)
+    with pool:
+        server = start_pool_server(pool, args.host, args.port)
+        host, port = server.server_address
+        logger.info("퍼즐 풀 서버 실행 중: http://%s:%d/puzzle?difficulty=hard (Ctrl+C로 종료)", host, port)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            server.server_close()
+
+def test_puzzle_pool(capacity=3, low_watermark=1):
+    """작은 풀을 채우고 HTTP로 퍼즐을 꺼낸 뒤 저장/복원 테스트"""
+    import tempfile
+    from urllib.request import urlopen
+
+    print("=" * 50)
+    print("퍼즐 풀 테스트")
+    print("=" * 50)
+
+    persist_path = os.path.join(tempfile.mkdtemp(), "pool.jsonl")
+    with PuzzlePool(('easy', 'medium'), capacity, low_watermark, workers=2, seed=3,
+                    persist_path=persist_path) as pool:
+        started = time.perf_counter()
+        record = pool.get('medium', timeout=120)
+        print(f"첫 medium 퍼즐: {time.perf_counter() - started:.2f}초 대기, 빈칸 {record['info']['holes_count']}개")
+
+        server = start_pool_server(pool)
+        try:
+            host, port = server.server_address
+            started = time.perf_counter()
+            with urlopen(f"http://{host}:{port}/puzzle?difficulty=easy&wait=120") as response:
+                payload = json.loads(response.read())['data']
+            print(f"HTTP easy 퍼즐: {time.perf_counter() - started:.2f}초, 난이도 {payload['difficulty']}")
+            # 보충이 끝날 때까지 대기 (low_watermark 이상이면 보충하지 않음)
+            deadline = time.monotonic() + 300
+            while any(pool.counts()['pending'].values()) and time.monotonic() < deadline:
+                time.sleep(0.2)
+            with urlopen(f"http://{host}:{port}/stats") as response:
+                print(f"통계: {json.loads(response.read())['data']}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    restored = PuzzlePool(('easy', 'medium'), capacity, low_watermark)
+    print(f"저장된 퍼즐 복원: {restored.load(persist_path)}개")
+    record = restored.get('easy', timeout=0)
+    print(f"복원한 퍼즐 검증: {verify_record(record)}")
+
+if __name__ == "__main__":
+    from log_setup import configure_logging
+    configure_logging(per_puzzle=False)
+    test_puzzle_pool()
@@ -0,0 +1,224 @@
+"""
+ChessSudoku 로컬 퍼즐 저장소 모듈
+
+생성한 퍼즐을 SQLite 파일에 저장하고 난이도, 빈칸 수, 기물 구성, 데일리 날짜로
+빠르게 조회합니다. 퍼즐 생성과 서버 게시 단계를 나눠서 실행할 수 있습니다.
+
+    with PuzzleStore("puzzles.sqlite3") as store:
+        store.add_records(iter_puzzles(count=100, difficulty='hard'))
+        rows = store.find(difficulty='hard', with_pieces='Q', limit=10)
+
+보드는 puzzle_codec의 81글자 문자열로 저장합니다.
+"""
+import sqlite3
+import time
+from puzzle_codec import encode_board, decode_board, encode_pieces
+
+DEFAULT_STORE_PATH = "puzzles.sqlite3"
+
+def piece_multiset(pieces):
+    """기물 구성을 정렬된 문자열로 변환 (예: 'BBKNNQR')"""
+    return ''.join(sorted(piece.piece_type for piece in pieces))
+
+class PuzzleStore:
+    """SQLite 기반 퍼즐 저장소"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS puzzles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    puzzle TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    pieces TEXT NOT NULL,
+                    piece_multiset TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    holes_count INTEGER NOT NULL,
+                    seed INTEGER,
+                    puzzle_type TEXT NOT NULL DEFAULT 'normal',
+                    daily_date TEXT,
+                    used INTEGER NOT NULL DEFAULT 0,
+                    remote_id TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_puzzles_difficulty ON puzzles (difficulty, used, id);
+                CREATE INDEX IF NOT EXISTS idx_puzzles_holes ON puzzles (holes_count);
+                CREATE INDEX IF NOT EXISTS idx_puzzles_multiset ON puzzles (piece_multiset, used);
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_daily ON puzzles (daily_date)
+                    WHERE daily_date IS NOT NULL;
+            """)
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _row_values(puzzle_board, answer_board, pieces, difficulty, holes_count,
+                    seed=None, puzzle_type="normal", daily_date=None):
+        """INSERT에 사용할 값 튜플 생성"""
+        return (
+            encode_board(puzzle_board, pieces),
+            encode_board(answer_board, pieces),
+            encode_pieces(pieces),
+            piece_multiset(pieces),
+            difficulty,
+            holes_count,
+            seed,
+            puzzle_type,
+            daily_date,
+            time.time(),
+        )
+
+    _INSERT = ("INSERT INTO puzzles (puzzle, answer, pieces, piece_multiset, difficulty, holes_count, "
+               "seed, puzzle_type, daily_date, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def add_puzzle(self, puzzle_board, answer_board, pieces, difficulty, holes_count,
+                   seed=None, puzzle_type="normal", daily_date=None):
+        """퍼즐 하나를 저장하고 id 반환
+
+        같은 daily_date의 퍼즐이 이미 있으면 sqlite3.IntegrityError가 발생합니다.
+        """
+        with self.connection:
+            cursor = self.connection.execute(self._INSERT, self._row_values(
+                puzzle_board, answer_board, pieces, difficulty, holes_count,
+                seed, puzzle_type, daily_date
+            ))
+        return cursor.lastrowid
+
+    def add_records(self, records, puzzle_type="normal", chunk_size=500):
+        """pipeline.iter_puzzles의 퍼즐 레코드들을 묶음 단위 트랜잭션으로 저장
+
+        레코드에 'daily_date'가 있으면 데일리 퍼즐로 저장합니다.
+
+        Returns:
+            int: 저장한 퍼즐 개수
+        """
+        saved = 0
+        chunk = []
+        for record in records:
+            chunk.append(self._row_values(
+                record['puzzle'], record['answer'], record['pieces'], record['difficulty'],
+                record['info']['holes_count'], record.get('seed'),
+                record.get('puzzle_type', puzzle_type), record.get('daily_date')
+            ))
+            if len(chunk) >= chunk_size:
+                saved += self._insert_many(chunk)
+                chunk = []
+        if chunk:
+            saved += self._insert_many(chunk)
+        return saved
+
+    def _insert_many(self, rows):
+        with self.connection:
+            self.connection.executemany(self._INSERT, rows)
+        return len(rows)
+
+    def find(self, difficulty=None, with_pieces=None, piece_counts=None, min_holes=None,
+             max_holes=None, unused_only=True, limit=10):
+        """조건에 맞는 퍼즐들을 오래된 순서로 조회
+
+        Args:
+            difficulty (str, optional): 난이도
+            with_pieces (str, optional): 반드시 포함할 기물 타입들 (예: 'Q', 'QR')
+            piece_counts (dict, optional): 정확한 기물 구성 (예: {'K': 1, 'Q': 1})
+            min_holes, max_holes (int, optional): 빈칸 수 범위
+            unused_only (bool): 아직 게시하지 않은 퍼즐만 조회
+            limit (int): 최대 개수
+
+        Returns:
+            list: sqlite3.Row 리스트
+        """
+        conditions = []
+        params = []
+        if difficulty is not None:
+            conditions.append("difficulty = ?")
+            params.append(difficulty)
+        if unused_only:
+            conditions.append("used = 0")
+        if piece_counts is not None:
+            conditions.append("piece_multiset = ?")
+            params.append(''.join(sorted(piece_type * count for piece_type, count in piece_counts.items())))
+        for piece_type in with_pieces or '':
+            conditions.append("instr(piece_multiset, ?) > 0")
+            params.append(piece_type)
+        if min_holes is not None:
+            conditions.append("holes_count >= ?")
+            params.append(min_holes)
+        if max_holes is not None:
+            conditions.append("holes_count <= ?")
+            params.append(max_holes)
+
+        query = "SELECT * FROM puzzles"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        return self.connection.execute(query, params).fetchall()
+
+    def get(self, puzzle_id):
+        """id로 퍼즐 조회 (없으면 None)"""
+        return self.connection.execute(
+            "SELECT * FROM puzzles WHERE id = ?", (puzzle_id,)
+        ).fetchone()
+
+    def get_daily(self, daily_date):
+        """해당 날짜의 데일리 퍼즐 조회 (없으면 None)"""
+        return self.connection.execute(
+            "SELECT * FROM puzzles WHERE daily_date = ?", (daily_date,)
+        ).fetchone()
+
+    def daily_dates(self, start_date=None, end_date=None):
+        """저장된 데일리 퍼즐 날짜들의 set 반환 (YYYY-MM-DD 문자열)"""
+        query = "SELECT daily_date FROM puzzles WHERE daily_date IS NOT NULL"
+        params = []
+        if start_date is not None:
+            query += " AND daily_date >= ?"
+            params.append(start_date)
+        if end_date is not None:
+            query += " AND daily_date <= ?"
+            params.append(end_date)
+        return {row[0] for row in self.connection.execute(query, params)}
+
+    def mark_used(self, puzzle_id, remote_id=None):
+        """퍼즐을 게시 완료로 표시"""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE puzzles SET used = 1, remote_id = ? WHERE id = ?",
+                (None if remote_id is None else str(remote_id), puzzle_id)
+            )
+
+    def count(self, difficulty=None, unused_only=False):
+        """저장된 퍼즐 개수"""
+        query = "SELECT COUNT(*) FROM puzzles WHERE 1 = 1"
+        params = []
+        if difficulty is not None:
+            query += " AND difficulty = ?"
+            params.append(difficulty)
+        if unused_only:
+            query += " AND used = 0"
+        return self.connection.execute(query, params).fetchone()[0]
+
+    @staticmethod
+    def to_upload_args(row):
+        """저장된 행을 PuzzleAPIClient.upload_puzzle 인자 dict로 변환"""
+        puzzle_board, _ = decode_board(row['puzzle'])
+        answer_board, pieces = decode_board(row['answer'])
+        return {
+            'puzzle_board': puzzle_board,
+            'answer_board': answer_board,
+            'pieces': pieces,
+            'difficulty': row['difficulty'],
+            'puzzle_type': row['puzzle_type'],
+            'daily_date': row['daily_date'],
+        }
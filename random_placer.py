@@ -1,16 +1,20 @@
 from board import Board
 from validators import PiecePlacer
-import random
+from seeding import make_rng
+from log_setup import get_logger
+
+logger = get_logger(__name__)
 
 class RandomPiecePlacer:
     """랜덤하게 기물을 배치하는 클래스"""
     
-    def __init__(self, board):
+    def __init__(self, board, rng=None):
         self.board = board
         self.placer = PiecePlacer(board)
+        self.rng = make_rng(rng)  # random.Random 인스턴스 또는 시드
     
     def place_pieces_randomly(self, piece_counts=None):
-        """랜덤하게 기물들을 배치"""
+        """랜덤하게 기물들을 배치 (배치하지 못한 기물은 로거에 경고로 기록)"""
         if piece_counts is None:
             # 기본 기물 개수 설정 (더 적게 배치하여 풀이 가능성 높이기)
             piece_counts = {'K': 1, 'Q': 1, 'R': 1, 'B': 2, 'N': 2}
@@ -22,7 +26,7 @@ class RandomPiecePlacer:
                 pieces_to_place.append(piece_type)
         
         # 기물 배치 순서를 랜덤하게 섞기
-        random.shuffle(pieces_to_place)
+        self.rng.shuffle(pieces_to_place)
         
         placed_count = 0
         
@@ -34,8 +38,8 @@ class RandomPiecePlacer:
             
             while not placed and attempts < max_attempts:
                 # 매번 새로운 랜덤 위치 선택
-                row = random.randint(0, 8)
-                col = random.randint(0, 8)
+                row = self.rng.randint(0, 8)
+                col = self.rng.randint(0, 8)
                 
                 # 해당 위치가 비어있고 기물 배치가 가능한지 확인
                 if self.board.is_empty(row, col):
@@ -53,7 +57,7 @@ class RandomPiecePlacer:
                 attempts += 1
             
             if not placed:
-                print(f"경고: {piece_type} 기물을 배치하지 못했습니다. ({attempts}번 시도)")
+                logger.warning("경고: %s 기물을 배치하지 못했습니다. (%d번 시도)", piece_type, attempts)
         
         return placed_count
     
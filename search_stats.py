@@ -0,0 +1,104 @@
+"""
+ChessSudoku 탐색 통계 모듈
+
+BoardGenerator, LogicalSolver, PuzzleGenerator에 SearchStats를 넘기면
+탐색 노드 수, 백트래킹, 후보 제거, 기법별 반복 횟수, 조각 시도 등을 셉니다.
+넘기지 않으면(None) 각 지점에서 None 비교 한 번만 하므로 비용이 거의 없습니다.
+
+    stats = SearchStats()
+    BoardGenerator(board, pieces, stats=stats).generate_complete_board()
+    print(stats.as_dict())
+
+as_dict() 결과는 pickle/JSON으로 옮길 수 있고, merge()로 여러 작업자의 통계를 합칩니다.
+"""
+import time
+from contextlib import contextmanager
+
+class SearchStats:
+    """탐색/풀이/조각 단계의 카운터 모음"""
+
+    COUNTERS = (
+        # 보드 채우기 (BoardGenerator)
+        'nodes',                  # 값을 정하기 위해 방문한 칸 수
+        'backtracks',             # 배치했다가 되돌린 값 수
+        'backjumps',              # 충돌 집합에 없는 단계를 건너뛴 횟수
+        'prunings',               # forward checking으로 제거한 후보 수
+        'wipeouts',               # forward checking 중 후보가 0개가 된 횟수
+        'nogood_hits',            # 학습한 nogood으로 바로 거른 값 수
+        'restarts',               # 노드 예산 초과로 다시 시작한 횟수
+        # 공통
+        'is_valid_number_calls',
+        # 논리적 풀이 (LogicalSolver)
+        'solver_runs',
+        'solver_iterations',
+        # 빈칸 조각 (PuzzleGenerator)
+        'carve_attempts',
+        'carve_accepts',
+        'carve_rejects',
+    )
+
+    def __init__(self):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.technique_iterations = {}  # 기법 이름 -> 실행 횟수
+        self.technique_progress = {}    # 기법 이름 -> 진행이 있었던 실행 횟수
+        self.stage_times = {}           # 단계 이름 -> 누적 소요 시간 (초)
+
+    def add_technique(self, name, progress):
+        """논리적 풀이 기법 한 번 실행 기록"""
+        self.technique_iterations[name] = self.technique_iterations.get(name, 0) + 1
+        if progress:
+            self.technique_progress[name] = self.technique_progress.get(name, 0) + 1
+
+    def add_time(self, stage, seconds):
+        """단계 소요 시간 누적"""
+        self.stage_times[stage] = self.stage_times.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timed(self, stage):
+        """with 블록의 소요 시간을 stage에 누적"""
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def merge(self, other):
+        """다른 SearchStats 또는 as_dict() 결과를 더함 (self 반환)"""
+        if isinstance(other, SearchStats):
+            other = other.as_dict()
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + other.get(name, 0))
+        for attribute in ('technique_iterations', 'technique_progress', 'stage_times'):
+            totals = getattr(self, attribute)
+            for key, value in other.get(attribute, {}).items():
+                totals[key] = totals.get(key, 0) + value
+        return self
+
+    def as_dict(self):
+        """카운터들을 dict로 반환"""
+        data = {name: getattr(self, name) for name in self.COUNTERS}
+        data['technique_iterations'] = dict(self.technique_iterations)
+        data['technique_progress'] = dict(self.technique_progress)
+        data['stage_times'] = dict(self.stage_times)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """as_dict() 결과로부터 SearchStats 생성"""
+        return cls().merge(data)
+
+    def __repr__(self):
+        return f"SearchStats({self.as_dict()!r})"
+
+def print_search_stats(stats):
+    """탐색 통계 출력"""
+    data = stats.as_dict() if isinstance(stats, SearchStats) else stats
+    print("탐색 통계:")
+    for name in SearchStats.COUNTERS:
+        print(f"  {name:<24}{data.get(name, 0):>12,}")
+    for name, count in data.get('technique_iterations', {}).items():
+        progress = data.get('technique_progress', {}).get(name, 0)
+        print(f"  {name:<24}{count:>12,}회 실행, {progress:,}회 진행")
+    for stage, seconds in data.get('stage_times', {}).items():
+        print(f"  {stage + ' 시간':<24}{seconds:>11.3f}초")
@@ -0,0 +1,47 @@
+"""
+ChessSudoku 난수 생성기 관리 모듈
+
+전역 random 모듈 대신 단계마다 명시적인 random.Random 인스턴스를 넘겨서
+같은 시드로 같은 퍼즐을 다시 만들 수 있게 합니다.
+(seed, piece_counts, max_holes)만 있으면 퍼즐을 재현할 수 있습니다.
+"""
+import hashlib
+import random
+
+def new_seed():
+    """운영체제 난수로 새 시드 생성 (64비트 정수)"""
+    return random.SystemRandom().getrandbits(63)
+
+def make_rng(seed_or_rng=None):
+    """시드 또는 Random 인스턴스로부터 Random 인스턴스 반환
+
+    Args:
+        seed_or_rng: None이면 새 시드로 생성, random.Random이면 그대로 사용,
+            그 외(int, str 등)는 시드로 사용
+
+    Returns:
+        random.Random: 난수 생성기
+    """
+    if isinstance(seed_or_rng, random.Random):
+        return seed_or_rng
+    if seed_or_rng is None:
+        return random.Random(new_seed())
+    return random.Random(seed_or_rng)
+
+def derive_seed(seed, *keys):
+    """시드와 키들로부터 독립적인 하위 시드 계산
+
+    같은 (seed, keys)는 항상 같은 값을 반환하고, 키가 다르면 서로 독립적인
+    스트림이 됩니다. 작업자 번호, 날짜 등을 키로 사용합니다.
+    """
+    text = "/".join(str(part) for part in (seed,) + keys)
+    digest = hashlib.sha256(text.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') >> 1
+
+def derive_rng(seed, *keys):
+    """derive_seed로 만든 하위 시드의 Random 인스턴스 반환"""
+    return random.Random(derive_seed(seed, *keys))
+
+def spawn_rngs(seed, count):
+    """병렬 작업자용 독립 난수 스트림 count개 생성"""
+    return [derive_rng(seed, 'worker', index) for index in range(count)]
@@ -1,9 +1,307 @@
+"""
+ChessSudoku 비트마스크 솔버 모듈
+
+사용자가 제출했거나 외부에서 가져온 퍼즐(보드 + 기물)을 빠르게 풀고 검증합니다.
+LogicalSolver/BoardGenerator와 달리 넘겨받은 Board를 수정하지 않으므로
+같은 퍼즐을 여러 요청에서 동시에 써도 됩니다.
+
+    solver = ChesSudokuSolver(puzzle_board, pieces)
+    solver.solve()                  # 풀이 Board (해가 없으면 None)
+    solver.count_solutions()        # 0, 1, 2 (2는 '2개 이상')
+    solver.verify_answer(answer)    # (통과 여부, 실패 이유)
+
+    ChesSudokuSolver.solve_batch([(puzzle_board, pieces), ...], mode="count")
+
+칸마다 가능한 숫자를 9비트 정수로 들고 다니며, 숫자가 정해지면 peer들의 비트를 지우고
+(단일 후보), 9칸이 모두 서로 다른 숫자여야 하는 묶음에서 한 칸에만 남은 숫자를 채운 뒤
+(숨겨진 단일 후보) 후보가 가장 적은 칸부터 분기합니다.
+
+규칙은 생성된 정답과 같은 ConstraintGraph.fill_peers를 씁니다.
+기물 배치별 peer/묶음 표는 캐시해서 같은 배치의 퍼즐들이 공유합니다.
+
+힌트가 거의 없는 제출은 탐색이 길어질 수 있으므로, 요청 처리에서는 node_limit을 주면
+분기 횟수가 그 값을 넘을 때 SearchBudgetExceeded를 냅니다.
+"""
+from functools import lru_cache
 from board import Board
+from board_generator import SearchBudgetExceeded
+from constraint_graph import ConstraintGraph, COORDS
+
+ALL_DIGITS = 0x1FF  # 숫자 1~9 -> 비트 0~8
+POPCOUNT = tuple(bin(mask).count('1') for mask in range(ALL_DIGITS + 1))
+DIGIT_OF = {1 << (digit - 1): digit for digit in range(1, 10)}
+
+SOLVE, COUNT, VERIFY = "solve", "count", "verify"
+BATCH_MODES = (SOLVE, COUNT, VERIFY)
+
+@lru_cache(maxsize=256)
+def _layout_tables(constraint_graph):
+    """기물 배치별 (peer 튜플들, 숨겨진 단일 후보를 찾을 묶음들) 반환
+
+    기물 칸을 빼고 정확히 9칸이 남는 묶음(기물이 없는 행/열/박스, 9칸짜리 공격 범위)만
+    숫자 1~9가 모두 들어가야 하므로 숨겨진 단일 후보에 씁니다.
+    """
+    piece_cells = constraint_graph.piece_cells
+    units = []
+    for unit in constraint_graph.units:
+        cells = tuple(index for index in unit if index not in piece_cells)
+        if len(cells) == 9 and cells not in units:
+            units.append(cells)
+    return constraint_graph.fill_peers, tuple(units)
+
+def _propagate(candidates, filled, pending, peers, units):
+    """pending 칸들의 숫자를 확정하고 단일 후보/숨겨진 단일 후보를 반복 적용
+
+    candidates, filled를 직접 수정합니다. 모순이 생기면 False 반환.
+    """
+    while True:
+        while pending:
+            index = pending.pop()
+            if filled[index]:
+                continue
+            filled[index] = True
+            bit = candidates[index]
+            for peer in peers[index]:
+                mask = candidates[peer]
+                if mask & bit:
+                    mask ^= bit
+                    if not mask:
+                        return False
+                    candidates[peer] = mask
+                    if not mask & (mask - 1):
+                        pending.append(peer)
+
+        for unit in units:
+            once = twice = 0
+            for index in unit:
+                mask = candidates[index]
+                twice |= once & mask
+                once |= mask
+            if once != ALL_DIGITS:
+                return False  # 이 묶음에 들어갈 수 없는 숫자가 있음
+            only = once & ~twice
+            if not only:
+                continue
+            for index in unit:
+                if filled[index]:
+                    continue
+                hidden = candidates[index] & only
+                if hidden:
+                    if hidden & (hidden - 1):
+                        return False  # 한 칸에 숨겨진 단일 후보가 둘 이상
+                    candidates[index] = hidden
+                    pending.append(index)
+        if not pending:
+            return True
+
+def _search(candidates, filled, peers, units, limit, solutions, budget):
+    """후보가 가장 적은 칸부터 분기하며 해를 solutions에 모음 (limit개에서 중단)
+
+    budget은 [남은 분기 횟수] 리스트 (None이면 제한 없음)
+    """
+    best, best_count = -1, 10
+    for index in range(81):
+        if not filled[index]:
+            count = POPCOUNT[candidates[index]]
+            if count < best_count:
+                best, best_count = index, count
+                if count == 2:
+                    break
+    if best < 0:
+        solutions.append(candidates)
+        return
+
+    if budget is not None:
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise SearchBudgetExceeded()
+
+    options = candidates[best]
+    while options:
+        bit = options & -options
+        options ^= bit
+        next_candidates = candidates[:]
+        next_filled = filled[:]
+        next_candidates[best] = bit
+        if _propagate(next_candidates, next_filled, [best], peers, units):
+            _search(next_candidates, next_filled, peers, units, limit, solutions, budget)
+            if len(solutions) >= limit:
+                return
 
 class ChesSudokuSolver:
-    """체스 기물과 스도쿠 제약 조건을 모두 고려한 솔버"""
-    
-    def __init__(self, board, pieces):
+    """체스 기물과 스도쿠 제약 조건을 모두 고려한 솔버 (입력 보드는 수정하지 않음)"""
+
+    def __init__(self, board, pieces, constraint_graph=None, node_limit=None):
+        """
+        Args:
+            board (Board): 퍼즐 보드 (빈칸 None, 기물 칸은 기물 글자 또는 None)
+            pieces (list): Piece 리스트
+            constraint_graph (ConstraintGraph, optional): 기물 배치의 제약 그래프
+            node_limit (int, optional): solve/count_solutions 한 번의 최대 분기 횟수
+                (넘으면 SearchBudgetExceeded)
+        """
         self.board = board
         self.pieces = pieces
-    
+        self.node_limit = node_limit
+        self.constraint_graph = constraint_graph or ConstraintGraph.from_pieces(pieces)
+        self.peers, self.units = _layout_tables(self.constraint_graph)
+
+        # 힌트 숫자 (0은 빈칸, 기물 칸은 항상 0)
+        grid = board.board if isinstance(board, Board) else board
+        piece_cells = self.constraint_graph.piece_cells
+        self.givens = [0] * 81
+        for index, (row, col) in enumerate(COORDS):
+            value = grid[row][col]
+            if index not in piece_cells and isinstance(value, int):
+                self.givens[index] = value
+
+    def _initial_state(self):
+        """힌트를 반영한 (후보 비트들, 확정 여부) 반환, 힌트끼리 모순이면 None"""
+        piece_cells = self.constraint_graph.piece_cells
+        candidates = [ALL_DIGITS] * 81
+        filled = [False] * 81
+        pending = []
+        for index in range(81):
+            if index in piece_cells:
+                candidates[index] = 0
+                filled[index] = True
+            elif self.givens[index]:
+                if not 1 <= self.givens[index] <= 9:
+                    return None
+                candidates[index] = 1 << (self.givens[index] - 1)
+                pending.append(index)
+
+        # 힌트 칸끼리 먼저 확인 (propagate는 확정된 칸끼리의 충돌을 다시 보지 않음)
+        for index in pending:
+            bit = candidates[index]
+            for peer in self.peers[index]:
+                if self.givens[peer] and candidates[peer] == bit:
+                    return None
+
+        if not _propagate(candidates, filled, pending, self.peers, self.units):
+            return None
+        return candidates, filled
+
+    def _solutions(self, limit):
+        state = self._initial_state()
+        if state is None:
+            return []
+        solutions = []
+        budget = [self.node_limit] if self.node_limit is not None else None
+        _search(state[0], state[1], self.peers, self.units, limit, solutions, budget)
+        return solutions
+
+    def _to_board(self, candidates):
+        """후보 비트 배열(해)을 기물 글자가 들어간 새 Board로 변환"""
+        board = Board()
+        for index, (row, col) in enumerate(COORDS):
+            board.board[row][col] = DIGIT_OF.get(candidates[index])
+        for piece in self.pieces:
+            board.board[piece.row][piece.col] = piece.piece_type
+        return board
+
+    def solve(self):
+        """퍼즐을 풀어 새 Board로 반환 (해가 없으면 None)"""
+        solutions = self._solutions(1)
+        return self._to_board(solutions[0]) if solutions else None
+
+    def count_solutions(self, limit=2):
+        """해의 개수를 limit까지만 셈 (limit=2면 0: 해 없음, 1: 유일해, 2: 여러 해)"""
+        return len(self._solutions(limit))
+
+    def has_unique_solution(self):
+        """해가 정확히 하나인지 확인"""
+        return self.count_solutions(2) == 1
+
+    def verify_answer(self, answer):
+        """제출된 답이 이 퍼즐의 올바른 해인지 검사 (탐색 없이 규칙만 확인)
+
+        Args:
+            answer (Board): 제출된 답 보드
+
+        Returns:
+            tuple: (통과 여부, 실패 이유 또는 None)
+        """
+        grid = answer.board if isinstance(answer, Board) else answer
+        piece_cells = self.constraint_graph.piece_cells
+        for index, (row, col) in enumerate(COORDS):
+            if index in piece_cells:
+                continue
+            value = grid[row][col]
+            if not isinstance(value, int) or not 1 <= value <= 9:
+                return False, f"답이 채워지지 않았습니다: ({row}, {col})"
+            if self.givens[index] and self.givens[index] != value:
+                return False, f"힌트와 다른 숫자입니다: ({row}, {col})"
+            for peer in self.peers[index]:
+                if grid[peer // 9][peer % 9] == value:
+                    return False, f"규칙을 위반합니다: ({row}, {col})"
+        return True, None
+
+    @classmethod
+    def solve_batch(cls, puzzles, mode=SOLVE, limit=2, node_limit=None):
+        """여러 퍼즐을 한 번에 처리 (같은 기물 배치의 표는 한 번만 만듦)
+
+        Args:
+            puzzles (iterable): (퍼즐 보드, 기물 리스트) 튜플들, verify 모드는 (퍼즐 보드, 기물 리스트, 답 보드)
+            mode (str): "solve" - 풀이 Board 또는 None
+                        "count" - count_solutions(limit) 결과
+                        "verify" - verify_answer의 (통과 여부, 실패 이유)
+            limit (int): count 모드에서 셀 최대 해 개수
+            node_limit (int, optional): 퍼즐별 최대 분기 횟수 (넘은 퍼즐의 결과는 None)
+
+        Returns:
+            list: 입력 순서대로의 결과
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"지원하지 않는 모드입니다: {mode} (가능: {', '.join(BATCH_MODES)})")
+
+        results = []
+        for puzzle in puzzles:
+            solver = cls(puzzle[0], puzzle[1], node_limit=node_limit)
+            try:
+                if mode == SOLVE:
+                    results.append(solver.solve())
+                elif mode == COUNT:
+                    results.append(solver.count_solutions(limit))
+                else:
+                    results.append(solver.verify_answer(puzzle[2]))
+            except SearchBudgetExceeded:
+                results.append(None)
+        return results
+
+def test_solver(count=20, seed=1234):
+    """생성한 퍼즐을 풀어 정답과 비교하고 처리 속도 측정"""
+    import copy
+    import time
+    from pipeline import iter_puzzles
+
+    print("=" * 50)
+    print("비트마스크 솔버 테스트")
+    print("=" * 50)
+
+    records = list(iter_puzzles(count=count, seed=seed, max_holes=60))
+    puzzles = [(record['puzzle'], record['pieces']) for record in records]
+    snapshots = [copy.deepcopy(record['puzzle'].board) for record in records]
+
+    started = time.perf_counter()
+    solved = ChesSudokuSolver.solve_batch(puzzles)
+    solve_time = time.perf_counter() - started
+    matches = sum(1 for board, record in zip(solved, records)
+                  if board is not None and board.board == record['answer'].board)
+    print(f"풀이: {matches}/{count}개 정답과 일치 ({count / solve_time:,.0f} 퍼즐/초)")
+
+    started = time.perf_counter()
+    counts = ChesSudokuSolver.solve_batch(puzzles, mode=COUNT)
+    count_time = time.perf_counter() - started
+    print(f"해 개수 (2개까지): {dict((n, counts.count(n)) for n in sorted(set(counts)))} "
+          f"({count / count_time:,.0f} 퍼즐/초)")
+
+    verified = ChesSudokuSolver.solve_batch(
+        [(record['puzzle'], record['pieces'], record['answer']) for record in records], mode=VERIFY)
+    print(f"정답 검증: {sum(1 for ok, _ in verified if ok)}/{count}개 통과")
+
+    unchanged = all(record['puzzle'].board == snapshot for record, snapshot in zip(records, snapshots))
+    print(f"입력 보드 변경 없음: {unchanged}")
+
+if __name__ == "__main__":
+    test_solver()